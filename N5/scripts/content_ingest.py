@@ -7,6 +7,7 @@ Usage:
     python3 content_ingest.py /path/to/article.md --type article
     python3 content_ingest.py /path/to/file.md --dry-run
     python3 content_ingest.py /path/to/file.md --move
+    python3 content_ingest.py Knowledge/content-library/ --workers 8
 
 Part of n5OS-Ode: https://github.com/vrijenattawar/n5os-ode
 """
@@ -18,7 +19,9 @@ import os
 import re
 import shutil
 import sqlite3
+import sys
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -39,6 +42,12 @@ TYPE_DIRECTORIES = {
     "inspiration": "inspiration",
 }
 
+# Fields carried between prepare and store but not reported in results
+INTERNAL_FIELDS = ("url", "author", "tags", "legacy_hash", "size", "mtime_ns")
+
+# File extensions picked up when ingesting a directory
+INGEST_EXTENSIONS = (".md", ".markdown", ".txt")
+
 # Path patterns for auto-detection
 PATH_TYPE_PATTERNS = [
     (r"/articles/", "article"),
@@ -69,6 +78,19 @@ def log_result(log_file: Path, result: dict):
         f.write(json.dumps(result) + "\n")
 
 
+def parse_frontmatter_block(yaml_block: str) -> dict:
+    """Simple YAML parsing (key: value) of a frontmatter block."""
+    frontmatter = {}
+    for line in yaml_block.strip().split("\n"):
+        if ":" in line:
+            key, _, value = line.partition(":")
+            key = key.strip()
+            value = value.strip().strip('"').strip("'")
+            if value:
+                frontmatter[key] = value
+    return frontmatter
+
+
 def parse_frontmatter(content: str) -> tuple[dict, str]:
     """Extract YAML frontmatter from markdown content."""
     frontmatter = {}
@@ -77,21 +99,74 @@ def parse_frontmatter(content: str) -> tuple[dict, str]:
     if content.startswith("---"):
         parts = content.split("---", 2)
         if len(parts) >= 3:
-            yaml_block = parts[1].strip()
+            frontmatter = parse_frontmatter_block(parts[1])
             body = parts[2].strip()
-            
-            # Simple YAML parsing (key: value)
-            for line in yaml_block.split("\n"):
-                if ":" in line:
-                    key, _, value = line.partition(":")
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    if value:
-                        frontmatter[key] = value
     
     return frontmatter, body
 
 
+def new_hasher():
+    """Content hash used for dedupe: full-width (256-bit) BLAKE2b."""
+    return hashlib.blake2b(digest_size=32)
+
+
+def scan_file(filepath: Path, legacy_hash: bool = False) -> dict:
+    """Single streaming pass over a file: hash, frontmatter and word count.
+    
+    Reads line by line so large transcripts never sit in memory whole.
+    With legacy_hash, also computes the pre-BLAKE2b truncated SHA-256 so
+    files ingested under the old scheme are still recognized as duplicates.
+    """
+    hasher = new_hasher()
+    legacy = hashlib.sha256() if legacy_hash else None
+    frontmatter_lines = []
+    state = "start"  # start -> frontmatter -> body
+    word_count = 0
+    
+    with open(filepath, "rb") as f:
+        for raw in f:
+            hasher.update(raw)
+            line = raw.decode("utf-8")
+            if legacy is not None:
+                # read_text() normalized newlines before the old hash
+                legacy.update(line.replace("\r\n", "\n").encode())
+            
+            if state == "start":
+                state = "body"
+                if line.startswith("---"):
+                    rest = line[3:]
+                    if "---" in rest:
+                        block, _, line = rest.partition("---")
+                        frontmatter_lines.append(block)
+                    else:
+                        frontmatter_lines.append(rest)
+                        state = "frontmatter"
+                        continue
+            elif state == "frontmatter":
+                if "---" in line:
+                    block, _, line = line.partition("---")
+                    frontmatter_lines.append(block)
+                    state = "body"
+                else:
+                    frontmatter_lines.append(line)
+                    continue
+            
+            word_count += count_words(line)
+    
+    if state == "frontmatter":
+        # Unterminated frontmatter: the whole file is body
+        frontmatter_lines = []
+        with open(filepath, encoding="utf-8") as f:
+            word_count = sum(count_words(l) for l in f)
+    
+    return {
+        "frontmatter": parse_frontmatter_block("".join(frontmatter_lines)),
+        "word_count": word_count,
+        "content_hash": hasher.hexdigest(),
+        "legacy_hash": legacy.hexdigest()[:16] if legacy is not None else None,
+    }
+
+
 def extract_title_from_filename(filepath: Path) -> str:
     """Generate title from filename."""
     name = filepath.stem
@@ -172,6 +247,18 @@ def init_db():
         CREATE INDEX IF NOT EXISTS idx_content_hash ON content_items(content_hash)
     """)
     
+    # Stat manifest: lets re-ingest skip untouched files without reading them
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_manifest (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            item_id TEXT,
+            checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
     conn.commit()
     conn.close()
 
@@ -183,97 +270,324 @@ def record_exists(conn: sqlite3.Connection, content_hash: str) -> bool:
     return cursor.fetchone() is not None
 
 
-def ingest_file(filepath: Path, content_type: str = None, move: bool = False, 
-                dry_run: bool = False) -> dict:
-    """Ingest a single file into the content library."""
-    filepath = filepath.resolve()
+def has_legacy_hashes(conn: sqlite3.Connection) -> bool:
+    """True if any rows still carry the old 16-hex-char truncated SHA-256."""
+    row = conn.execute(
+        "SELECT 1 FROM content_items WHERE length(content_hash) = 16 LIMIT 1"
+    ).fetchone()
+    return row is not None
+
+
+def load_manifest(conn: sqlite3.Connection) -> dict:
+    """Load {path: (size, mtime_ns)} for every file seen by a previous ingest."""
+    return {
+        path: (size, mtime_ns)
+        for path, size, mtime_ns in conn.execute(
+            "SELECT path, size, mtime_ns FROM ingest_manifest"
+        )
+    }
+
+
+def load_manifest_entry(conn: sqlite3.Connection, filepath: Path) -> dict:
+    """Point lookup of one file's manifest row, shaped like load_manifest()."""
+    row = conn.execute(
+        "SELECT size, mtime_ns FROM ingest_manifest WHERE path = ?", (str(filepath),)
+    ).fetchone()
+    return {str(filepath): tuple(row)} if row else {}
+
+
+def is_unchanged(manifest: dict, filepath: Path) -> bool:
+    """Compare a file's stat against the manifest (no read, no hash)."""
+    seen = manifest.get(str(filepath))
+    if seen is None:
+        return False
+    try:
+        stat = filepath.stat()
+    except OSError:
+        return False
+    return seen == (stat.st_size, stat.st_mtime_ns)
+
+
+def record_manifest(conn: sqlite3.Connection, path: str, prepared: dict,
+                    item_id: str = None):
+    """Upsert a file's (size, mtime_ns, hash) after it has been processed."""
+    conn.execute("""
+        INSERT INTO ingest_manifest (path, size, mtime_ns, content_hash, item_id, checked_at)
+        VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(path) DO UPDATE SET
+            size = excluded.size,
+            mtime_ns = excluded.mtime_ns,
+            content_hash = excluded.content_hash,
+            item_id = COALESCE(excluded.item_id, ingest_manifest.item_id),
+            checked_at = excluded.checked_at
+    """, (path, prepared["size"], prepared["mtime_ns"], prepared["content_hash"], item_id))
+
+
+def prepare_file(filepath: Path, content_type: str = None, legacy_hash: bool = False) -> dict:
+    """Read and parse a file: frontmatter, title, word count, hash.
+    
+    Pure function with no DB access, so it can run in a worker process.
+    """
+    filepath = Path(filepath).resolve()
     
-    if not filepath.exists():
-        return {"success": False, "error": f"File not found: {filepath}"}
+    try:
+        stat = filepath.stat()
+    except FileNotFoundError:
+        return {"success": False, "error": f"File not found: {filepath}", "source_path": str(filepath)}
     
-    # Read content
+    # Hash, frontmatter and word count in one streaming pass
     try:
-        content = filepath.read_text()
+        scanned = scan_file(filepath, legacy_hash)
     except Exception as e:
-        return {"success": False, "error": f"Failed to read file: {e}"}
-    
-    # Parse frontmatter
-    frontmatter, body = parse_frontmatter(content)
+        return {"success": False, "error": f"Failed to read file: {e}", "source_path": str(filepath)}
+    frontmatter = scanned["frontmatter"]
     
     # Determine content type
     if not content_type:
         content_type = frontmatter.get("type") or detect_content_type(filepath)
     
-    # Extract metadata
-    title = frontmatter.get("title") or extract_title_from_filename(filepath)
-    author = frontmatter.get("author")
-    url = frontmatter.get("url") or frontmatter.get("source_url")
-    tags = frontmatter.get("tags")
-    
-    # Calculate hash for deduplication
-    content_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
-    
-    # Word count
-    word_count = count_words(body)
-    
-    # Generate record ID
-    record_id = str(uuid.uuid4())[:8]
-    
     # Calculate target path
     target_path = get_canonical_path(content_type, filepath.name)
     
-    result = {
+    return {
         "success": True,
-        "record_id": record_id,
-        "title": title,
+        "record_id": str(uuid.uuid4())[:8],
+        "title": frontmatter.get("title") or extract_title_from_filename(filepath),
         "content_type": content_type,
         "source_path": str(filepath),
         "target_path": str(target_path),
-        "word_count": word_count,
-        "content_hash": content_hash,
-        "dry_run": dry_run,
+        "url": frontmatter.get("url") or frontmatter.get("source_url"),
+        "author": frontmatter.get("author"),
+        "tags": frontmatter.get("tags"),
+        "word_count": scanned["word_count"],
+        "content_hash": scanned["content_hash"],
+        "legacy_hash": scanned["legacy_hash"],
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
     }
-    
-    if dry_run:
-        return result
-    
-    # Initialize DB and check for duplicates
-    init_db()
-    conn = sqlite3.connect(DB_PATH)
-    
-    if record_exists(conn, content_hash):
-        conn.close()
-        result["success"] = False
-        result["error"] = "Content already exists (duplicate hash)"
-        return result
+
+
+def _prepare_file_task(task: tuple) -> dict:
+    """Process-pool entry point (must be top-level to pickle)."""
+    filepath, content_type, legacy_hash = task
+    return prepare_file(filepath, content_type, legacy_hash)
+
+
+def _result_view(prepared: dict, dry_run: bool) -> dict:
+    """Strip internal fields so results keep the historical shape."""
+    result = {k: v for k, v in prepared.items() if k not in INTERNAL_FIELDS}
+    if prepared.get("success"):
+        result["dry_run"] = dry_run
+    return result
+
+
+def _store_prepared(conn: sqlite3.Connection, prepared: dict, move: bool) -> dict:
+    """Move (optionally) and insert one prepared record. Caller commits."""
+    result = _result_view(prepared, dry_run=False)
+    target_path = Path(prepared["target_path"])
     
     # Move file if requested
     moved_to = None
     if move:
         target_path.parent.mkdir(parents=True, exist_ok=True)
         if not target_path.exists():
-            shutil.move(str(filepath), str(target_path))
+            shutil.move(prepared["source_path"], str(target_path))
             moved_to = str(target_path)
             result["moved_to"] = moved_to
     
-    # Insert record
-    cursor = conn.cursor()
-    cursor.execute("""
+    conn.execute("""
         INSERT INTO content_items (id, title, content_type, source_path, canonical_path, 
                                   url, author, word_count, tags, content_hash)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (record_id, title, content_type, str(filepath), 
-          moved_to or str(target_path), url, author, word_count, tags, content_hash))
+    """, (prepared["record_id"], prepared["title"], prepared["content_type"],
+          prepared["source_path"], moved_to or str(target_path), prepared["url"],
+          prepared["author"], prepared["word_count"], prepared["tags"],
+          prepared["content_hash"]))
+    record_manifest(conn, moved_to or prepared["source_path"], prepared, prepared["record_id"])
     
+    return result
+
+
+def _unchanged_result(filepath: Path) -> dict:
+    return {
+        "success": False,
+        "skipped": True,
+        "source_path": str(filepath),
+        "error": "Unchanged since last ingest",
+    }
+
+
+def _duplicate_result(prepared: dict, dry_run: bool) -> dict:
+    result = _result_view(prepared, dry_run)
+    result["success"] = False
+    result["duplicate"] = True
+    result["error"] = "Content already exists (duplicate hash)"
+    return result
+
+
+def ingest_file(filepath: Path, content_type: str = None, move: bool = False, 
+                dry_run: bool = False) -> dict:
+    """Ingest a single file into the content library."""
+    filepath = Path(filepath).resolve()
+    if dry_run:
+        return _result_view(prepare_file(filepath, content_type), dry_run)
+    
+    # Initialize DB; skip files whose stat matches the manifest
+    init_db()
+    conn = sqlite3.connect(DB_PATH)
+    if is_unchanged(load_manifest_entry(conn, filepath), filepath):
+        conn.close()
+        return _unchanged_result(filepath)
+    
+    prepared = prepare_file(filepath, content_type, has_legacy_hashes(conn))
+    if not prepared["success"]:
+        conn.close()
+        return _result_view(prepared, dry_run)
+    
+    # Check for duplicates
+    if record_exists(conn, prepared["content_hash"]) or (
+        prepared["legacy_hash"] and record_exists(conn, prepared["legacy_hash"])
+    ):
+        record_manifest(conn, prepared["source_path"], prepared)
+        conn.commit()
+        conn.close()
+        return _duplicate_result(prepared, dry_run)
+    
+    result = _store_prepared(conn, prepared, move)
     conn.commit()
     conn.close()
     
     return result
 
 
+def collect_files(paths: list, extensions: tuple = INGEST_EXTENSIONS) -> list:
+    """Expand files and directories into a sorted, de-duplicated file list."""
+    files = set()
+    for path in paths:
+        path = Path(path).resolve()
+        if path.is_dir():
+            for root, dirnames, filenames in os.walk(path):
+                # Prune hidden directories (.git, .obsidian, ...) in place
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                for name in filenames:
+                    if name.lower().endswith(extensions):
+                        files.add(Path(root) / name)
+        else:
+            files.add(path)
+    return sorted(files)
+
+
+def ingest_tree(paths: list, content_type: str = None, workers: int = None,
+                move: bool = False, dry_run: bool = False) -> dict:
+    """Ingest many files or directories in one pass.
+    
+    Files whose (size, mtime_ns) match the ingest manifest are skipped with
+    a single stat. The rest are parsed (frontmatter, word counts, streaming
+    hashes) across a process pool; deduplication runs against a hash set
+    loaded once from the DB, and all inserts are committed in a single
+    transaction.
+    
+    Args:
+        paths: Files and/or directories to ingest
+        content_type: Force a content type (auto-detected per file otherwise)
+        workers: Process count (default: CPU count; 1 disables the pool)
+        move: Move files to their canonical location
+        dry_run: Parse and dedupe only, write nothing
+    
+    Returns:
+        {"results": [...], "ingested": n, "duplicates": n, "unchanged": n, "failed": n}
+    """
+    files = collect_files(paths)
+    summary = {"results": [], "ingested": 0, "duplicates": 0, "unchanged": 0, "failed": 0}
+    
+    conn = None
+    known_hashes = set()
+    legacy = False
+    if not dry_run:
+        init_db()
+        conn = sqlite3.connect(DB_PATH)
+        known_hashes = {row[0] for row in conn.execute(
+            "SELECT content_hash FROM content_items WHERE content_hash IS NOT NULL"
+        )}
+        legacy = any(len(h) == 16 for h in known_hashes)
+        manifest = load_manifest(conn)
+        changed = []
+        for f in files:
+            if is_unchanged(manifest, f):
+                summary["unchanged"] += 1
+            else:
+                changed.append(f)
+        files = changed
+    
+    tasks = [(f, content_type, legacy) for f in files]
+    workers = workers or os.cpu_count() or 1
+    
+    try:
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                chunksize = max(1, len(tasks) // (workers * 4))
+                prepared_list = list(pool.map(_prepare_file_task, tasks, chunksize=chunksize))
+        else:
+            prepared_list = [_prepare_file_task(t) for t in tasks]
+        
+        for prepared in prepared_list:
+            if not prepared["success"]:
+                summary["failed"] += 1
+                summary["results"].append(prepared)
+                continue
+            
+            if prepared["content_hash"] in known_hashes or prepared["legacy_hash"] in known_hashes:
+                summary["duplicates"] += 1
+                summary["results"].append(_duplicate_result(prepared, dry_run))
+                if conn is not None:
+                    record_manifest(conn, prepared["source_path"], prepared)
+                continue
+            known_hashes.add(prepared["content_hash"])
+            
+            if dry_run:
+                result = _result_view(prepared, dry_run)
+            else:
+                result = _store_prepared(conn, prepared, move)
+            summary["ingested"] += 1
+            summary["results"].append(result)
+        
+        if conn is not None:
+            conn.commit()
+    finally:
+        if conn is not None:
+            conn.close()
+    
+    return summary
+
+
+def is_noop(result: dict) -> bool:
+    """Unchanged or duplicate file: nothing to ingest, but not a failure."""
+    return bool(result.get("skipped") or result.get("duplicate"))
+
+
+def print_result(result: dict, dry_run: bool = False):
+    """Print a human-readable summary of one ingest result."""
+    if is_noop(result):
+        print(f"ℹ️  Skipped: {result.get('error')}")
+    elif not result["success"]:
+        print(f"❌ Failed: {result.get('error')}")
+    elif dry_run:
+        print(f"🔍 Would ingest: '{result['title']}'")
+        print(f"   Type: {result['content_type']}")
+        print(f"   Words: {result['word_count']}")
+        print(f"   Would move to: {result['target_path']}")
+    else:
+        print(f"✅ Ingested: '{result['title']}'")
+        print(f"   ID: {result['record_id']}")
+        print(f"   Type: {result['content_type']}")
+        if result.get("moved_to"):
+            print(f"   Moved to: {result['moved_to']}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Content Library Ingest")
-    parser.add_argument("filepath", type=Path, help="File to ingest")
+    parser.add_argument("paths", type=Path, nargs="+",
+                        help="File(s) or directories to ingest")
     parser.add_argument("--type", dest="content_type", 
                         choices=list(TYPE_DIRECTORIES.keys()),
                         help="Content type (auto-detected if not specified)")
@@ -281,6 +595,8 @@ def main():
                         help="Move file to canonical location")
     parser.add_argument("--dry-run", action="store_true",
                         help="Show what would happen without making changes")
+    parser.add_argument("--workers", "-j", type=int,
+                        help="Parser processes for directory ingest (default: CPU count)")
     parser.add_argument("--quiet", "-q", action="store_true",
                         help="Minimal output (JSON only)")
     
@@ -289,38 +605,46 @@ def main():
     # Setup logging
     log_file = setup_logging(args.dry_run)
     
-    # Ingest file
-    result = ingest_file(
-        filepath=args.filepath,
+    # Single file: keep the one-result output format
+    if len(args.paths) == 1 and not args.paths[0].is_dir():
+        result = ingest_file(
+            filepath=args.paths[0],
+            content_type=args.content_type,
+            move=args.move,
+            dry_run=args.dry_run
+        )
+        log_result(log_file, result)
+        if args.quiet:
+            print(json.dumps(result))
+        else:
+            print_result(result, args.dry_run)
+        sys.exit(0 if result["success"] or is_noop(result) else 1)
+    
+    summary = ingest_tree(
+        args.paths,
         content_type=args.content_type,
+        workers=args.workers,
         move=args.move,
         dry_run=args.dry_run
     )
+    for result in summary["results"]:
+        log_result(log_file, result)
     
-    # Log result
-    log_result(log_file, result)
-    
-    # Output
-    if not args.quiet:
-        if not result["success"]:
-            print(f"❌ Failed: {result.get('error')}")
-        elif args.dry_run:
-            print(f"🔍 Would ingest: '{result['title']}'")
-            print(f"   Type: {result['content_type']}")
-            print(f"   Words: {result['word_count']}")
-            print(f"   Would move to: {result['target_path']}")
-        else:
-            print(f"✅ Ingested: '{result['title']}'")
-            print(f"   ID: {result['record_id']}")
-            print(f"   Type: {result['content_type']}")
-            if result.get("moved_to"):
-                print(f"   Moved to: {result['moved_to']}")
-    
-    # Return result as JSON for programmatic use
     if args.quiet:
-        print(json.dumps(result))
+        print(json.dumps({k: v for k, v in summary.items() if k != "results"}))
+    else:
+        for result in summary["results"]:
+            if result["success"]:
+                print_result(result, args.dry_run)
+            elif result.get("error") and "duplicate" not in result["error"]:
+                print(f"❌ {result.get('source_path')}: {result['error']}")
+        verb = "Would ingest" if args.dry_run else "Ingested"
+        print(f"\n{verb} {summary['ingested']} files "
+              f"({summary['unchanged']} unchanged, {summary['duplicates']} duplicates, "
+              f"{summary['failed']} failed)")
+    
+    sys.exit(0 if summary["failed"] == 0 else 1)
 
 
 if __name__ == "__main__":
     main()
-
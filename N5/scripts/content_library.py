@@ -15,6 +15,7 @@ Provides search/add/get/mark_used for links and snippets used by:
 Schema:
 - items: id, type (link|snippet), title, content, url, notes, deprecated, timestamps
 - tags: item_id, tag_key, tag_value (e.g., purpose:signature, channel:email)
+- facets: facet, value, active, total (trigger-maintained counts for stats/list-types)
 
 Usage:
     from content_library import ContentLibrary
@@ -23,22 +24,27 @@ Usage:
     # CLI commands:
     # python3 N5/scripts/content_library.py list-types
     # python3 N5/scripts/content_library.py search --query "X" --type article
+    # python3 N5/scripts/content_library.py search --type article --cursor <next_cursor>
+    # python3 N5/scripts/content_library.py search --jsonl > library.jsonl
     # python3 N5/scripts/content_library.py ingest /path/to/file.md --type article
     # python3 N5/scripts/content_library.py sync
     # python3 N5/scripts/content_library.py stats
+    # python3 N5/scripts/content_library.py facets tag
+    # python3 N5/scripts/content_library.py search --query "X" --rank relevance
     
     # Search with dict tags (key-value matching)
     sigs = lib.search(tags={"purpose": "signature", "channel": "email"})
 """
 
 import argparse
+import base64
 import json
 import sqlite3
 import sys
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Iterator
 
 DB_PATH = Path("/home/workspace/N5/data/content_library.db")
 
@@ -76,6 +82,353 @@ class ContentItem:
         return asdict(self)
 
 
+# ============================================================================
+# TAG EXPRESSIONS
+# ============================================================================
+
+TAG_OPERATORS = ("AND", "OR", "NOT")
+JSON_TAGS_WATERMARK_KEY = "json_tags_backfilled_through"
+
+
+def split_tag(tag: str) -> tuple:
+    """Split 'key:value' into (key, value); bare tags use the 'category' key."""
+    if ":" in tag:
+        key, value = tag.split(":", 1)
+        return key, value
+    return "category", tag
+
+
+def _tokenize_tag_expression(expr: str) -> List[str]:
+    tokens = []
+    for raw in expr.replace("(", " ( ").replace(")", " ) ").split():
+        tokens.append(raw.upper() if raw.upper() in TAG_OPERATORS else raw)
+    return tokens
+
+
+def compile_tag_expression(expr: str, id_column: str = "i.id") -> tuple:
+    """Compile a tag expression into a WHERE fragment over the tags table.
+
+    Grammar (NOT binds tightest, then AND, then OR; parentheses group):
+        needs-transcription AND NOT transcribed
+        (purpose:signature OR purpose:intro) AND channel:email
+
+    Adjacent terms without an operator are ANDed. Each term becomes a
+    semi-join `id IN (SELECT item_id FROM tags WHERE tag_key=? AND tag_value=?)`
+    served by idx_tags_key_value_item, so no JSON text is scanned.
+
+    Returns:
+        (sql_fragment, params)
+    """
+    tokens = _tokenize_tag_expression(expr)
+    pos = 0
+    params: List[str] = []
+
+    def peek() -> Optional[str]:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take() -> str:
+        nonlocal pos
+        token = tokens[pos]
+        pos += 1
+        return token
+
+    def parse_or() -> str:
+        parts = [parse_and()]
+        while peek() == "OR":
+            take()
+            parts.append(parse_and())
+        return parts[0] if len(parts) == 1 else "(" + " OR ".join(parts) + ")"
+
+    def parse_and() -> str:
+        parts = [parse_not()]
+        while peek() is not None and peek() not in ("OR", ")"):
+            if peek() == "AND":
+                take()
+            parts.append(parse_not())
+        return parts[0] if len(parts) == 1 else "(" + " AND ".join(parts) + ")"
+
+    def parse_not() -> str:
+        if peek() == "NOT":
+            take()
+            return f"NOT {parse_not()}"
+        return parse_term()
+
+    def parse_term() -> str:
+        token = peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of tag expression: {expr!r}")
+        take()
+        if token == "(":
+            inner = parse_or()
+            if peek() != ")":
+                raise ValueError(f"Unbalanced parentheses in tag expression: {expr!r}")
+            take()
+            return inner
+        if token in TAG_OPERATORS or token == ")":
+            raise ValueError(f"Unexpected {token!r} in tag expression: {expr!r}")
+        params.extend(split_tag(token))
+        return f"{id_column} IN (SELECT item_id FROM tags WHERE tag_key = ? AND tag_value = ?)"
+
+    sql = parse_or()
+    if peek() is not None:
+        raise ValueError(f"Unexpected {peek()!r} in tag expression: {expr!r}")
+    return sql, params
+
+
+def ensure_tag_indexes(conn: sqlite3.Connection):
+    """Create the covering index used by tag semi-joins (idempotent)."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tags_key_value_item ON tags(tag_key, tag_value, item_id)"
+    )
+
+
+def migrate_json_tags(conn: sqlite3.Connection, full: bool = False) -> int:
+    """Backfill the legacy items.tags JSON column into the normalized tags table.
+
+    Incremental: only items updated since the last recorded watermark are
+    re-synced, and nothing is written unless an item's JSON tags changed, so
+    content_query.py runs this before each query (ContentLibrary on open).
+    The tag set last taken from each item's JSON is kept in json_tags_synced;
+    a sync removes the tags that left the JSON list (so a status flip such as
+    needs-transcription -> transcribed is reflected) and adds the new ones.
+    Tags added through the library's own API are never touched.
+
+    Args:
+        conn: Open connection to the content library DB
+        full: Ignore the watermark and re-sync every item
+
+    Returns:
+        Number of items synced
+    """
+    columns = {r[1] for r in conn.execute("PRAGMA table_info(items)").fetchall()}
+    if "tags" not in columns:
+        return 0
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tags (
+            item_id TEXT NOT NULL,
+            tag_key TEXT NOT NULL,
+            tag_value TEXT NOT NULL,
+            PRIMARY KEY (item_id, tag_key, tag_value),
+            FOREIGN KEY (item_id) REFERENCES items(id) ON DELETE CASCADE
+        )
+    """)
+    ensure_tag_indexes(conn)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS json_tags_synced (
+            item_id TEXT PRIMARY KEY,
+            tags TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+    """)
+
+    watermark = None
+    if not full:
+        row = conn.execute(
+            "SELECT value FROM metadata WHERE key = ?", (JSON_TAGS_WATERMARK_KEY,)
+        ).fetchone()
+        watermark = row[0] if row else None
+
+    sql = "SELECT id, tags, updated_at FROM items WHERE tags IS NOT NULL"
+    params: List[Any] = []
+    if watermark:
+        sql += " AND updated_at >= ?"
+        params.append(watermark)
+
+    synced = 0
+    latest = watermark
+    for item_id, raw_tags, updated_at in conn.execute(sql, params).fetchall():
+        try:
+            tag_list = json.loads(raw_tags) if raw_tags else []
+        except (json.JSONDecodeError, TypeError):
+            tag_list = []
+        if isinstance(tag_list, str):
+            tag_list = [tag_list]
+        new = {split_tag(str(t)) for t in tag_list if t}
+
+        row = conn.execute("SELECT tags FROM json_tags_synced WHERE item_id = ?", (item_id,)).fetchone()
+        old = {tuple(t) for t in json.loads(row[0])} if row else set()
+        if full or new != old or row is None:
+            conn.executemany(
+                "DELETE FROM tags WHERE item_id = ? AND tag_key = ? AND tag_value = ?",
+                [(item_id, *t) for t in old - new],
+            )
+            # A full re-sync re-adds every JSON tag, repairing rows removed by hand
+            conn.executemany(
+                "INSERT OR IGNORE INTO tags (item_id, tag_key, tag_value) VALUES (?, ?, ?)",
+                [(item_id, *t) for t in (new if full else new - old)],
+            )
+            conn.execute(
+                "INSERT INTO json_tags_synced (item_id, tags) VALUES (?, ?) "
+                "ON CONFLICT(item_id) DO UPDATE SET tags = excluded.tags",
+                (item_id, json.dumps(sorted(new))),
+            )
+            synced += 1
+        if updated_at and (latest is None or updated_at > latest):
+            latest = updated_at
+
+    if latest and latest != watermark:
+        conn.execute("""
+            INSERT INTO metadata (key, value, updated_at) VALUES (?, ?, datetime('now'))
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+        """, (JSON_TAGS_WATERMARK_KEY, latest))
+    conn.commit()
+    return synced
+
+
+def encode_cursor(updated_at: str, item_id: str) -> str:
+    """Encode an opaque keyset cursor from the last row's (updated_at, id)."""
+    raw = json.dumps([updated_at, item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor produced by encode_cursor() into (updated_at, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    return updated_at, item_id
+
+
+def next_cursor(item: Any) -> str:
+    """Cursor that resumes after the given item (ContentItem or dict)."""
+    return encode_cursor(item["updated_at"], item["id"])
+
+
+# ============================================================================
+# FACETS
+# ============================================================================
+
+RANK_MODES = ("recency", "usage", "relevance")
+FACET_ITEM_COLUMNS = ("content_type", "subtype")
+
+
+def _facet_upsert(facet: str, value_expr: str, active_expr: str, condition: str = "1") -> str:
+    return f"""
+            INSERT INTO facets (facet, value, active, total)
+            SELECT '{facet}', {value_expr}, {active_expr}, 1 WHERE {condition}
+            ON CONFLICT(facet, value) DO UPDATE SET
+                active = active + excluded.active, total = total + excluded.total;"""
+
+
+def _facet_decrement(facet: str, value_expr: str, active_expr: str) -> str:
+    return f"""
+            UPDATE facets SET active = active - ({active_expr}), total = total - 1
+            WHERE facet = '{facet}' AND value = {value_expr};"""
+
+
+def _facet_triggers(columns: List[str]) -> Dict[str, str]:
+    """Triggers that keep facets in step with items/tags for every writer.
+
+    Returned as {name: CREATE statement} in the exact form sqlite_master
+    stores, so ensure_facets() can tell when the installed set is stale.
+    Deleting an item does not touch its tags: writers delete the tag rows
+    first (facets_tags_ad then decrements the tag facets).
+    """
+    def add_item(ref: str) -> str:
+        sql = _facet_upsert("_items", "'all'", f"{ref}.deprecated = 0")
+        for col in columns:
+            sql += _facet_upsert(col, f"{ref}.{col}", f"{ref}.deprecated = 0", f"{ref}.{col} IS NOT NULL")
+        return sql
+
+    def remove_item(ref: str) -> str:
+        sql = _facet_decrement("_items", "'all'", f"{ref}.deprecated = 0")
+        for col in columns:
+            sql += _facet_decrement(col, f"{ref}.{col}", f"{ref}.deprecated = 0")
+        return sql
+
+    def tag_value(ref: str) -> str:
+        return f"{ref}.tag_key || ':' || {ref}.tag_value"
+
+    def item_active(ref: str) -> str:
+        return f"COALESCE((SELECT deprecated = 0 FROM items WHERE id = {ref}.item_id), 0)"
+
+    watched = ", ".join(["deprecated", *columns])
+    bodies = {
+        "facets_items_ai": f"AFTER INSERT ON items BEGIN{add_item('NEW')}",
+        "facets_items_ad": f"AFTER DELETE ON items BEGIN{remove_item('OLD')}",
+        "facets_items_au": f"""AFTER UPDATE OF {watched} ON items BEGIN{remove_item("OLD")}{add_item("NEW")}
+            UPDATE facets SET active = active + ((NEW.deprecated = 0) - (OLD.deprecated = 0))
+            WHERE facet = 'tag' AND OLD.deprecated != NEW.deprecated AND value IN (
+                SELECT tag_key || ':' || tag_value FROM tags WHERE item_id = NEW.id
+            );""",
+        "facets_tags_ai": f"AFTER INSERT ON tags BEGIN{_facet_upsert('tag', tag_value('NEW'), item_active('NEW'))}",
+        "facets_tags_ad": f"AFTER DELETE ON tags BEGIN{_facet_decrement('tag', tag_value('OLD'), item_active('OLD'))}",
+    }
+    return {name: f"CREATE TRIGGER {name} {body}\n        END" for name, body in bodies.items()}
+
+
+def ensure_facets(conn: sqlite3.Connection):
+    """Create the facets table and its triggers, rebuilding both when stale.
+
+    facets holds one row per (facet, value) — content_type, subtype, tag
+    ('key:value') and the '_items' total — with counts of active
+    (non-deprecated) and all items. Triggers on items/tags keep it current
+    on add/deprecate regardless of which script writes, so stats and facet
+    listings read O(#facets) rows instead of scanning items.
+
+    The installed triggers are compared against the ones the current items
+    columns call for; on any difference (new facet column, changed trigger
+    body) the triggers are dropped and recreated and the counts recomputed
+    in one transaction.
+    """
+    item_columns = {r[1] for r in conn.execute("PRAGMA table_info(items)").fetchall()}
+    columns = [c for c in FACET_ITEM_COLUMNS if c in item_columns]
+    triggers = _facet_triggers(columns)
+
+    installed = dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'facets\\_%' ESCAPE '\\'"
+    ).fetchall())
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'facets'"
+    ).fetchone()
+    if has_table and installed == triggers:
+        return
+
+    backfill = [
+        "INSERT INTO facets (facet, value, active, total) "
+        "SELECT '_items', 'all', COALESCE(SUM(deprecated = 0), 0), COUNT(*) FROM items;"
+    ]
+    for col in columns:
+        backfill.append(
+            f"INSERT INTO facets (facet, value, active, total) "
+            f"SELECT '{col}', {col}, SUM(deprecated = 0), COUNT(*) FROM items "
+            f"WHERE {col} IS NOT NULL GROUP BY {col};"
+        )
+    backfill.append(
+        "INSERT INTO facets (facet, value, active, total) "
+        "SELECT 'tag', t.tag_key || ':' || t.tag_value, SUM(COALESCE(i.deprecated = 0, 0)), COUNT(*) "
+        "FROM tags t LEFT JOIN items i ON i.id = t.item_id GROUP BY t.tag_key, t.tag_value;"
+    )
+    drops = "".join(f"DROP TRIGGER IF EXISTS {name};\n" for name in installed)
+    creates = "".join(f"{sql};\n" for sql in triggers.values())
+
+    conn.executescript(f"""
+        BEGIN;
+        {drops}
+        CREATE TABLE IF NOT EXISTS facets (
+            facet TEXT NOT NULL,
+            value TEXT NOT NULL,
+            active INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (facet, value)
+        );
+        CREATE INDEX IF NOT EXISTS idx_facets_active ON facets(facet, active DESC);
+        DELETE FROM facets;
+        {creates}
+        {chr(10).join(backfill)}
+        COMMIT;
+    """)
+
+
 class ContentLibrary:
     """Unified content library for links and snippets."""
     
@@ -87,6 +440,23 @@ class ContentLibrary:
         """Ensure database and tables exist."""
         if not self.db_path.exists():
             self._create_schema()
+        self._migrate()
+    
+    def _migrate(self):
+        """Add columns, indexes and facets introduced after a DB was first created."""
+        conn = sqlite3.connect(self.db_path)
+        columns = {r[1] for r in conn.execute("PRAGMA table_info(items)").fetchall()}
+        if "use_count" not in columns:
+            conn.execute("ALTER TABLE items ADD COLUMN use_count INTEGER NOT NULL DEFAULT 0")
+        conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_tags_key_value_item ON tags(tag_key, tag_value, item_id);
+            CREATE INDEX IF NOT EXISTS idx_items_updated_id ON items(updated_at DESC, id DESC);
+            CREATE INDEX IF NOT EXISTS idx_items_usage ON items(use_count DESC, last_used_at DESC);
+        """)
+        conn.commit()
+        migrate_json_tags(conn)
+        ensure_facets(conn)
+        conn.close()
     
     def _create_schema(self):
         """Create database schema."""
@@ -105,6 +475,7 @@ class ContentLibrary:
                 expires_at TEXT,
                 version INTEGER NOT NULL DEFAULT 1,
                 last_used_at TEXT,
+                use_count INTEGER NOT NULL DEFAULT 0,
                 notes TEXT,
                 source TEXT
             );
@@ -119,7 +490,9 @@ class ContentLibrary:
             CREATE INDEX IF NOT EXISTS idx_items_deprecated ON items(deprecated);
             CREATE INDEX IF NOT EXISTS idx_items_title ON items(title COLLATE NOCASE);
             CREATE INDEX IF NOT EXISTS idx_tags_key_value ON tags(tag_key, tag_value);
+            CREATE INDEX IF NOT EXISTS idx_tags_key_value_item ON tags(tag_key, tag_value, item_id);
             CREATE INDEX IF NOT EXISTS idx_items_updated ON items(updated_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_items_updated_id ON items(updated_at DESC, id DESC);
             CREATE TABLE IF NOT EXISTS metadata (
                 key TEXT PRIMARY KEY,
                 value TEXT NOT NULL,
@@ -179,7 +552,21 @@ class ContentLibrary:
                 result["category"] = tag
         return result
     
-    def search(
+    def _get_tags_bulk(self, conn: sqlite3.Connection, item_ids: List[str]) -> Dict[str, Dict[str, str]]:
+        """Get tags for many items in one query, as {item_id: {key: value}}."""
+        result: Dict[str, Dict[str, str]] = {item_id: {} for item_id in item_ids}
+        if not item_ids:
+            return result
+        placeholders = ",".join("?" for _ in item_ids)
+        rows = conn.execute(
+            f"SELECT item_id, tag_key, tag_value FROM tags WHERE item_id IN ({placeholders})",
+            item_ids,
+        ).fetchall()
+        for r in rows:
+            result[r["item_id"]][r["tag_key"]] = r["tag_value"]
+        return result
+    
+    def _build_filter(
         self,
         query: Optional[str] = None,
         item_type: Optional[str] = None,
@@ -187,26 +574,8 @@ class ContentLibrary:
         subtype: Optional[str] = None,
         tags: Union[List[str], Dict[str, str], None] = None,
         include_deprecated: bool = False,
-        limit: int = 50,
-    ) -> List[ContentItem]:
-        """Search content library items.
-        
-        Args:
-            query: Text search in title, content, notes
-            item_type: 'link' or 'snippet' (legacy type field)
-            content_type: Filter by content_type (article, deck, paper, etc.)
-            subtype: Filter by subtype (e.g., 'scheduling-link' within 'link')
-            tags: Filter by tags. Can be:
-                - Dict: {"purpose": "signature", "channel": "email"} - all must match
-                - List: ["purpose:signature", "channel:email"] - same as dict
-            include_deprecated: Include deprecated items
-            limit: Max results
-        
-        Returns:
-            List of ContentItem matching criteria
-        """
-        conn = self._get_conn()
-        
+    ) -> tuple:
+        """Build (tag_join, conditions, params) shared by search() and iter_items()."""
         conditions = []
         params = []
         
@@ -230,39 +599,142 @@ class ContentLibrary:
             like_query = f"%{query}%"
             params.extend([like_query, like_query, like_query])
         
-        # Parse tag filter and build SQL conditions
+        # Parse tag filter and build SQL join; join params precede WHERE params
         tag_filter = self._parse_tag_filter(tags)
         tag_join = ""
-        if tag_filter:
+        join_params = []
+        for i, (key, value) in enumerate(tag_filter.items()):
             # For each tag requirement, we need to join to ensure ALL tags match
-            for i, (key, value) in enumerate(tag_filter.items()):
-                alias = f"t{i}"
-                tag_join += f" JOIN tags {alias} ON i.id = {alias}.item_id AND {alias}.tag_key = ? AND {alias}.tag_value = ?"
-                params.insert(len(params), key)
-                params.insert(len(params), value)
+            alias = f"t{i}"
+            tag_join += f" JOIN tags {alias} ON i.id = {alias}.item_id AND {alias}.tag_key = ? AND {alias}.tag_value = ?"
+            join_params.extend([key, value])
         
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        return tag_join, conditions, join_params + params
+    
+    def _fetch_page(
+        self,
+        conn: sqlite3.Connection,
+        tag_join: str,
+        conditions: List[str],
+        params: List[Any],
+        limit: int,
+        cursor: Optional[str] = None,
+        order_sql: Optional[str] = None,
+        order_params: Optional[List[Any]] = None,
+    ) -> List[ContentItem]:
+        """Fetch one page; keyset-paged by (updated_at, id) unless order_sql is given."""
+        conditions = list(conditions)
+        params = list(params)
+        if cursor:
+            after_updated, after_id = decode_cursor(cursor)
+            conditions.append("(i.updated_at, i.id) < (?, ?)")
+            params.extend([after_updated, after_id])
         
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
         sql = f"""
             SELECT DISTINCT i.* FROM items i
             {tag_join}
             WHERE {where_clause}
-            ORDER BY i.updated_at DESC
+            ORDER BY {order_sql or "i.updated_at DESC, i.id DESC"}
             LIMIT ?
         """
+        params.extend(order_params or [])
         params.append(limit)
         
         rows = conn.execute(sql, params).fetchall()
+        tags_by_id = self._get_tags_bulk(conn, [row["id"] for row in rows])
+        return [self._row_to_item(row, tags_by_id[row["id"]]) for row in rows]
+    
+    def _rank_order(self, rank: str, query: Optional[str]) -> tuple:
+        """Return (order_sql, order_params) for a rank mode; None means recency."""
+        if rank not in RANK_MODES:
+            raise ValueError(f"Unknown rank {rank!r}; expected one of {', '.join(RANK_MODES)}")
+        if rank == "recency":
+            return None, []
+        usage = "i.use_count DESC, i.last_used_at DESC, i.updated_at DESC, i.id DESC"
+        if rank == "relevance" and query:
+            # Title prefix > title substring > body/notes match, then usage
+            return (
+                f"CASE WHEN i.title LIKE ? THEN 0 WHEN i.title LIKE ? THEN 1 ELSE 2 END, {usage}",
+                [f"{query}%", f"%{query}%"],
+            )
+        return usage, []
+    
+    def search(
+        self,
+        query: Optional[str] = None,
+        item_type: Optional[str] = None,
+        content_type: Optional[str] = None,
+        subtype: Optional[str] = None,
+        tags: Union[List[str], Dict[str, str], None] = None,
+        include_deprecated: bool = False,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        rank: str = "recency",
+    ) -> List[ContentItem]:
+        """Search content library items.
         
-        # Get tags for each result
-        results = []
-        for row in rows:
-            item_tags = self._get_tags(conn, row["id"])
-            results.append(self._row_to_item(row, item_tags))
+        Args:
+            query: Text search in title, content, notes
+            item_type: 'link' or 'snippet' (legacy type field)
+            content_type: Filter by content_type (article, deck, paper, etc.)
+            subtype: Filter by subtype (e.g., 'scheduling-link' within 'link')
+            tags: Filter by tags. Can be:
+                - Dict: {"purpose": "signature", "channel": "email"} - all must match
+                - List: ["purpose:signature", "channel:email"] - same as dict
+            include_deprecated: Include deprecated items
+            limit: Max results
+            cursor: Resume after this cursor (see next_cursor()) for keyset paging;
+                only valid with rank="recency"
+            rank: "recency" (updated_at), "usage" (use_count, last_used_at) or
+                "relevance" (title match strength, then usage)
         
+        Returns:
+            List of ContentItem matching criteria
+        """
+        order_sql, order_params = self._rank_order(rank, query)
+        if cursor and order_sql:
+            raise ValueError("cursor paging is only supported with rank='recency'")
+        tag_join, conditions, params = self._build_filter(
+            query, item_type, content_type, subtype, tags, include_deprecated
+        )
+        conn = self._get_conn()
+        results = self._fetch_page(
+            conn, tag_join, conditions, params, limit, cursor, order_sql, order_params
+        )
         conn.close()
         return results
     
+    def iter_items(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+        cursor: Optional[str] = None,
+    ) -> Iterator[ContentItem]:
+        """Stream all matching items with constant memory.
+        
+        Pages through results with keyset pagination on (updated_at, id), so
+        each batch is an index range scan rather than a growing OFFSET.
+        
+        Args:
+            filters: Keyword arguments accepted by search() (query, content_type,
+                subtype, tags, include_deprecated, item_type)
+            batch_size: Rows fetched per query
+            cursor: Resume after this cursor
+        
+        Yields:
+            ContentItem in updated_at DESC, id DESC order
+        """
+        tag_join, conditions, params = self._build_filter(**(filters or {}))
+        while True:
+            conn = self._get_conn()
+            page = self._fetch_page(conn, tag_join, conditions, params, batch_size, cursor)
+            conn.close()
+            yield from page
+            if len(page) < batch_size:
+                return
+            cursor = next_cursor(page[-1])
+    
     def get(self, item_id: str) -> Optional[ContentItem]:
         """Get a specific item by ID."""
         conn = self._get_conn()
@@ -328,11 +800,11 @@ class ContentLibrary:
         return item
     
     def mark_used(self, item_id: str) -> bool:
-        """Mark an item as used (updates last_used_at timestamp)."""
+        """Mark an item as used (updates last_used_at and use_count)."""
         conn = self._get_conn()
         now = datetime.now().isoformat()
         cursor = conn.execute(
-            "UPDATE items SET last_used_at = ? WHERE id = ?",
+            "UPDATE items SET last_used_at = ?, use_count = use_count + 1 WHERE id = ?",
             (now, item_id)
         )
         conn.commit()
@@ -351,34 +823,46 @@ class ContentLibrary:
         conn.close()
         return True
     
-    def list_tags(self) -> List[str]:
-        """List all unique tag key:value combinations."""
+    def facet_counts(self, facet: str, include_deprecated: bool = False) -> Dict[str, int]:
+        """Counts per value for a facet ('content_type', 'subtype' or 'tag').
+        
+        Reads the trigger-maintained facets table, ordered by count.
+        """
+        column = "total" if include_deprecated else "active"
         conn = self._get_conn()
         rows = conn.execute(
-            "SELECT DISTINCT tag_key || ':' || tag_value as tag FROM tags ORDER BY tag"
+            f"SELECT value, {column} AS count FROM facets WHERE facet = ? AND {column} > 0 "
+            f"ORDER BY {column} DESC, value",
+            (facet,)
         ).fetchall()
         conn.close()
-        return [r["tag"] for r in rows]
+        return {r["value"]: r["count"] for r in rows}
     
-    def list_content_types(self) -> Dict[str, int]:
-        """List all content types with counts."""
+    def list_tags(self) -> List[str]:
+        """List all unique tag key:value combinations."""
         conn = self._get_conn()
         rows = conn.execute(
-            "SELECT content_type, COUNT(*) as count FROM items WHERE deprecated = 0 AND content_type IS NOT NULL GROUP BY content_type ORDER BY count DESC"
+            "SELECT value FROM facets WHERE facet = 'tag' AND total > 0 ORDER BY value"
         ).fetchall()
         conn.close()
-        return {r["content_type"]: r["count"] for r in rows}
+        return [r["value"] for r in rows]
+    
+    def list_content_types(self) -> Dict[str, int]:
+        """List all content types with counts."""
+        return self.facet_counts("content_type")
     
     def stats(self) -> Dict[str, Any]:
         """Get library statistics."""
         conn = self._get_conn()
-        total = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
-        active = conn.execute("SELECT COUNT(*) FROM items WHERE deprecated = 0").fetchone()[0]
-        by_content_type = dict(conn.execute(
-            "SELECT content_type, COUNT(*) FROM items WHERE deprecated = 0 AND content_type IS NOT NULL GROUP BY content_type"
-        ).fetchall())
+        row = conn.execute(
+            "SELECT active, total FROM facets WHERE facet = '_items' AND value = 'all'"
+        ).fetchone()
         conn.close()
-        return {"total": total, "active": active, "by_content_type": by_content_type}
+        return {
+            "total": row["total"] if row else 0,
+            "active": row["active"] if row else 0,
+            "by_content_type": self.facet_counts("content_type"),
+        }
 
 
 # Backward compatibility alias
@@ -396,8 +880,11 @@ def main():
     search_p.add_argument("--type", "-t", dest="item_type", choices=["link", "snippet", "article", "deck", "paper", "book", "framework", "social-post", "podcast", "video", "quote"], help="Filter by content type (legacy alias for --content-type)")
     search_p.add_argument("--content-type", "-c", help="Content type filter (article, deck, paper, etc.)")
     search_p.add_argument("--tags", nargs="+", help="Filter by tags (key:value format)")
-    search_p.add_argument("--limit", "-n", type=int, default=20, help="Max results")
+    search_p.add_argument("--limit", "-n", type=int, help="Max results (default: 20; all with --jsonl)")
+    search_p.add_argument("--cursor", help="Resume after this cursor (printed as next_cursor)")
+    search_p.add_argument("--rank", choices=RANK_MODES, default="recency", help="Result ordering (default: recency)")
     search_p.add_argument("--json", action="store_true", help="JSON output")
+    search_p.add_argument("--jsonl", action="store_true", help="Stream one JSON object per line")
     
     # Get
     get_p = subparsers.add_parser("get", help="Get item by ID")
@@ -413,28 +900,44 @@ def main():
     # List content types (NEW)
     subparsers.add_parser("list-types", help="List content types with counts")
     
+    # Facet counts
+    facets_p = subparsers.add_parser("facets", help="Show item counts for a facet")
+    facets_p.add_argument("facet", choices=["content_type", "subtype", "tag"], help="Facet to count")
+    facets_p.add_argument("--include-deprecated", action="store_true", help="Count deprecated items too")
+    
     # Ingest (NEW)
-    ingest_p = subparsers.add_parser("ingest", help="Ingest a content file")
-    ingest_p.add_argument("file", help="Path to file to ingest")
+    ingest_p = subparsers.add_parser("ingest", help="Ingest a content file or directory")
+    ingest_p.add_argument("file", help="Path to file or directory to ingest")
     ingest_p.add_argument("--type", dest="content_type", help="Content type (article, deck, paper, etc.)")
     ingest_p.add_argument("--dry-run", action="store_true", help="Preview without writing")
     ingest_p.add_argument("--move", action="store_true", help="Move file to canonical location")
+    ingest_p.add_argument("--workers", "-j", type=int, help="Parser processes (default: CPU count)")
     
     # Sync (NEW)
-    sync_p = subparsers.add_parser("sync", help="Run backfill to sync all content files")
+    sync_p = subparsers.add_parser("sync", help="Ingest all files under the canonical content-library root")
     sync_p.add_argument("--dry-run", action="store_true", help="Preview without writing")
+    sync_p.add_argument("--workers", "-j", type=int, help="Parser processes (default: CPU count)")
     
     args = parser.parse_args()
     lib = ContentLibrary()
     
     if args.command == "search":
-        items = lib.search(
-            query=args.query,
-            item_type=args.item_type,
-            content_type=getattr(args, 'content_type', None),
-            tags=args.tags,
-            limit=args.limit,
-        )
+        filters = {
+            "query": args.query,
+            "item_type": args.item_type,
+            "content_type": getattr(args, 'content_type', None),
+            "tags": args.tags,
+        }
+        if args.jsonl:
+            # Stream with constant memory; stdout consumers read incrementally
+            for n, item in enumerate(lib.iter_items(filters, cursor=args.cursor)):
+                if args.limit is not None and n >= args.limit:
+                    break
+                sys.stdout.write(json.dumps(item.to_dict()) + "\n")
+            return
+        
+        limit = args.limit if args.limit is not None else 20
+        items = lib.search(limit=limit, cursor=args.cursor, rank=args.rank, **filters)
         if args.json:
             print(json.dumps([i.to_dict() for i in items], indent=2))
         else:
@@ -446,6 +949,8 @@ def main():
                 if item.tags:
                     tag_str = ", ".join(f"{k}:{v}" for k, v in item.tags.items())
                     print(f"  Tags: {tag_str}")
+        if len(items) == limit and args.rank == "recency":
+            print(f"next_cursor: {next_cursor(items[-1])}", file=sys.stderr)
     
     elif args.command == "get":
         item = lib.get(args.id)
@@ -484,6 +989,13 @@ def main():
         for tag in lib.list_tags():
             print(tag)
     
+    elif args.command == "facets":
+        counts = lib.facet_counts(args.facet, include_deprecated=args.include_deprecated)
+        if not counts:
+            print(f"No {args.facet} values found.")
+        for value, count in counts.items():
+            print(f"  {value}: {count}")
+    
     elif args.command == "list-types":
         types = lib.list_content_types()
         if not types:
@@ -494,24 +1006,33 @@ def main():
                 print(f"  {ct}: {count}")
     
     elif args.command == "ingest":
-        import subprocess
-        cmd = ["python3", "N5/scripts/content_ingest.py", args.file]
-        if args.content_type:
-            cmd.extend(["--type", args.content_type])
-        if args.dry_run:
-            cmd.append("--dry-run")
-        if args.move:
-            cmd.append("--move")
-        result = subprocess.run(cmd, cwd="/home/workspace")
-        sys.exit(result.returncode)
+        from content_ingest import ingest_tree, print_result
+        summary = ingest_tree(
+            [args.file],
+            content_type=args.content_type,
+            workers=args.workers,
+            move=args.move,
+            dry_run=args.dry_run,
+        )
+        for result in summary["results"]:
+            if result["success"]:
+                print_result(result, args.dry_run)
+            elif result.get("error") and "duplicate" not in result["error"]:
+                print(f"❌ {result.get('source_path')}: {result['error']}")
+        verb = "Would ingest" if args.dry_run else "Ingested"
+        print(f"{verb} {summary['ingested']} files "
+              f"({summary['unchanged']} unchanged, {summary['duplicates']} duplicates, "
+              f"{summary['failed']} failed)")
+        sys.exit(0 if summary["failed"] == 0 else 1)
     
     elif args.command == "sync":
-        import subprocess
-        cmd = ["python3", "N5/scripts/content_backfill.py"]
-        if args.dry_run:
-            cmd.append("--dry-run")
-        result = subprocess.run(cmd, cwd="/home/workspace")
-        sys.exit(result.returncode)
+        from content_ingest import CANONICAL_ROOT, ingest_tree
+        summary = ingest_tree([CANONICAL_ROOT], workers=args.workers, dry_run=args.dry_run)
+        verb = "Would ingest" if args.dry_run else "Ingested"
+        print(f"{verb} {summary['ingested']} files "
+              f"({summary['unchanged']} unchanged, {summary['duplicates']} already present, "
+              f"{summary['failed']} failed)")
+        sys.exit(0 if summary["failed"] == 0 else 1)
     
     else:
         parser.print_help()
@@ -7,13 +7,30 @@ Part of Content Library Media Extension build (Worker 3)
 
 Usage:
     python3 content_query.py [--type TYPE] [--tag TAG] [--search TERM] [--limit N]
+    python3 content_query.py --tag "needs-transcription AND NOT transcribed"
+    python3 content_query.py --resync-tags
+    python3 content_query.py --type audio --cursor <next_cursor>
+    python3 content_query.py --tag needs-transcription --jsonl | consumer
+
+Tag filters go through the normalized `tags` table shared with
+content_library.py. Before each query, items whose legacy `items.tags` JSON
+changed since the last sync are brought into it (no writes when none did).
 """
 
 import argparse
 import json
 import sqlite3
+import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator
+
+from content_library import (
+    compile_tag_expression,
+    decode_cursor,
+    migrate_json_tags,
+    next_cursor,
+)
 
 DB_PATH = Path("/home/workspace/N5/data/content_library.db")
 
@@ -32,33 +49,13 @@ def format_duration(seconds: int | None) -> str:
         return f"{secs}s"
 
 
-def query_items(
+def _build_conditions(
     content_type: str | None = None,
     tag: str | None = None,
     search: str | None = None,
-    limit: int = 20,
     include_deprecated: bool = False,
-    output_format: str = "table"
-) -> list[dict]:
-    """
-    Query items from the Content Library.
-    
-    Args:
-        content_type: Filter by content_type (article, audio, video, image, etc.)
-        tag: Filter by tag (needs-transcription, transcribed, etc.)
-        search: Search in title and content
-        limit: Max results
-        include_deprecated: Include deprecated items
-        output_format: 'table', 'json', or 'brief'
-    
-    Returns:
-        List of matching items
-    """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    # Build query
+) -> tuple[list[str], list]:
+    """Build WHERE conditions shared by query_items() and iter_items()."""
     conditions = []
     params = []
     
@@ -70,13 +67,32 @@ def query_items(
         params.append(content_type)
     
     if tag:
-        conditions.append("tags LIKE ?")
-        params.append(f'%"{tag}"%')
+        tag_sql, tag_params = compile_tag_expression(tag, id_column="items.id")
+        conditions.append(tag_sql)
+        params.extend(tag_params)
     
     if search:
         conditions.append("(title LIKE ? OR content LIKE ?)")
         params.extend([f"%{search}%", f"%{search}%"])
     
+    return conditions, params
+
+
+def _fetch_page(
+    conn: sqlite3.Connection,
+    conditions: list[str],
+    params: list,
+    limit: int,
+    cursor: str | None = None,
+) -> list[dict]:
+    """Fetch one keyset page ordered by (updated_at, id) descending."""
+    conditions = list(conditions)
+    params = list(params)
+    if cursor:
+        after_updated, after_id = decode_cursor(cursor)
+        conditions.append("(updated_at, id) < (?, ?)")
+        params.extend([after_updated, after_id])
+    
     where_clause = " AND ".join(conditions) if conditions else "1=1"
     
     query = f"""
@@ -85,17 +101,13 @@ def query_items(
                transcript_path, source_file_path, url
         FROM items
         WHERE {where_clause}
-        ORDER BY updated_at DESC
+        ORDER BY updated_at DESC, id DESC
         LIMIT ?
     """
     params.append(limit)
     
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    conn.close()
-    
     items = []
-    for row in rows:
+    for row in conn.execute(query, params).fetchall():
         item = dict(row)
         # Parse tags JSON
         if item.get("tags"):
@@ -108,6 +120,76 @@ def query_items(
     return items
 
 
+def query_items(
+    content_type: str | None = None,
+    tag: str | None = None,
+    search: str | None = None,
+    limit: int = 20,
+    include_deprecated: bool = False,
+    output_format: str = "table",
+    cursor: str | None = None,
+) -> list[dict]:
+    """
+    Query items from the Content Library.
+    
+    Args:
+        content_type: Filter by content_type (article, audio, video, image, etc.)
+        tag: Filter by tag or tag expression, e.g. "needs-transcription AND NOT
+            transcribed". Supports AND/OR/NOT and parentheses; key:value
+            terms match tag_key/tag_value, bare terms match category tags.
+        search: Search in title and content
+        limit: Max results
+        include_deprecated: Include deprecated items
+        output_format: 'table', 'json', or 'brief'
+        cursor: Resume after this keyset cursor (from next_cursor())
+    
+    Returns:
+        List of matching items
+    """
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    migrate_json_tags(conn)
+    
+    conditions, params = _build_conditions(content_type, tag, search, include_deprecated)
+    items = _fetch_page(conn, conditions, params, limit, cursor)
+    conn.close()
+    
+    return items
+
+
+def iter_items(
+    filters: dict | None = None,
+    batch_size: int = 500,
+    cursor: str | None = None,
+) -> Iterator[dict]:
+    """
+    Stream matching items in batches with constant memory.
+    
+    Args:
+        filters: Keyword arguments for the filter (content_type, tag, search,
+            include_deprecated)
+        batch_size: Rows fetched per keyset page
+        cursor: Resume after this cursor
+    
+    Yields:
+        Item dicts in updated_at DESC, id DESC order
+    """
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    migrate_json_tags(conn)
+    conditions, params = _build_conditions(**(filters or {}))
+    
+    try:
+        while True:
+            page = _fetch_page(conn, conditions, params, batch_size, cursor)
+            yield from page
+            if len(page) < batch_size:
+                return
+            cursor = next_cursor(page[-1])
+    finally:
+        conn.close()
+
+
 def print_table(items: list[dict]):
     """Print items as a formatted table."""
     if not items:
@@ -153,7 +235,7 @@ def main():
     )
     parser.add_argument(
         "--tag",
-        help="Filter by tag (needs-transcription, transcribed, etc.)"
+        help="Filter by tag or tag expression (e.g. 'needs-transcription AND NOT transcribed')"
     )
     parser.add_argument(
         "--search", "-s",
@@ -162,8 +244,16 @@ def main():
     parser.add_argument(
         "--limit", "-n",
         type=int,
-        default=20,
-        help="Max results (default: 20)"
+        help="Max results (default: 20; all with --jsonl)"
+    )
+    parser.add_argument(
+        "--cursor",
+        help="Resume after this cursor (printed as next_cursor)"
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Stream every match as one JSON object per line"
     )
     parser.add_argument(
         "--include-deprecated",
@@ -178,15 +268,43 @@ def main():
         help="Output format (default: table)"
     )
     
+    parser.add_argument(
+        "--resync-tags",
+        action="store_true",
+        help="Re-sync every item's JSON tags into the tags table and exit"
+    )
+    
     args = parser.parse_args()
     
+    if args.resync_tags:
+        conn = sqlite3.connect(DB_PATH)
+        synced = migrate_json_tags(conn, full=True)
+        conn.close()
+        print(f"Synced tags for {synced} items")
+        return
+    
+    if args.jsonl:
+        filters = {
+            "content_type": args.content_type,
+            "tag": args.tag,
+            "search": args.search,
+            "include_deprecated": args.include_deprecated,
+        }
+        for n, item in enumerate(iter_items(filters, cursor=args.cursor)):
+            if args.limit is not None and n >= args.limit:
+                break
+            sys.stdout.write(json.dumps(item, default=str) + "\n")
+        return
+    
+    limit = args.limit if args.limit is not None else 20
     items = query_items(
         content_type=args.content_type,
         tag=args.tag,
         search=args.search,
-        limit=args.limit,
+        limit=limit,
         include_deprecated=args.include_deprecated,
-        output_format=args.output_format
+        output_format=args.output_format,
+        cursor=args.cursor
     )
     
     if args.output_format == "json":
@@ -195,6 +313,9 @@ def main():
         print_brief(items)
     else:
         print_table(items)
+    
+    if len(items) == limit:
+        print(f"next_cursor: {next_cursor(items[-1])}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -9,21 +9,36 @@ Commands:
   resume <slug>    - Resume a stopped build
   tick <slug>      - Run single orchestration cycle (for scheduled tasks)
   finalize <slug>  - Run post-build finalization (safety, tests, learnings)
+  stats <slug>     - Critical path and where wall time went (from trace.jsonl)
+  daemon [slug]    - Event-driven orchestration: tick on new deposits and Drop deadlines
+                     (all active builds when no slug is given)
+  supervise        - Daemon over all active builds with global/per-build spawn caps
 """
 
 import argparse
 import asyncio
-import aiohttp
 import json
 import os
 import sys
 import sqlite3
-import subprocess
+import time
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional
 
-from pulse_common import PATHS, WORKSPACE
+from pulse_common import (
+    PATHS, WORKSPACE, BuildLocked, build_lock, load_config, list_builds, load_deposits,
+    write_text_atomic, catalog_record
+)
+from pulse_api import ask, api_metrics, run_and_close
+from pulse_watch import DepositWatcher, DeadlineHeap
+from pulse_graph import BuildGraph, GraphError, get_graph
+from pulse_scheduler import SpawnScheduler, format_report
+from pulse_snapshot import BuildSnapshot, forget_build
+from pulse_trace import TickTrace, build_stats, format_stats
+import pulse_learnings
+import pulse_safety
+import pulse_state
 
 # Paths
 # WORKSPACE = Path("/home/workspace")  # Now imported from pulse_common
@@ -34,11 +49,16 @@ SKILLS_DIR = PATHS.SCRIPTS
 # Config
 DEFAULT_POLL_INTERVAL = 180  # 3 minutes
 DEFAULT_DEAD_THRESHOLD = 900  # 15 minutes
-ZO_API_URL = "https://api.zo.computer/zo/ask"
+DAEMON_RESCAN_INTERVAL = 60  # seconds between active-build rescans in daemon mode
+DAEMON_RETRY_BASE = 2  # seconds before re-ticking a build whose tick failed (doubles, capped at the rescan interval)
+TICK_RETRY = "_tick_retry"  # DeadlineHeap drop_id for failed-tick retries
+SPAWN_RETRY = "_spawn_retry"  # DeadlineHeap drop_id for re-granting spawns whose round raised
 
 
 def load_meta(slug: str) -> dict:
-    """Load build meta.json"""
+    """Load build state (meta.json, or the SQLite store when state.backend = sqlite)"""
+    if pulse_state.enabled():
+        return pulse_state.load_state(slug)
     meta_path = BUILDS_DIR / slug / "meta.json"
     if not meta_path.exists():
         raise FileNotFoundError(f"Build not found: {slug}")
@@ -47,43 +67,37 @@ def load_meta(slug: str) -> dict:
 
 
 def save_meta(slug: str, meta: dict):
-    """Save build meta.json"""
-    meta_path = BUILDS_DIR / slug / "meta.json"
-    with open(meta_path, "w") as f:
-        json.dump(meta, f, indent=2)
+    """Save build state; meta.json is rewritten atomically and only if it changed.
+    
+    With the SQLite store, only the fields this process changed are merged in,
+    and `meta` is refreshed in place with the merged result.
+    """
+    if pulse_state.enabled():
+        merged = pulse_state.save_state(slug, meta)
+        meta.clear()
+        meta.update(merged)
+    else:
+        write_text_atomic(BUILDS_DIR / slug / "meta.json", json.dumps(meta, indent=2))
+    catalog_record(slug, meta)
 
 
-def load_drop_brief(slug: str, drop_id: str) -> str:
+def load_drop_brief(slug: str, drop_id: str, snapshot: Optional[BuildSnapshot] = None) -> str:
     """Load a Drop brief from drops/ folder"""
-    drops_dir = BUILDS_DIR / slug / "drops"
-    # Try both D and C prefixes
-    for pattern in [f"{drop_id}-*.md", f"C*.md"]:
-        for f in drops_dir.glob(pattern):
-            if f.stem.startswith(drop_id):
-                return f.read_text()
-    # Fallback: exact match
-    for f in drops_dir.glob("*.md"):
-        if f.stem.split("-")[0] == drop_id:
-            return f.read_text()
-    raise FileNotFoundError(f"Brief not found for {drop_id}")
-
-
-def get_deposit(slug: str, drop_id: str) -> Optional[dict]:
+    snapshot = snapshot or BuildSnapshot(slug)
+    brief = snapshot.brief(drop_id)
+    if brief is None:
+        raise FileNotFoundError(f"Brief not found for {drop_id}")
+    return brief
+
+
+def get_deposit(slug: str, drop_id: str, snapshot: Optional[BuildSnapshot] = None) -> Optional[dict]:
     """Get a Drop's deposit if it exists"""
-    deposit_path = BUILDS_DIR / slug / "deposits" / f"{drop_id}.json"
-    if deposit_path.exists():
-        with open(deposit_path) as f:
-            return json.load(f)
-    return None
+    return (snapshot or BuildSnapshot(slug)).deposit(drop_id)
 
 
-def get_filter_result(slug: str, drop_id: str) -> Optional[dict]:
+def get_filter_result(slug: str, drop_id: str, snapshot: Optional[BuildSnapshot] = None) -> Optional[dict]:
     """Get Filter judgment for a Drop if it exists"""
-    filter_path = BUILDS_DIR / slug / "deposits" / f"{drop_id}_filter.json"
-    if filter_path.exists():
-        with open(filter_path) as f:
-            return json.load(f)
-    return None
+    return (snapshot or BuildSnapshot(slug)).filter_result(drop_id)
 
 
 def register_drop_conversation(drop_id: str, slug: str, convo_id: str):
@@ -144,7 +158,6 @@ def update_status_md(slug: str, meta: dict):
     
     content = f"""# Build Status: {slug}
 
-**Updated:** {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}
 **Status:** {meta.get('status', 'unknown')}
 **Stream:** {meta.get('current_stream', '?')}/{meta.get('total_streams', '?')}
 **Progress:** {len(complete)}/{total} Drops ({pct}%)
@@ -165,7 +178,16 @@ def update_status_md(slug: str, meta: dict):
 {chr(10).join(f'- [x] {d} (Filter rejected)' for d in sorted(failed)) or '(none)'}
 """
     
-    status_path.write_text(content)
+    # The Updated stamp is left out of the comparison so an idle tick does not rewrite the file
+    try:
+        lines = status_path.read_text().splitlines(keepends=True)
+        if "".join(l for l in lines if not l.startswith("**Updated:**")) == content:
+            return
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    stamp = f"**Updated:** {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
+    header, _, rest = content.partition("\n\n")
+    write_text_atomic(status_path, f"{header}\n\n{stamp}{rest}")
 
 
 async def send_sms(message: str):
@@ -177,18 +199,9 @@ async def send_sms(message: str):
     
     prompt = f"Send this SMS to V immediately, no commentary: {message}"
     
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            ZO_API_URL,
-            headers={
-                "authorization": token,
-                "content-type": "application/json"
-            },
-            json={"input": prompt}
-        ) as resp:
-            result = await resp.json()
-            print(f"[SMS SENT] {message}")
-            return result
+    result = await ask(prompt, token=token, idempotent=False)
+    print(f"[SMS SENT] {message}")
+    return result
 
 
 async def spawn_drop(slug: str, drop_id: str, brief: str, model: str = None) -> str:
@@ -219,22 +232,10 @@ THEN EXECUTE:
 
 Begin execution now. Initialize SESSION_STATE first, then work, then write deposit."""
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            ZO_API_URL,
-            headers={
-                "authorization": token,
-                "content-type": "application/json"
-            },
-            json={
-                "input": full_prompt,
-                "model_name": model
-            }
-        ) as resp:
-            result = await resp.json()
-            # Extract conversation_id from response if available
-            convo_id = result.get("conversation_id", f"unknown_{drop_id}_{datetime.now().timestamp()}")
-            return convo_id
+    result = await ask(full_prompt, model_name=model, token=token, idempotent=False)
+    # Extract conversation_id from response if available
+    convo_id = result.get("conversation_id", f"unknown_{drop_id}_{datetime.now().timestamp()}")
+    return convo_id
 
 
 async def run_filter(slug: str, drop_id: str, brief: str, deposit: dict) -> dict:
@@ -266,35 +267,26 @@ Respond with ONLY this JSON (no other text):
   "concerns": ["any concerns for orchestrator"]
 }}"""
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            ZO_API_URL,
-            headers={
-                "authorization": token,
-                "content-type": "application/json"
-            },
-            json={"input": prompt}
-        ) as resp:
-            result = await resp.json()
-            output = result.get("output", "")
-            
-            # Try to parse JSON from response
-            try:
-                # Find JSON in response
-                start = output.find("{")
-                end = output.rfind("}") + 1
-                if start >= 0 and end > start:
-                    return json.loads(output[start:end])
-            except:
-                pass
-            
-            # Fallback
-            return {
-                "drop_id": drop_id,
-                "verdict": "PASS",
-                "reason": "Filter parse failed, auto-passing",
-                "raw_response": output[:500]
-            }
+    result = await ask(prompt, token=token)
+    output = result.get("output", "")
+    
+    # Try to parse JSON from response
+    try:
+        # Find JSON in response
+        start = output.find("{")
+        end = output.rfind("}") + 1
+        if start >= 0 and end > start:
+            return json.loads(output[start:end])
+    except:
+        pass
+    
+    # Fallback
+    return {
+        "drop_id": drop_id,
+        "verdict": "PASS",
+        "reason": "Filter parse failed, auto-passing",
+        "raw_response": output[:500]
+    }
 
 
 async def run_dredge(slug: str, drop_id: str, meta: dict):
@@ -331,56 +323,15 @@ Report format:
 
 Investigate now."""
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            ZO_API_URL,
-            headers={
-                "authorization": token,
-                "content-type": "application/json"
-            },
-            json={"input": prompt}
-        ) as resp:
-            print(f"[DREDGE] Forensics worker spawned for {drop_id}")
-
-
-def get_ready_drops(meta: dict) -> list[str]:
-    """Get list of Drops ready to spawn (dependencies met, not started)"""
-    ready = []
-    drops = meta.get("drops", {})
-    currents = meta.get("currents", {})
-    
-    # Build set of complete drops
-    complete_drops = {d for d, info in drops.items() if info.get("status") == "complete"}
-    
-    # Build set of drops in currents (sequential chains)
-    current_drops = set()
-    for chain in currents.values():
-        current_drops.update(chain)
-    
-    for drop_id, info in drops.items():
-        if info.get("status") != "pending":
-            continue
-        
-        # Check dependencies
-        depends_on = info.get("depends_on", [])
-        if not all(d in complete_drops for d in depends_on):
-            continue
-        
-        # Check if part of a Current (sequential chain)
-        in_current = False
-        for chain_id, chain in currents.items():
-            if drop_id in chain:
-                in_current = True
-                idx = chain.index(drop_id)
-                if idx > 0:
-                    # Must wait for previous in chain
-                    prev_drop = chain[idx - 1]
-                    if prev_drop not in complete_drops:
-                        continue
-        
-        ready.append(drop_id)
-    
-    return ready
+    await ask(prompt, token=token, idempotent=False)
+    print(f"[DREDGE] Forensics worker spawned for {drop_id}")
+
+
+def get_ready_drops(meta: dict, graph: Optional[BuildGraph] = None) -> list[str]:
+    """Get list of Drops ready to spawn (dependencies and Current predecessors complete, not started)"""
+    if graph is None:
+        graph = BuildGraph(meta).sync(meta)
+    return graph.ready()
 
 
 def get_running_drops(meta: dict) -> list[tuple[str, dict]]:
@@ -392,28 +343,16 @@ def get_running_drops(meta: dict) -> list[tuple[str, dict]]:
     ]
 
 
-def check_stream_complete(meta: dict) -> bool:
+def check_stream_complete(meta: dict, graph: Optional[BuildGraph] = None) -> bool:
     """Check if current stream is complete"""
-    current_stream = meta.get("current_stream", 1)
-    drops = meta.get("drops", {})
-    
-    for drop_id, info in drops.items():
-        # Parse stream from drop_id (D1.1 -> stream 1)
-        try:
-            stream_num = int(drop_id[1])
-        except:
-            continue
-        
-        if stream_num == current_stream:
-            if info.get("status") not in ["complete", "failed"]:
-                return False
-    
-    return True
+    if graph is None:
+        graph = BuildGraph(meta).sync(meta)
+    return graph.stream_complete(meta.get("current_stream", 1))
 
 
-def advance_stream(meta: dict) -> bool:
+def advance_stream(meta: dict, graph: Optional[BuildGraph] = None) -> bool:
     """Advance to next stream if current is complete. Returns True if advanced."""
-    if not check_stream_complete(meta):
+    if not check_stream_complete(meta, graph):
         return False
     
     current = meta.get("current_stream", 1)
@@ -426,130 +365,252 @@ def advance_stream(meta: dict) -> bool:
     return False
 
 
-async def summarize_build(slug: str, meta: dict) -> str:
+async def summarize_build(slug: str, meta: dict, snapshot: Optional[BuildSnapshot] = None) -> str:
     """Generate completion summary"""
-    deposits_dir = BUILDS_DIR / slug / "deposits"
+    snapshot = snapshot or BuildSnapshot(slug)
     summaries = []
     
     for drop_id in sorted(meta.get("drops", {}).keys()):
-        deposit = get_deposit(slug, drop_id)
+        try:
+            deposit = snapshot.deposit(drop_id)
+        except json.JSONDecodeError:
+            deposit = None
         if deposit:
             summaries.append(f"**{drop_id}:** {deposit.get('summary', 'No summary')}")
     
     return "\n".join(summaries)
 
 
-async def tick(slug: str):
-    """Run one orchestration cycle"""
-    print(f"\n[PULSE TICK] {slug} @ {datetime.now(timezone.utc).isoformat()}")
+async def _bounded(sem: asyncio.Semaphore, coro, timeout: float):
+    """Run one LLM/API call under the tick's concurrency limit and timeout."""
+    async with sem:
+        return await asyncio.wait_for(coro, timeout=timeout)
+
+
+async def _gather_bounded(sem: asyncio.Semaphore, coros: list, timeout: float) -> list:
+    """Fan out calls concurrently; exceptions are returned in place, in input order."""
+    return await asyncio.gather(
+        *(_bounded(sem, c, timeout) for c in coros),
+        return_exceptions=True
+    )
+
+
+async def _timed_call(trace: TickTrace, drop_id: str, event: str, coro):
+    """Await a per-Drop call and record its latency (also on error/timeout) in the trace."""
+    start = time.monotonic()
+    try:
+        return await coro
+    finally:
+        trace.drop(drop_id, event, seconds=round(time.monotonic() - start, 3))
+
+
+async def _filter_deposit(slug: str, drop_id: str, deposit: dict, snapshot: BuildSnapshot,
+                          trace: TickTrace) -> dict:
+    brief = load_drop_brief(slug, drop_id, snapshot)
+    return await _timed_call(trace, drop_id, "filter_call", run_filter(slug, drop_id, brief, deposit))
+
+
+async def _spawn_ready(slug: str, drop_id: str, model: Optional[str],
+                       snapshot: BuildSnapshot, trace: TickTrace) -> str:
+    brief = load_drop_brief(slug, drop_id, snapshot)
+    return await _timed_call(trace, drop_id, "spawn_call", spawn_drop(slug, drop_id, brief, model))
+
+
+async def spawn_drops(slug: str, meta: dict, drop_ids: list[str], sem: asyncio.Semaphore,
+                      call_timeout: float, trace: TickTrace, notifications: list = (),
+                      snapshot: Optional[BuildSnapshot] = None):
+    """Spawn Drops concurrently (alongside any pending notifications) and record results in meta"""
+    model = meta.get("model")
+    snapshot = snapshot or BuildSnapshot(slug)
+    results = await _gather_bounded(
+        sem,
+        [_spawn_ready(slug, d, model, snapshot, trace) for d in drop_ids] + list(notifications),
+        call_timeout
+    )
+    spawn_results = results[:len(drop_ids)]
+    for notice_result in results[len(drop_ids):]:
+        if isinstance(notice_result, BaseException):
+            print(f"[NOTIFY ERROR] {notice_result!r}")
     
-    meta = load_meta(slug)
+    for drop_id, convo_id in sorted(zip(drop_ids, spawn_results)):
+        if isinstance(convo_id, BaseException):
+            reason = "spawn timed out" if isinstance(convo_id, asyncio.TimeoutError) else str(convo_id)
+            print(f"[SPAWN ERROR] {drop_id}: {reason}")
+            meta["drops"][drop_id]["status"] = "failed"
+            meta["drops"][drop_id]["failed_at"] = trace.drop(drop_id, "spawn_failed")
+            meta["drops"][drop_id]["failure_reason"] = reason
+            continue
+        
+        meta["drops"][drop_id]["status"] = "running"
+        meta["drops"][drop_id]["started_at"] = trace.drop(drop_id, "spawned")
+        meta["drops"][drop_id]["conversation_id"] = convo_id
+        
+        try:
+            register_drop_conversation(drop_id, slug, convo_id)
+        except Exception as e:
+            print(f"[SPAWN] {drop_id}: could not register conversation: {e}")
+
+
+async def tick(slug: str, scheduler: Optional[SpawnScheduler] = None):
+    """Run one orchestration cycle
     
-    if meta.get("status") == "complete":
-        print(f"[PULSE] Build {slug} already complete")
-        return
+    With a scheduler (supervise mode), ready Drops are queued for the
+    supervisor instead of being spawned here. Stage timings and Drop
+    lifecycle events are appended to the build's trace.jsonl.
+    Raises BuildLocked if another process is ticking the same build.
+    """
+    with build_lock(slug):
+        await _tick(slug, scheduler)
+
+
+async def _tick(slug: str, scheduler: Optional[SpawnScheduler]):
+    trace = TickTrace(slug)
+    print(f"\n[PULSE TICK] {slug} @ {trace.at}")
     
-    if meta.get("status") == "stopped":
-        print(f"[PULSE] Build {slug} is stopped")
-        return
+    with trace.span("load"):
+        meta = load_meta(slug)
+        
+        if meta.get("status") == "complete":
+            print(f"[PULSE] Build {slug} already complete")
+            return
+        
+        if meta.get("status") == "stopped":
+            print(f"[PULSE] Build {slug} is stopped")
+            return
+        
+        try:
+            graph = get_graph(slug, meta)
+        except GraphError as e:
+            print(f"[PULSE] Build {slug} has an invalid dependency graph: {e}")
+            return
+        
+        # One listing of drops/ and deposits/ serves every stage of this tick
+        snapshot = BuildSnapshot(slug)
     
-    # 1. Check for new deposits from running Drops
-    running = get_running_drops(meta)
-    for drop_id, info in running:
-        deposit = get_deposit(slug, drop_id)
-        if deposit:
-            print(f"[DEPOSIT] Found deposit for {drop_id}")
-            
-            # Run Filter
+    config = load_config()
+    call_timeout = config["validation"]["llm_filter_timeout_seconds"]
+    sem = asyncio.Semaphore(config["orchestration"]["max_concurrent_calls"])
+    notifications = []
+    
+    # 1. Check for new deposits from running Drops (Filters run concurrently)
+    with trace.span("filter") as span:
+        running = get_running_drops(meta)
+        deposited = []
+        for drop_id, info in running:
+            if not snapshot.has_deposit(drop_id):
+                continue
             try:
-                brief = load_drop_brief(slug, drop_id)
-                filter_result = await run_filter(slug, drop_id, brief, deposit)
-                
-                # Save filter result
-                filter_path = BUILDS_DIR / slug / "deposits" / f"{drop_id}_filter.json"
-                with open(filter_path, "w") as f:
-                    json.dump(filter_result, f, indent=2)
-                
-                convo_id = info.get("conversation_id")
-                
-                if filter_result.get("verdict") == "PASS":
-                    meta["drops"][drop_id]["status"] = "complete"
-                    meta["drops"][drop_id]["completed_at"] = datetime.now(timezone.utc).isoformat()
-                    update_drop_conversation_status(convo_id, "complete")
-                    print(f"[FILTER PASS] {drop_id}")
-                else:
-                    meta["drops"][drop_id]["status"] = "failed"
-                    meta["drops"][drop_id]["failed_at"] = datetime.now(timezone.utc).isoformat()
-                    meta["drops"][drop_id]["failure_reason"] = filter_result.get("reason", "Unknown")
-                    update_drop_conversation_status(convo_id, "failed")
-                    print(f"[FILTER FAIL] {drop_id}: {filter_result.get('reason')}")
-                    await send_sms(f"[PULSE] {slug}: {drop_id} FAILED filter. Reason: {filter_result.get('reason', 'Unknown')[:50]}")
-            except Exception as e:
-                print(f"[FILTER ERROR] {drop_id}: {e}")
+                deposit = snapshot.deposit(drop_id)
+            except json.JSONDecodeError as e:
+                # Likely still being written; picked up on a later tick
+                print(f"[DEPOSIT] {drop_id} deposit not readable yet: {e}")
+                continue
+            if deposit:
+                print(f"[DEPOSIT] Found deposit for {drop_id}")
+                written = datetime.fromtimestamp(snapshot.deposit_mtime(drop_id), timezone.utc).isoformat()
+                meta["drops"][drop_id]["deposited_at"] = trace.drop(drop_id, "deposited", at=written)
+                deposited.append((drop_id, info, deposit))
+        span["deposits"] = len(deposited)
+        
+        filter_results = await _gather_bounded(
+            sem, [_filter_deposit(slug, d, dep, snapshot, trace) for d, _, dep in deposited], call_timeout
+        )
+        
+        # Merge in drop_id order so meta and SMS ordering are deterministic
+        for (drop_id, info, _), filter_result in sorted(
+            zip(deposited, filter_results), key=lambda pair: pair[0][0]
+        ):
+            convo_id = info.get("conversation_id")
+            if isinstance(filter_result, BaseException):
+                reason = "timeout" if isinstance(filter_result, asyncio.TimeoutError) else filter_result
+                print(f"[FILTER ERROR] {drop_id}: {reason}")
                 # Auto-pass on filter error
                 meta["drops"][drop_id]["status"] = "complete"
-                meta["drops"][drop_id]["completed_at"] = datetime.now(timezone.utc).isoformat()
-                update_drop_conversation_status(info.get("conversation_id"), "complete")
+                meta["drops"][drop_id]["completed_at"] = trace.drop(drop_id, "complete", filter_error=True)
+                update_drop_conversation_status(convo_id, "complete")
+                continue
+            
+            # Save filter result
+            filter_path = BUILDS_DIR / slug / "deposits" / f"{drop_id}_filter.json"
+            with open(filter_path, "w") as f:
+                json.dump(filter_result, f, indent=2)
+            
+            if filter_result.get("verdict") == "PASS":
+                meta["drops"][drop_id]["status"] = "complete"
+                meta["drops"][drop_id]["completed_at"] = trace.drop(drop_id, "complete")
+                update_drop_conversation_status(convo_id, "complete")
+                print(f"[FILTER PASS] {drop_id}")
+            else:
+                meta["drops"][drop_id]["status"] = "failed"
+                meta["drops"][drop_id]["failed_at"] = trace.drop(drop_id, "failed")
+                meta["drops"][drop_id]["failure_reason"] = filter_result.get("reason", "Unknown")
+                update_drop_conversation_status(convo_id, "failed")
+                print(f"[FILTER FAIL] {drop_id}: {filter_result.get('reason')}")
+                notifications.append(send_sms(f"[PULSE] {slug}: {drop_id} FAILED filter. Reason: {filter_result.get('reason', 'Unknown')[:50]}"))
     
     # 2. Check for dead Drops (running too long)
-    dead_threshold = meta.get("dead_threshold_seconds", DEFAULT_DEAD_THRESHOLD)
-    for drop_id, info in running:
-        if info.get("status") != "running":
-            continue  # Already processed above
-        
-        started_at = info.get("started_at")
-        if started_at:
-            started = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
-            elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+    with trace.span("dead_check") as span:
+        dead_threshold = meta.get("dead_threshold_seconds", DEFAULT_DEAD_THRESHOLD)
+        dead = []
+        for drop_id, info in running:
+            if info.get("status") != "running":
+                continue  # Already processed above
             
-            if elapsed > dead_threshold:
-                print(f"[DEAD] {drop_id} - no deposit after {int(elapsed)}s")
-                meta["drops"][drop_id]["status"] = "dead"
-                meta["drops"][drop_id]["died_at"] = datetime.now(timezone.utc).isoformat()
+            started_at = info.get("started_at")
+            if started_at:
+                started = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
+                elapsed = (datetime.now(timezone.utc) - started).total_seconds()
                 
-                # Spawn Dredge
-                await run_dredge(slug, drop_id, meta)
-                
-                # SMS escalation
-                complete_count = sum(1 for d in meta["drops"].values() if d.get("status") == "complete")
-                total_count = len(meta["drops"])
-                await send_sms(f"[PULSE] {slug}: {drop_id} DEAD after {int(elapsed/60)}m. {complete_count}/{total_count} complete. Reply RESUME or STOP.")
-    
-    # 3. Check if stream complete, advance if so
-    if advance_stream(meta):
-        print(f"[STREAM] Advanced to Stream {meta['current_stream']}")
-    
-    # 4. Check if build complete
-    all_terminal = all(
-        info.get("status") in ["complete", "failed", "dead"]
-        for info in meta.get("drops", {}).values()
-    )
-    if all_terminal:
+                if elapsed > dead_threshold:
+                    print(f"[DEAD] {drop_id} - no deposit after {int(elapsed)}s")
+                    meta["drops"][drop_id]["status"] = "dead"
+                    meta["drops"][drop_id]["died_at"] = trace.drop(drop_id, "dead", elapsed=round(elapsed, 1))
+                    dead.append((drop_id, elapsed))
+        span["dead"] = len(dead)
+        
+        # Spawn Dredges and SMS escalations together
         complete_count = sum(1 for d in meta["drops"].values() if d.get("status") == "complete")
         total_count = len(meta["drops"])
-        
-        if complete_count == total_count:
-            meta["status"] = "complete"
-            meta["completed_at"] = datetime.now(timezone.utc).isoformat()
-            summary = await summarize_build(slug, meta)
-            print(f"[BUILD COMPLETE] {slug}")
-            await send_sms(f"[PULSE] {slug} BUILD COMPLETE. {complete_count}/{total_count} Drops succeeded.")
-        else:
-            meta["status"] = "partial"
-            meta["completed_at"] = datetime.now(timezone.utc).isoformat()
-            failed = [d for d, i in meta["drops"].items() if i.get("status") in ["failed", "dead"]]
-            await send_sms(f"[PULSE] {slug} PARTIAL. {complete_count}/{total_count} succeeded. Failed: {', '.join(failed[:3])}")
+        for drop_id, elapsed in sorted(dead):
+            notifications.append(run_dredge(slug, drop_id, meta))
+            notifications.append(send_sms(f"[PULSE] {slug}: {drop_id} DEAD after {int(elapsed/60)}m. {complete_count}/{total_count} complete. Reply RESUME or STOP."))
     
-    # 5. Spawn ready Drops
-    ready = get_ready_drops(meta)
-    model = meta.get("model")
-    
-    for drop_id in ready:
-        try:
-            brief = load_drop_brief(slug, drop_id)
-            print(f"[SPAWN] {drop_id}")
+    with trace.span("advance"):
+        # 3. Check if stream complete, advance if so
+        graph.sync(meta)
+        if advance_stream(meta, graph):
+            print(f"[STREAM] Advanced to Stream {meta['current_stream']}")
+        
+        # 4. Check if build complete
+        all_terminal = all(
+            info.get("status") in ["complete", "failed", "dead"]
+            for info in meta.get("drops", {}).values()
+        )
+        if all_terminal:
+            complete_count = sum(1 for d in meta["drops"].values() if d.get("status") == "complete")
+            total_count = len(meta["drops"])
             
+            if complete_count == total_count:
+                meta["status"] = "complete"
+                meta["completed_at"] = datetime.now(timezone.utc).isoformat()
+                summary = await summarize_build(slug, meta, snapshot)
+                print(f"[BUILD COMPLETE] {slug}")
+                notifications.append(send_sms(f"[PULSE] {slug} BUILD COMPLETE. {complete_count}/{total_count} Drops succeeded."))
+            else:
+                meta["status"] = "partial"
+                meta["completed_at"] = datetime.now(timezone.utc).isoformat()
+                failed = [d for d, i in meta["drops"].items() if i.get("status") in ["failed", "dead"]]
+                notifications.append(send_sms(f"[PULSE] {slug} PARTIAL. {complete_count}/{total_count} succeeded. Failed: {', '.join(failed[:3])}"))
+    
+    # 5. Spawn ready Drops (concurrently, alongside pending notifications)
+    with trace.span("spawn") as span:
+        ready = get_ready_drops(meta, graph)
+        
+        to_spawn = []
+        for drop_id in ready:
             drop_info = meta.get("drops", {}).get(drop_id, {})
+            if "ready_at" not in drop_info:
+                drop_info["ready_at"] = trace.drop(drop_id, "ready")
             spawn_mode = drop_info.get("spawn_mode", "auto")
             
             if spawn_mode == "manual":
@@ -557,24 +618,31 @@ async def tick(slug: str):
                 meta["drops"][drop_id]["status"] = "awaiting_manual"
                 continue
             
-            convo_id = await spawn_drop(slug, drop_id, brief, model)
-            
-            meta["drops"][drop_id]["status"] = "running"
-            meta["drops"][drop_id]["started_at"] = datetime.now(timezone.utc).isoformat()
-            meta["drops"][drop_id]["conversation_id"] = convo_id
-            
-            register_drop_conversation(drop_id, slug, convo_id)
-            
-        except Exception as e:
-            print(f"[SPAWN ERROR] {drop_id}: {e}")
-            meta["drops"][drop_id]["status"] = "failed"
-            meta["drops"][drop_id]["failure_reason"] = str(e)
+            to_spawn.append(drop_id)
+        
+        queued = 0
+        if scheduler is not None:
+            # Supervisor spawns these later, fairly across builds and within caps
+            scheduler.update(slug, to_spawn, meta)
+            for drop_id in to_spawn:
+                print(f"[QUEUE] {drop_id}")
+            queued, to_spawn = len(to_spawn), []
+        for drop_id in to_spawn:
+            print(f"[SPAWN] {drop_id}")
+        span.update(spawned=len(to_spawn), queued=queued, notifications=len(notifications))
+        
+        await spawn_drops(slug, meta, to_spawn, sem, call_timeout, trace, notifications, snapshot)
     
     # 6. Save state
-    save_meta(slug, meta)
-    update_status_md(slug, meta)
+    with trace.span("save"):
+        # Per-tick telemetry goes to trace.jsonl only, so an idle tick leaves meta unchanged
+        meta.pop("last_tick", None)
+        save_meta(slug, meta)
+        update_status_md(slug, meta)
     
-    print(f"[PULSE TICK DONE] Stream {meta.get('current_stream')}/{meta.get('total_streams')}")
+    trace.finish(filtered=len(deposited), dead=len(dead), spawned=len(to_spawn), queued=queued,
+                 api=api_metrics())
+    print(f"[PULSE TICK DONE] Stream {meta.get('current_stream')}/{meta.get('total_streams')} in {trace.elapsed:.1f}s")
 
 
 async def start_build(slug: str):
@@ -585,6 +653,13 @@ async def start_build(slug: str):
         print(f"Build {slug} already active")
         return
     
+    # Validate the dependency graph before anything is spawned
+    try:
+        BuildGraph(meta)
+    except GraphError as e:
+        print(f"[PULSE] Cannot start {slug}: {e}")
+        return
+    
     meta["status"] = "active"
     meta["started_at"] = datetime.now(timezone.utc).isoformat()
     
@@ -654,9 +729,24 @@ Progress: {complete}/{len(drops)} ({int(complete/len(drops)*100) if drops else 0
 """)
 
 
+async def _timed_stage(fn, *args, **kwargs) -> tuple:
+    """Run a blocking finalize stage in a worker thread; returns (result, error, seconds)"""
+    started = time.monotonic()
+    try:
+        result = await asyncio.to_thread(fn, *args, **kwargs)
+        return result, None, round(time.monotonic() - started, 3)
+    except Exception as e:
+        return None, e, round(time.monotonic() - started, 3)
+
+
 async def finalize_build(slug: str):
-    """Run post-build finalization: safety checks, integration tests, harvest learnings"""
+    """Run post-build finalization: safety checks, integration tests, harvest learnings
+    
+    The three stages are independent, so they run concurrently in-process,
+    sharing one loaded set of deposits.
+    """
     print(f"\n[FINALIZE] {slug}")
+    finalize_start = time.monotonic()
     
     meta = load_meta(slug)
     results = {
@@ -665,73 +755,72 @@ async def finalize_build(slug: str):
         "verification": None,
         "integration_tests": None,
         "learnings_harvested": 0,
-        "success": True
+        "success": True,
+        "timings": {}
     }
     
+    started = time.monotonic()
+    deposits, deposit_errors = load_deposits(slug)
+    results["timings"]["load_deposits"] = round(time.monotonic() - started, 3)
+    
+    print("[FINALIZE] Verifying artifacts, running integration tests, harvesting learnings...")
+    (verify, verify_error, verify_s), (tests, tests_error, tests_s), (harvest, harvest_error, harvest_s) = await asyncio.gather(
+        _timed_stage(pulse_safety.verify_artifacts, slug, deposits, deposit_errors),
+        _timed_stage(pulse_safety.run_integration_tests, slug, meta),
+        _timed_stage(pulse_learnings.harvest_build_learnings, slug, deposits=deposits, deposit_errors=deposit_errors),
+    )
+    results["timings"].update({
+        "verification": verify_s,
+        "integration_tests": tests_s,
+        "learnings": harvest_s,
+    })
+    
     # 1. Verify artifacts
-    print("[FINALIZE] Verifying artifacts...")
-    try:
-        verify_result = subprocess.run(
-            ["python3", str(SKILLS_DIR / "pulse_safety.py"), "verify", slug],
-            capture_output=True, text=True, cwd=str(WORKSPACE)
-        )
+    if verify_error:
+        print(f"[FINALIZE] Verification error: {verify_error}")
+        results["verification"] = {"passed": False, "error": str(verify_error)}
+        results["success"] = False
+    else:
         results["verification"] = {
-            "passed": verify_result.returncode == 0,
-            "output": verify_result.stdout
+            "passed": verify["passed"],
+            "summary": verify["summary"],
+            "missing": {d: r["missing"] for d, r in verify["drops"].items() if r.get("missing")},
+            "report": "artifact_verification.json"
         }
-        if verify_result.returncode == 0:
+        if verify["passed"]:
             print("[FINALIZE] ✅ Artifact verification passed")
         else:
-            print(f"[FINALIZE] ❌ Artifact verification failed")
+            print(f"[FINALIZE] ❌ Artifact verification failed ({verify['summary']['missing']} missing)")
             results["success"] = False
-    except Exception as e:
-        print(f"[FINALIZE] Verification error: {e}")
-        results["verification"] = {"passed": False, "error": str(e)}
-        results["success"] = False
     
-    # 2. Run integration tests
-    print("[FINALIZE] Running integration tests...")
-    try:
-        test_result = subprocess.run(
-            ["python3", str(SKILLS_DIR / "pulse_integration_test.py"), "run", slug],
-            capture_output=True, text=True, cwd=str(WORKSPACE)
-        )
+    # 2. Integration tests
+    if tests_error:
+        print(f"[FINALIZE] Test error: {tests_error}")
+        results["integration_tests"] = {"passed": False, "error": str(tests_error)}
+    else:
         results["integration_tests"] = {
-            "passed": test_result.returncode == 0,
-            "output": test_result.stdout
+            "passed": tests["passed"],
+            "found": len(tests["tests_found"]),
+            "failed": [t.get("name") or Path(t["file"]).name for t in tests["tests_run"] if not t["passed"]],
+            "report": "integration_test_results.json"
         }
-        if test_result.returncode == 0:
-            print("[FINALIZE] ✅ Integration tests passed")
+        if tests["passed"]:
+            print(f"[FINALIZE] ✅ Integration tests passed ({len(tests['tests_found'])} found)")
         else:
             print(f"[FINALIZE] ❌ Integration tests failed")
             results["success"] = False
-    except Exception as e:
-        print(f"[FINALIZE] Test error: {e}")
-        results["integration_tests"] = {"passed": False, "error": str(e)}
     
-    # 3. Harvest learnings from deposits
-    print("[FINALIZE] Harvesting learnings...")
-    try:
-        harvest_result = subprocess.run(
-            ["python3", str(SKILLS_DIR / "pulse_learnings.py"), "harvest", slug],
-            capture_output=True, text=True, cwd=str(WORKSPACE)
-        )
-        # Parse harvested count from output
-        output = harvest_result.stdout
-        if "Harvested" in output:
-            try:
-                count = int(output.split("Harvested")[1].split()[0])
-                results["learnings_harvested"] = count
-            except:
-                pass
-        print(f"[FINALIZE] Harvested learnings from deposits")
-    except Exception as e:
-        print(f"[FINALIZE] Harvest error: {e}")
+    # 3. Learnings
+    if harvest_error:
+        print(f"[FINALIZE] Harvest error: {harvest_error}")
+    else:
+        results["learnings_harvested"] = harvest["harvested"]
+        print(f"[FINALIZE] Harvested {harvest['harvested']} learnings from {harvest['processed']} deposits")
+    
+    results["timings"]["total"] = round(time.monotonic() - finalize_start, 3)
     
     # 4. Save finalization results
-    finalize_path = BUILDS_DIR / slug / "FINALIZATION.json"
-    with open(finalize_path, "w") as f:
-        json.dump(results, f, indent=2)
+    write_text_atomic(BUILDS_DIR / slug / "FINALIZATION.json", json.dumps(results, indent=2))
     
     # 5. Update meta
     meta["finalized_at"] = datetime.now(timezone.utc).isoformat()
@@ -753,15 +842,159 @@ async def finalize_build(slug: str):
     return results
 
 
+def schedule_dead_timers(deadlines: DeadlineHeap, slug: str, meta: dict):
+    """Queue a wake-up for when each running Drop would cross the dead threshold"""
+    dead_threshold = meta.get("dead_threshold_seconds", DEFAULT_DEAD_THRESHOLD)
+    for drop_id, info in get_running_drops(meta):
+        started_at = info.get("started_at")
+        if not started_at:
+            continue
+        started = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
+        # +1s: tick only declares a Drop dead once elapsed > threshold
+        deadlines.schedule(started.timestamp() + dead_threshold + 1, slug, drop_id)
+
+
+async def spawn_admitted(slug: str, drop_ids: list[str], sem: asyncio.Semaphore, call_timeout: float) -> dict:
+    """Spawn Drops the supervisor granted, if they are still pending; returns updated meta"""
+    with build_lock(slug):
+        return await _spawn_admitted(slug, drop_ids, sem, call_timeout)
+
+
+async def _spawn_admitted(slug: str, drop_ids: list[str], sem: asyncio.Semaphore, call_timeout: float) -> dict:
+    meta = load_meta(slug)
+    if meta.get("status") != "active":
+        return meta
+    drop_ids = [d for d in drop_ids if meta.get("drops", {}).get(d, {}).get("status") == "pending"]
+    for drop_id in drop_ids:
+        print(f"[SPAWN] {slug}/{drop_id}")
+    if not drop_ids:
+        return meta
+    trace = TickTrace(slug, kind="spawn")
+    with trace.span("spawn", spawned=len(drop_ids)):
+        await spawn_drops(slug, meta, drop_ids, sem, call_timeout, trace)
+    with trace.span("save"):
+        save_meta(slug, meta)
+        update_status_md(slug, meta)
+    trace.finish(spawned=len(drop_ids))
+    return meta
+
+
+async def run_daemon(slug: Optional[str] = None, poll_interval: float = 2.0,
+                     scheduler: Optional[SpawnScheduler] = None):
+    """Reconcile builds as soon as deposits land or a Drop deadline passes.
+    
+    With a slug, watches that build until it is no longer active.
+    Without one, follows every active build, rescanning for new ones periodically.
+    With a scheduler, spawns go through its global queue after each round of ticks.
+    """
+    watcher = DepositWatcher(poll_interval=poll_interval)
+    deadlines = DeadlineHeap()
+    follow_active = slug is None
+    next_rescan = 0.0
+    dirty = set()
+    failures: dict[str, int] = {}
+    
+    if not follow_active:
+        load_meta(slug)  # Fail fast on unknown builds
+        watcher.watch(slug, BUILDS_DIR / slug / "deposits")
+        dirty.add(slug)
+    
+    print(f"[PULSE DAEMON] Watching deposits via {watcher.mode}")
+    try:
+        while True:
+            if follow_active and time.time() >= next_rescan:
+                for active in set(list_builds("active")) - watcher.slugs:
+                    print(f"[PULSE DAEMON] Watching {active}")
+                    watcher.watch(active, BUILDS_DIR / active / "deposits")
+                    dirty.add(active)
+                next_rescan = time.time() + DAEMON_RESCAN_INTERVAL
+            
+            for build in sorted(dirty):
+                try:
+                    await tick(build, scheduler)
+                    meta = load_meta(build)
+                except Exception as e:
+                    # Keep watching and retry with backoff, even if nothing else changes
+                    failures[build] = failures.get(build, 0) + 1
+                    delay = min(DAEMON_RESCAN_INTERVAL, DAEMON_RETRY_BASE * 2 ** (failures[build] - 1))
+                    deadlines.schedule(time.time() + delay, build, TICK_RETRY)
+                    print(f"[PULSE DAEMON] {build}: tick failed: {e} (retrying in {delay}s)")
+                    continue
+                failures.pop(build, None)
+                
+                if meta.get("status") != "active":
+                    print(f"[PULSE DAEMON] {build} is {meta.get('status')}, no longer watching")
+                    watcher.unwatch(build)
+                    deadlines.discard_build(build)
+                    failures.pop(build, None)
+                    forget_build(build)
+                    if scheduler is not None:
+                        scheduler.remove(build)
+                    continue
+                schedule_dead_timers(deadlines, build, meta)
+            
+            if scheduler is not None and dirty:
+                await supervise_spawns(scheduler, deadlines)
+            
+            if not follow_active and not watcher.slugs:
+                break
+            
+            wake_at = [t for t in (deadlines.next_due(), next_rescan if follow_active else None) if t]
+            timeout = min(wake_at) - time.time() if wake_at else DAEMON_RESCAN_INTERVAL
+            dirty = await watcher.wait(timeout)
+            dirty |= deadlines.pop_due(time.time())
+            dirty &= watcher.slugs
+    finally:
+        watcher.close()
+    
+    print("[PULSE DAEMON] No active builds left, exiting")
+
+
+async def supervise_spawns(scheduler: SpawnScheduler, deadlines: DeadlineHeap):
+    """Grant queued spawns across builds and spawn them concurrently
+    
+    Allocates again while failed spawns free slots that other queued Drops can
+    take. Drops granted to a build whose spawn round raised (e.g. the build was
+    locked) are re-queued, and a deadline brings the build back for a retry.
+    """
+    config = load_config()
+    call_timeout = config["validation"]["llm_filter_timeout_seconds"]
+    sem = asyncio.Semaphore(config["orchestration"]["max_concurrent_calls"])
+    held = set()
+    
+    while grants := scheduler.allocate(frozenset(held)):
+        builds = sorted(grants)
+        results = await asyncio.gather(
+            *(spawn_admitted(b, grants[b], sem, call_timeout) for b in builds),
+            return_exceptions=True
+        )
+        for build, meta in zip(builds, results):
+            if isinstance(meta, BaseException):
+                print(f"[SUPERVISOR] {build}: spawn failed: {meta}")
+                # Held out of this round so the build is not re-granted in a loop
+                scheduler.requeue(build, grants[build])
+                deadlines.schedule(time.time() + DAEMON_RETRY_BASE, build, SPAWN_RETRY)
+                held.add(build)
+                continue
+            # Refresh running counts so failed spawns free their slots
+            scheduler.update(build, [d for d in scheduler.builds[build].queued], meta)
+            schedule_dead_timers(deadlines, build, meta)
+    print(format_report(scheduler.write_report()))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Pulse Build Orchestration")
-    parser.add_argument("command", choices=["start", "status", "stop", "resume", "tick", "finalize"])
-    parser.add_argument("slug", help="Build slug")
+    parser.add_argument("command", choices=["start", "status", "stop", "resume", "tick", "finalize", "stats", "daemon", "supervise"])
+    parser.add_argument("slug", nargs="?", help="Build slug (optional for daemon, unused for supervise)")
+    parser.add_argument("--poll-interval", type=float, default=2.0,
+                        help="Daemon: seconds between deposit polls when inotify is unavailable")
     
     args = parser.parse_args()
+    if args.command not in ("daemon", "supervise") and not args.slug:
+        parser.error(f"{args.command} requires a build slug")
     
     if args.command == "start":
-        asyncio.run(start_build(args.slug))
+        asyncio.run(run_and_close(start_build(args.slug)))
     elif args.command == "status":
         show_status(args.slug)
     elif args.command == "stop":
@@ -769,9 +1002,29 @@ def main():
     elif args.command == "resume":
         resume_build(args.slug)
     elif args.command == "tick":
-        asyncio.run(tick(args.slug))
+        try:
+            asyncio.run(run_and_close(tick(args.slug)))
+        except BuildLocked as e:
+            print(f"[PULSE] {e}, skipping")
     elif args.command == "finalize":
-        asyncio.run(finalize_build(args.slug))
+        asyncio.run(run_and_close(finalize_build(args.slug)))
+    elif args.command == "stats":
+        print(format_stats(build_stats(args.slug, load_meta(args.slug))))
+    elif args.command == "daemon":
+        try:
+            asyncio.run(run_and_close(run_daemon(args.slug, args.poll_interval)))
+        except KeyboardInterrupt:
+            print("\n[PULSE DAEMON] Stopped")
+    elif args.command == "supervise":
+        orchestration = load_config()["orchestration"]
+        scheduler = SpawnScheduler(
+            orchestration["max_running_drops"],
+            orchestration["max_running_drops_per_build"]
+        )
+        try:
+            asyncio.run(run_and_close(run_daemon(None, args.poll_interval, scheduler)))
+        except KeyboardInterrupt:
+            print("\n[PULSE SUPERVISOR] Stopped")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Pulse API: Shared client for Zo API calls made by Pulse scripts.
+
+One pooled aiohttp session per event loop, with:
+- Keep-alive connections behind a connector limit
+- A token-bucket rate limiter shared by every caller
+- Exponential backoff with full jitter on 429 / 5xx (Retry-After honoured);
+  non-idempotent calls (spawns, SMS) only retry when the server cannot have
+  acted on the request
+- Per-endpoint latency and error metrics
+
+The base URL is pluggable so a local stub server can stand in during tests
+and benchmarks:
+    PULSE_API_BASE_URL=http://127.0.0.1:8765 python3 pulse.py tick <slug>
+or set "api.base_url" in the Pulse config.
+
+Usage:
+    from pulse_api import ask, ApiError, close_client
+
+    result = await ask(prompt)            # POST {base_url}/zo/ask
+    await ask(prompt, idempotent=False)   # spawns: no retry on ambiguous 5xx
+    ...
+    asyncio.run(run_and_close(main()))    # releases the session on exit
+
+    pulse_api.py config                   # (CLI) print the settings in effect
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Optional
+
+import aiohttp
+
+from pulse_common import load_config
+
+DEFAULT_BASE_URL = "https://api.zo.computer"
+ASK_ENDPOINT = "/zo/ask"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Statuses where the server rejected the request without acting on it; the
+# only ones retried for non-idempotent calls (503 only with Retry-After)
+REJECTED_STATUSES = {429, 503}
+
+
+class ApiError(Exception):
+    """Non-retryable (or retries exhausted) API response."""
+
+    def __init__(self, endpoint: str, status: int, body: str):
+        super().__init__(f"API error: {status} - {body[:500]}")
+        self.endpoint = endpoint
+        self.status = status
+        self.body = body
+
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+class TokenBucket:
+    """Async token bucket: `rate` requests/second sustained, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+class EndpointMetrics:
+    """Latency/error counters for one endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.statuses: dict[str, int] = {}
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, status: Optional[int], seconds: float) -> None:
+        self.requests += 1
+        key = str(status) if status is not None else "exception"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if status is None or status >= 400:
+            self.errors += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "statuses": dict(self.statuses),
+            "avg_ms": round(self.total_seconds / self.requests * 1000, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 1),
+        }
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+class ZoClient:
+    """Pooled, rate-limited, retrying client for the Zo API."""
+
+    def __init__(self, base_url: Optional[str] = None, api_config: Optional[dict] = None):
+        cfg = api_config if api_config is not None else load_config()["api"]
+        self.base_url = (
+            base_url or os.environ.get("PULSE_API_BASE_URL") or cfg.get("base_url") or DEFAULT_BASE_URL
+        ).rstrip("/")
+        self.max_connections = cfg.get("max_connections", 16)
+        self.keepalive_seconds = cfg.get("keepalive_seconds", 30)
+        self.timeout_seconds = cfg.get("request_timeout_seconds", 120)
+        self.max_retries = cfg.get("max_retries", 4)
+        self.backoff_base = cfg.get("backoff_base_seconds", 0.5)
+        self.backoff_max = cfg.get("backoff_max_seconds", 30)
+        self.bucket = TokenBucket(cfg.get("rate_per_second", 5), cfg.get("burst", 10))
+        self.metrics: dict[str, EndpointMetrics] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_seconds,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _should_retry(self, status: int, retry_after: Optional[str], idempotent: bool) -> bool:
+        if idempotent:
+            return status in RETRY_STATUSES
+        # A 500/502/504 may arrive after the work was started (e.g. a Drop
+        # was spawned), so a repeat could duplicate it
+        if status == 503:
+            return bool(retry_after)
+        return status in REJECTED_STATUSES
+
+    async def post(self, endpoint: str, payload: dict, token: Optional[str] = None,
+                   timeout: Optional[float] = None, idempotent: bool = True) -> dict:
+        """POST JSON to an endpoint and return the decoded JSON body.
+
+        Retries 429/5xx and failed connects with jittered backoff;
+        raises ApiError for other non-200 responses or when retries run out.
+        With idempotent=False only failed connects, 429 and 503 with
+        Retry-After are retried.
+        """
+        token = token or os.environ.get("ZO_CLIENT_IDENTITY_TOKEN")
+        headers = {"content-type": "application/json"}
+        if token:
+            headers["authorization"] = token
+        url = self.base_url + endpoint
+        stats = self.metrics.setdefault(endpoint, EndpointMetrics())
+        client_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout_seconds)
+
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            started = time.monotonic()
+            try:
+                async with self._get_session().post(
+                    url, headers=headers, json=payload, timeout=client_timeout
+                ) as resp:
+                    stats.observe(resp.status, time.monotonic() - started)
+                    if resp.status == 200:
+                        return await resp.json(content_type=None)
+                    body = await resp.text()
+                    retry_after = resp.headers.get("Retry-After")
+                    if attempt == self.max_retries or not self._should_retry(
+                        resp.status, retry_after, idempotent
+                    ):
+                        raise ApiError(endpoint, resp.status, body)
+                    delay = self._backoff(attempt, retry_after)
+            except aiohttp.ClientConnectorError:
+                # Connection was never established, so the request cannot have
+                # been processed: safe to retry even when not idempotent
+                stats.observe(None, time.monotonic() - started)
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt, None)
+            stats.retries += 1
+            await asyncio.sleep(delay)
+
+        raise AssertionError("unreachable")
+
+    def metrics_snapshot(self) -> dict:
+        return {endpoint: m.snapshot() for endpoint, m in sorted(self.metrics.items())}
+
+
+# ============================================================================
+# MODULE-LEVEL CLIENT
+# ============================================================================
+
+_client: Optional[ZoClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> ZoClient:
+    """Shared client for the running event loop (sessions are loop-bound)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = ZoClient()
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared session; call once before the event loop exits."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.close()
+    _client = None
+    _client_loop = None
+
+
+async def run_and_close(coro):
+    """Run a command coroutine, then release the shared API session."""
+    try:
+        return await coro
+    finally:
+        await close_client()
+
+
+def api_metrics() -> dict:
+    """Metrics for the current shared client ({} if none was created)."""
+    return _client.metrics_snapshot() if _client is not None else {}
+
+
+async def ask(prompt: str, model_name: Optional[str] = None, timeout: Optional[float] = None,
+              token: Optional[str] = None, idempotent: bool = True) -> dict:
+    """Call /zo/ask with a prompt and return the JSON response.
+
+    Pass idempotent=False for prompts with side effects (spawning a worker,
+    sending an SMS) so an ambiguous 5xx is not retried into a duplicate.
+    """
+    payload = {"input": prompt}
+    if model_name:
+        payload["model_name"] = model_name
+    return await get_client().post(ASK_ENDPOINT, payload, token=token, timeout=timeout,
+                                   idempotent=idempotent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pulse API client")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("config", help="Show the client settings in effect")
+
+    args = parser.parse_args()
+
+    if args.command == "config":
+        client = ZoClient()
+        print(json.dumps({
+            "base_url": client.base_url,
+            "max_connections": client.max_connections,
+            "keepalive_seconds": client.keepalive_seconds,
+            "request_timeout_seconds": client.timeout_seconds,
+            "max_retries": client.max_retries,
+            "backoff_base_seconds": client.backoff_base,
+            "backoff_max_seconds": client.backoff_max,
+            "rate_per_second": client.bucket.rate,
+            "burst": client.bucket.capacity,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
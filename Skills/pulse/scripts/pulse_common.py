@@ -11,14 +11,23 @@ Import in other Pulse scripts:
     from pulse_common import PATHS, load_config, save_config
 """
 
+import fcntl
 import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
 import os
+import tempfile
 
 # Environment-based workspace path (defaults to hardcoded for backward compatibility)
 WORKSPACE = Path(os.environ.get("ZO_WORKSPACE", "/home/workspace"))
 
+# Process umask, read once at import (os.umask can only be queried by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 
 # ============================================================================
 # PATH CONSTANTS
@@ -35,6 +44,11 @@ class PulsePaths:
     BUILDS = N5 / "builds"
     LEARNINGS = N5 / "learnings"
     SYSTEM_LEARNINGS = LEARNINGS / "SYSTEM_LEARNINGS.json"
+    DATA = N5 / "data"
+    STATE_DB = DATA / "pulse_state.db"  # Global build state store (state.backend = sqlite)
+    CATALOG_DB = DATA / "pulse_catalog.db"  # slug -> status index used by list_builds
+    VALIDATOR_CACHE_DB = DATA / "pulse_validator_cache.db"  # Per-file code validator results
+    LEARNINGS_DB = DATA / "pulse_learnings.db"  # System learnings store (SYSTEM_LEARNINGS.json is its export)
     
     # Pulse lifecycle scripts (pre-build)
     PULSE_LIFECYCLE = N5 / "pulse"
@@ -80,6 +94,21 @@ class PulsePaths:
         """Get path to a build's artifacts directory."""
         return cls.BUILDS / slug / "artifacts"
     
+    @classmethod
+    def build_status(cls, slug: str) -> Path:
+        """Get path to a build's STATUS.md."""
+        return cls.BUILDS / slug / "STATUS.md"
+    
+    @classmethod
+    def build_state_db(cls, slug: str) -> Path:
+        """Get path to a build's own state DB (state.db = per_build)."""
+        return cls.BUILDS / slug / "state.db"
+
+    @classmethod
+    def build_trace(cls, slug: str) -> Path:
+        """Get path to a build's tick/Drop trace (trace.jsonl)."""
+        return cls.BUILDS / slug / "trace.jsonl"
+
     @classmethod
     def build_lessons(cls, slug: str) -> Path:
         """Get path to a build's BUILD_LESSONS.json."""
@@ -100,7 +129,9 @@ DEFAULT_CONFIG = {
         "code_validator_enabled": True,
         "llm_filter_enabled": True,
         "llm_filter_timeout_seconds": 120,
+        "llm_filter_token_budget": 24000,  # Artifact excerpts per Filter prompt (~4 chars/token)
         "code_validator_timeout_seconds": 60,
+        "code_validator_workers": 0,  # Process pool size for directory scans (0 = CPU count)
         "auto_pass_on_validator_error": True
     },
     "auto_fix": {
@@ -122,6 +153,35 @@ DEFAULT_CONFIG = {
     "checkpoints": {
         "enabled": True,
         "auto_pause_on_critical": True
+    },
+    "orchestration": {
+        "max_concurrent_calls": 8,  # Filter/Dredge/spawn calls in flight per tick
+        "max_running_drops": 12,  # supervise: running Drops across all builds
+        "max_running_drops_per_build": 6  # supervise: default per-build cap (meta max_running_drops overrides)
+    },
+    "safety": {
+        "snapshot_mode": "tree"  # tree (refs/pulse/<slug>, worktree untouched) or legacy (stash / reset --hard)
+    },
+    "testing": {
+        "workers": 0,  # Parallel integration tests (0 = CPU count)
+        "timeout_seconds": 300,  # Per test; the whole process group is killed on expiry
+        "kill_grace_seconds": 5,  # SIGTERM -> SIGKILL
+        "history_runs": 20  # Outcomes kept per test for flaky detection
+    },
+    "api": {
+        "base_url": "https://api.zo.computer",  # PULSE_API_BASE_URL env overrides
+        "max_connections": 16,
+        "keepalive_seconds": 30,
+        "request_timeout_seconds": 120,
+        "rate_per_second": 5,
+        "burst": 10,
+        "max_retries": 4,
+        "backoff_base_seconds": 0.5,
+        "backoff_max_seconds": 30
+    },
+    "state": {
+        "backend": "json",  # json (meta.json is the source of truth) or sqlite
+        "db": "global"      # sqlite only: global (N5/data/pulse_state.db) or per_build
     }
 }
 
@@ -177,6 +237,63 @@ def _deep_merge(base: dict, override: dict) -> None:
 # COMMON UTILITIES
 # ============================================================================
 
+def write_text_atomic(path: Path, text: str) -> bool:
+    """Write via temp file + rename, skipping the write if content is unchanged.
+    
+    The file keeps its existing permissions (new files get 0666 & ~umask,
+    as open() would give them rather than mkstemp's 0600).
+    Returns True if the file was (re)written.
+    """
+    path = Path(path)
+    try:
+        if path.read_text() == text:
+            return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    return True
+
+
+class BuildLocked(Exception):
+    """Another process is already reconciling this build."""
+
+
+@contextmanager
+def build_lock(slug: str):
+    """Hold an exclusive, non-blocking flock on the build directory.
+
+    Serializes tick/spawn read-modify-write cycles on meta.json between the
+    daemon and scheduled `pulse.py tick` runs. Raises BuildLocked if held.
+    """
+    fd = os.open(PATHS.BUILDS / slug, os.O_RDONLY)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise BuildLocked(f"Build {slug} is locked by another tick") from None
+        yield
+    finally:
+        os.close(fd)
+
+
 def load_meta(slug: str) -> Optional[dict]:
     """Load a build's meta.json."""
     path = PATHS.build_meta(slug)
@@ -188,14 +305,117 @@ def load_meta(slug: str) -> Optional[dict]:
 
 def save_meta(slug: str, meta: dict) -> None:
     """Save a build's meta.json."""
-    path = PATHS.build_meta(slug)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(meta, f, indent=2)
+    write_text_atomic(PATHS.build_meta(slug), json.dumps(meta, indent=2))
+    catalog_record(slug, meta)
 
 
-def list_builds(status: str = None) -> list[str]:
-    """List all builds, optionally filtered by status."""
+def load_deposits(slug: str) -> tuple[dict, dict]:
+    """Load every Drop deposit for a build in one pass.
+    
+    Derived files (`<drop_id>_filter.json`, `_llm_filter`, `_forensics`) are skipped.
+    Returns (deposits, errors): {drop_id: deposit} and {drop_id: error message}.
+    """
+    deposits, errors = {}, {}
+    deposits_dir = PATHS.build_deposits(slug)
+    if not deposits_dir.exists():
+        return deposits, errors
+    
+    for path in sorted(deposits_dir.glob("*.json")):
+        if "_" in path.stem:
+            continue
+        try:
+            with open(path) as f:
+                deposits[path.stem] = json.load(f)
+        except (json.JSONDecodeError, UnicodeDecodeError, IOError) as e:
+            errors[path.stem] = str(e)
+    
+    return deposits, errors
+
+
+# ============================================================================
+# BUILD CATALOG
+# ============================================================================
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    slug TEXT PRIMARY KEY,
+    status TEXT,
+    updated_at TEXT,
+    meta_mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_builds_status ON builds(status, slug);
+"""
+
+_catalog_conn: Optional[sqlite3.Connection] = None
+
+
+def _catalog() -> sqlite3.Connection:
+    global _catalog_conn
+    if _catalog_conn is None:
+        PATHS.CATALOG_DB.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(PATHS.CATALOG_DB, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(CATALOG_SCHEMA)
+        _catalog_conn = conn
+    return _catalog_conn
+
+
+def _catalog_upsert(conn: sqlite3.Connection, slug: str, status: Optional[str], mtime_ns: int) -> None:
+    conn.execute(
+        """INSERT INTO builds (slug, status, updated_at, meta_mtime_ns) VALUES (?, ?, ?, ?)
+           ON CONFLICT(slug) DO UPDATE SET
+             status = excluded.status, updated_at = excluded.updated_at,
+             meta_mtime_ns = excluded.meta_mtime_ns""",
+        (slug, status, datetime.now(timezone.utc).isoformat(), mtime_ns)
+    )
+
+
+def catalog_record(slug: str, meta: dict) -> None:
+    """Record a build's status in the catalog right after its meta.json was written."""
+    try:
+        mtime_ns = PATHS.build_meta(slug).stat().st_mtime_ns
+        conn = _catalog()
+        _catalog_upsert(conn, slug, meta.get("status"), mtime_ns)
+        conn.commit()
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: Could not update build catalog for {slug}: {e}")
+
+
+def refresh_catalog() -> None:
+    """Self-heal the catalog: re-read only meta.json files whose mtime changed.
+    
+    One scandir of N5/builds plus a stat per build; builds edited outside
+    save_meta, added, or removed are picked up here.
+    """
+    on_disk = {}
+    if PATHS.BUILDS.exists():
+        with os.scandir(PATHS.BUILDS) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                try:
+                    on_disk[entry.name] = os.stat(os.path.join(entry.path, "meta.json")).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+    
+    conn = _catalog()
+    indexed = dict(conn.execute("SELECT slug, meta_mtime_ns FROM builds"))
+    for slug, mtime_ns in on_disk.items():
+        if indexed.get(slug) == mtime_ns:
+            continue
+        try:
+            with open(PATHS.build_meta(slug)) as f:
+                status = json.load(f).get("status")
+        except (json.JSONDecodeError, IOError):
+            status = None  # Unreadable: never matches a status filter
+        _catalog_upsert(conn, slug, status, mtime_ns)
+    removed = indexed.keys() - on_disk.keys()
+    conn.executemany("DELETE FROM builds WHERE slug = ?", [(slug,) for slug in removed])
+    conn.commit()
+
+
+def _scan_builds(statuses: Optional[tuple]) -> list[str]:
+    """Uncached fallback: parse every meta.json."""
     builds = []
     if not PATHS.BUILDS.exists():
         return builds
@@ -207,11 +427,11 @@ def list_builds(status: str = None) -> list[str]:
         if not meta_path.exists():
             continue
         
-        if status:
+        if statuses:
             try:
                 with open(meta_path) as f:
                     meta = json.load(f)
-                if meta.get("status") != status:
+                if meta.get("status") not in statuses:
                     continue
             except (json.JSONDecodeError, IOError):
                 continue
@@ -221,6 +441,29 @@ def list_builds(status: str = None) -> list[str]:
     return sorted(builds)
 
 
+def list_builds(status: Union[str, tuple, list, None] = None) -> list[str]:
+    """List all builds, optionally filtered by status (or any of several statuses).
+    
+    Served from the build catalog after an mtime-based refresh; falls back to
+    scanning every meta.json if the catalog is unavailable.
+    """
+    statuses = (status,) if isinstance(status, str) else tuple(status or ())
+    try:
+        refresh_catalog()
+        conn = _catalog()
+        if statuses:
+            placeholders = ",".join("?" * len(statuses))
+            rows = conn.execute(
+                f"SELECT slug FROM builds WHERE status IN ({placeholders}) ORDER BY slug", statuses
+            )
+        else:
+            rows = conn.execute("SELECT slug FROM builds ORDER BY slug")
+        return [slug for (slug,) in rows]
+    except (OSError, sqlite3.Error) as e:
+        print(f"Warning: Build catalog unavailable ({e}), scanning builds")
+        return _scan_builds(statuses)
+
+
 if __name__ == "__main__":
     # Quick test / info
     print("Pulse Common Module")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Pulse Graph: Compiled dependency DAG and ready-queue for a build.
+
+A build's meta.json describes dependencies two ways:
+- `drops.<id>.depends_on`: explicit edges
+- `currents.<name>`: sequential chains; each Drop waits for the one before it
+
+BuildGraph compiles both into one predecessor/successor graph, validates it
+(unknown Drop references, cycles), groups Drops by Stream, and keeps an
+indegree counter per Drop. Completions decrement their successors' counters,
+so the ready set updates in O(out-degree) instead of rescanning every chain.
+
+Compiled graphs are cached per build and reused while the structure
+(depends_on + currents) is unchanged.
+
+Usage:
+  pulse_graph.py validate <slug>   # Check a build's graph, print streams/ready
+"""
+
+import argparse
+import json
+import re
+import sys
+from typing import Optional
+
+from pulse_common import PATHS
+
+STREAM_RE = re.compile(r"^[A-Za-z]+(\d+)(?:\.|$)")
+
+
+class GraphError(ValueError):
+    """Invalid build graph (unknown dependency or cycle)."""
+
+
+def stream_of(drop_id: str, info: dict) -> Optional[int]:
+    """Stream number from info["stream"], else from the ID (D12.3 -> 12)."""
+    stream = info.get("stream")
+    if isinstance(stream, int):
+        return stream
+    match = STREAM_RE.match(drop_id)
+    return int(match.group(1)) if match else None
+
+
+def structure_key(meta: dict) -> tuple:
+    """Everything the compiled graph depends on (not statuses)."""
+    drops = meta.get("drops", {})
+    return (
+        tuple((d, tuple(info.get("depends_on", [])), info.get("stream")) for d, info in drops.items()),
+        tuple((name, tuple(chain)) for name, chain in meta.get("currents", {}).items()),
+    )
+
+
+class BuildGraph:
+    """Drops, predecessor edges, Stream membership and a live ready-queue."""
+
+    def __init__(self, meta: dict):
+        drops = meta.get("drops", {})
+        self.order = {drop_id: i for i, drop_id in enumerate(drops)}
+        self.preds: dict[str, set[str]] = {d: set() for d in drops}
+        self.succs: dict[str, list[str]] = {d: [] for d in drops}
+        self.streams: dict[int, list[str]] = {}
+
+        errors = []
+        for drop_id, info in drops.items():
+            for dep in info.get("depends_on", []):
+                if dep not in drops:
+                    errors.append(f"{drop_id} depends on unknown Drop {dep}")
+                else:
+                    self._add_edge(dep, drop_id)
+            stream = stream_of(drop_id, info)
+            if stream is not None:
+                self.streams.setdefault(stream, []).append(drop_id)
+
+        for name, chain in meta.get("currents", {}).items():
+            for drop_id in chain:
+                if drop_id not in drops:
+                    errors.append(f"Current {name} references unknown Drop {drop_id}")
+            for prev, nxt in zip(chain, chain[1:]):
+                if prev in drops and nxt in drops:
+                    self._add_edge(prev, nxt)
+
+        if errors:
+            raise GraphError("; ".join(errors))
+        cycle = self._find_cycle()
+        if cycle:
+            raise GraphError("Dependency cycle: " + " -> ".join(cycle))
+
+        self.indegree: dict[str, int] = {}
+        self.status: dict[str, Optional[str]] = {}
+        self.complete: set[str] = set()
+        self.ready_set: set[str] = set()
+        self._synced = False
+
+    def _add_edge(self, pred: str, succ: str) -> None:
+        if pred == succ:
+            self.preds[succ].add(pred)  # Self-loop; reported as a cycle
+            self.succs[pred].append(succ)
+        elif pred not in self.preds[succ]:
+            self.preds[succ].add(pred)
+            self.succs[pred].append(succ)
+
+    def _find_cycle(self) -> Optional[list[str]]:
+        """Kahn's algorithm; if nodes remain, walk predecessors to extract one cycle."""
+        indegree = {d: len(p) for d, p in self.preds.items()}
+        queue = [d for d, n in indegree.items() if n == 0]
+        seen = 0
+        while queue:
+            node = queue.pop()
+            seen += 1
+            for succ in self.succs[node]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    queue.append(succ)
+        if seen == len(self.preds):
+            return None
+
+        remaining = {d for d, n in indegree.items() if n > 0}
+        node = min(remaining, key=self.order.get)
+        path, index = [], {}
+        while node not in index:
+            index[node] = len(path)
+            path.append(node)
+            node = min((p for p in self.preds[node] if p in remaining), key=self.order.get)
+        cycle = path[index[node]:] + [node]
+        cycle.reverse()  # Walked predecessors; report in dependency order
+        return cycle
+
+    # ------------------------------------------------------------------------
+    # Ready-queue
+    # ------------------------------------------------------------------------
+
+    def _reset(self, complete: set[str]) -> None:
+        self.complete = set(complete)
+        self.indegree = {d: sum(1 for p in preds if p not in complete) for d, preds in self.preds.items()}
+        self.ready_set = {d for d, n in self.indegree.items() if n == 0 and d not in complete}
+        self._synced = True
+
+    def mark_complete(self, drop_id: str) -> None:
+        """Record a completion; O(out-degree)."""
+        if drop_id in self.complete:
+            return
+        self.complete.add(drop_id)
+        self.ready_set.discard(drop_id)
+        for succ in self.succs[drop_id]:
+            self.indegree[succ] -= 1
+            if self.indegree[succ] == 0:
+                self.ready_set.add(succ)
+
+    def sync(self, meta: dict) -> "BuildGraph":
+        """Bring counters up to date with meta's statuses.
+
+        New completions are applied incrementally; a Drop leaving "complete"
+        (e.g. reset for retry) forces a full recount.
+        """
+        drops = meta.get("drops", {})
+        self.status = {d: info.get("status") for d, info in drops.items()}
+        complete = {d for d, s in self.status.items() if s == "complete"}
+        if not self._synced or not self.complete <= complete:
+            self._reset(complete)
+        else:
+            for drop_id in complete - self.complete:
+                self.mark_complete(drop_id)
+        return self
+
+    def ready(self) -> list[str]:
+        """Pending Drops whose predecessors are all complete, in meta order."""
+        return sorted(
+            (d for d in self.ready_set if self.status.get(d) == "pending"),
+            key=self.order.get
+        )
+
+    def stream_complete(self, stream: int) -> bool:
+        return all(
+            self.status.get(d) in ("complete", "failed")
+            for d in self.streams.get(stream, [])
+        )
+
+
+_cache: dict[str, tuple[tuple, BuildGraph]] = {}
+
+
+def get_graph(slug: str, meta: dict) -> BuildGraph:
+    """Compiled graph for a build, reused while its structure is unchanged."""
+    key = structure_key(meta)
+    cached = _cache.get(slug)
+    if cached is None or cached[0] != key:
+        cached = (key, BuildGraph(meta))
+        _cache[slug] = cached
+    return cached[1].sync(meta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pulse build graph")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    val_parser = subparsers.add_parser("validate", help="Validate a build's dependency graph")
+    val_parser.add_argument("slug", help="Build slug")
+
+    args = parser.parse_args()
+
+    if args.command == "validate":
+        meta_path = PATHS.build_meta(args.slug)
+        if not meta_path.exists():
+            print(f"Build not found: {args.slug}", file=sys.stderr)
+            sys.exit(1)
+        meta = json.loads(meta_path.read_text())
+        try:
+            graph = BuildGraph(meta).sync(meta)
+        except GraphError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(json.dumps({
+            "valid": True,
+            "drops": len(graph.preds),
+            "edges": sum(len(s) for s in graph.succs.values()),
+            "streams": {str(k): v for k, v in sorted(graph.streams.items())},
+            "ready": graph.ready(),
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@ Pulse Learnings: Capture and propagate learnings at build and system level.
 
 Two tiers:
 1. Build-local learnings  → N5/builds/<slug>/BUILD_LESSONS.json
-2. System-wide learnings  → N5/learnings/SYSTEM_LEARNINGS.json
+2. System-wide learnings  → N5/data/pulse_learnings.db (pulse_learnings_store),
+                            exported to N5/learnings/SYSTEM_LEARNINGS.json
 
 Usage:
   pulse_learnings.py add <slug> "learning text" [--system]
@@ -15,13 +16,18 @@ Usage:
 """
 
 import argparse
+import hashlib
+import heapq
 import json
 import os
-from datetime import datetime, timezone, timedelta
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from pulse_common import PATHS, WORKSPACE
+import pulse_learnings_store as store
+from pulse_common import PATHS, WORKSPACE, load_deposits, write_text_atomic
 
 
 def load_build_learnings(slug: str) -> dict:
@@ -42,37 +48,12 @@ def save_build_learnings(slug: str, data: dict):
 
 def load_system_learnings() -> dict:
     """Load system-wide learnings, applying defaults for missing v2 fields"""
-    if PATHS.SYSTEM_LEARNINGS.exists():
-        with open(PATHS.SYSTEM_LEARNINGS) as f:
-            data = json.load(f)
-        
-        # Backward compatibility: fill missing v2 fields with defaults
-        for learning in data.get("learnings", []):
-            if "confidence" not in learning:
-                learning["confidence"] = 0.7
-            if "validated_count" not in learning:
-                learning["validated_count"] = 0
-            if "last_validated" not in learning:
-                learning["last_validated"] = None
-            if "decay_days" not in learning:
-                learning["decay_days"] = 30
-            if "expires_at" not in learning:
-                learning["expires_at"] = None
-            if "status" not in learning:
-                learning["status"] = "active"
-            if "disputed_by" not in learning:
-                learning["disputed_by"] = None
-            if "dispute_reason" not in learning:
-                learning["dispute_reason"] = None
-        
-        return data
-    return {"meta": {"description": "System-wide learnings", "version": "2.0"}, "learnings": []}
+    return store.load()
 
 
 def save_system_learnings(data: dict):
-    """Save system-wide learnings"""
-    with open(PATHS.SYSTEM_LEARNINGS, "w") as f:
-        json.dump(data, f, indent=2)
+    """Replace all system-wide learnings (prefer the store's per-learning updates)"""
+    store.replace_all(data)
 
 
 def add_learning(slug: str, text: str, source: str = "manual", system: bool = False, tags: list = None, confidence: float = None, decay_days: int = None, expires_at: str = None, force: bool = False):
@@ -96,29 +77,12 @@ def add_learning(slug: str, text: str, source: str = "manual", system: bool = Fa
         except Exception as e:
             print(f"[Contradiction check] Error: {e}, skipping")
     
-    # NEW: Deduplication check
-    if system:
-        existing = load_system_learnings().get("learnings", [])
-    else:
-        existing = load_build_learnings(slug).get("learnings", [])
-    
-    # Check for exact or near-exact duplicates
-    text_normalized = text.strip().lower()
-    for ex in existing:
-        ex_normalized = ex.get("text", "").strip().lower()
-        if text_normalized == ex_normalized:
-            print(f"[SKIP] Duplicate learning already exists: {text[:60]}...")
+    # NEW: Deduplication check (system learnings use the store's word index)
+    if not system:
+        duplicate = find_similar(text, load_build_learnings(slug).get("learnings", []))
+        if duplicate:
+            _report_duplicate(text, *duplicate)
             return False
-        # Also check for high similarity (>90% character overlap)
-        if len(text_normalized) > 20 and len(ex_normalized) > 20:
-            # Simple similarity: shared words ratio
-            words_new = set(text_normalized.split())
-            words_ex = set(ex_normalized.split())
-            if words_new and words_ex:
-                overlap = len(words_new & words_ex) / max(len(words_new), len(words_ex))
-                if overlap > 0.9:
-                    print(f"[SKIP] Very similar learning already exists ({overlap:.0%} overlap): {ex.get('text', '')[:60]}...")
-                    return False
     
     learning = {
         "text": text,
@@ -140,15 +104,40 @@ def add_learning(slug: str, text: str, source: str = "manual", system: bool = Fa
         learning["disputed_by"] = None
         learning["dispute_reason"] = None
         
-        data = load_system_learnings()
-        data["learnings"].append(learning)
-        save_system_learnings(data)
+        duplicate = store.add_unique(learning)
+        if duplicate:
+            _report_duplicate(text, *duplicate)
+            return False
         print(f"[SYSTEM] Added learning: {text[:60]}... (confidence: {learning['confidence']})")
     else:
         data = load_build_learnings(slug)
         data["learnings"].append(learning)
         save_build_learnings(slug, data)
         print(f"[{slug}] Added learning: {text[:60]}...")
+    return True
+
+
+def find_similar(text: str, existing: list) -> Optional[tuple[dict, float]]:
+    """(learning, similarity) for an exact or near duplicate of text among existing, else None"""
+    text_normalized = store.normalize(text)
+    words_new = set(text_normalized.split())
+    for ex in existing:
+        ex_normalized = store.normalize(ex.get("text", ""))
+        if text_normalized == ex_normalized:
+            return ex, 1.0
+        # Also check for high similarity (>90% shared words)
+        if len(text_normalized) > store.MIN_SIMILAR_CHARS and len(ex_normalized) > store.MIN_SIMILAR_CHARS:
+            overlap = store.similarity(words_new, set(ex_normalized.split()))
+            if overlap > store.SIMILARITY_THRESHOLD:
+                return ex, overlap
+    return None
+
+
+def _report_duplicate(text: str, existing: dict, overlap: float):
+    if overlap >= 1.0 and store.normalize(existing.get("text", "")) == store.normalize(text):
+        print(f"[SKIP] Duplicate learning already exists: {text[:60]}...")
+    else:
+        print(f"[SKIP] Very similar learning already exists ({overlap:.0%} overlap): {existing.get('text', '')[:60]}...")
 
 
 def list_learnings(slug: str) -> list:
@@ -176,9 +165,7 @@ def promote_learning(slug: str, index: int):
     learning["origin_build"] = slug
     learning["promoted_at"] = datetime.now(timezone.utc).isoformat()
     
-    system_data = load_system_learnings()
-    system_data["learnings"].append(learning)
-    save_system_learnings(system_data)
+    store.add(learning)
     
     print(f"Promoted to system: {learning['text'][:60]}...")
     return True
@@ -186,64 +173,157 @@ def promote_learning(slug: str, index: int):
 
 def get_relevant_learnings(slug: str, tags: list = None) -> list:
     """Get system learnings relevant to a build (by tags or all)"""
-    system = load_system_learnings()
-    learnings = system.get("learnings", [])
-    
     if not tags:
-        return learnings
+        return load_system_learnings().get("learnings", [])
     
-    return [l for l in learnings if any(t in l.get("tags", []) for t in tags)]
+    return store.with_tags(tags)
+
+
+# ===== Brief Injection =====
+
+MAX_INJECTED = 5  # Learnings per brief
+INJECT_POOL_MIN_BRIEFS = 16  # Process briefs concurrently from this many up
+INJECT_WORKERS = 8
+TAG_WEIGHT = 3  # A tag named in the brief outweighs a few shared words
+LEARNINGS_HEADING = "## System Learnings (Auto-Injected)"
+BLOCK_RE = re.compile(
+    r"\n*" + re.escape(LEARNINGS_HEADING) + r"\n<!-- pulse:learnings sha=(\w+) -->\n.*?<!-- /pulse:learnings -->\n?",
+    re.DOTALL
+)
+# Blocks injected before they carried markers: heading up to the next section
+LEGACY_BLOCK_RE = re.compile(r"\n*## System Learnings[^\n]*\n.*?(?=\n## |\Z)", re.DOTALL)
+WORD_RE = re.compile(r"[a-z0-9_]{4,}")
+TAG_RE = re.compile(r"[a-z0-9_+-]+")
 
 
-def inject_learnings_into_brief(brief_path: Path, learnings: list) -> str:
-    """Inject relevant learnings into a Drop brief"""
+def _words(text: str) -> set:
+    return set(WORD_RE.findall(text.lower()))
+
+
+def render_learnings_block(learnings: list) -> tuple[str, str]:
+    """(hash, injected section) for these learnings; the section's marker carries the hash."""
+    items = "".join(f"- {l['text']}\n" for l in learnings[:MAX_INJECTED])
+    digest = hashlib.sha256(items.encode()).hexdigest()[:12]
+    return digest, (
+        f"\n\n{LEARNINGS_HEADING}\n<!-- pulse:learnings sha={digest} -->\n\n"
+        f"Review these before starting:\n\n{items}<!-- /pulse:learnings -->\n"
+    )
+
+
+def _strip_block(content: str) -> tuple[str, Optional[str], int]:
+    """(content without the injected block, its hash or None, where it was)"""
+    match = BLOCK_RE.search(content) or LEGACY_BLOCK_RE.search(content)
+    if not match:
+        return content, None, -1
+    sha = match.group(1) if match.re is BLOCK_RE else None
+    return content[:match.start()] + content[match.end():], sha, match.start()
+
+
+def inject_learnings_into_brief(brief_path: Path, learnings: list, content: Optional[str] = None) -> str:
+    """Inject relevant learnings into a Drop brief
+    
+    Replaces a previously injected block. The brief is rewritten (atomically)
+    only when the block's hash changes. Returns brief_path if it was rewritten.
+    """
     if not learnings:
         return None
     
-    with open(brief_path) as f:
-        content = f.read()
-    
-    # Check if already has learnings section
-    if "## System Learnings" in content:
-        return None  # Already injected
-    
-    learnings_section = "\n\n## System Learnings (Auto-Injected)\n\n"
-    learnings_section += "Review these before starting:\n\n"
-    for i, l in enumerate(learnings[:5]):  # Max 5
-        learnings_section += f"- {l['text']}\n"
-    
-    # Insert before "## Requirements" or at end
-    if "## Requirements" in content:
-        content = content.replace("## Requirements", learnings_section + "## Requirements")
+    if content is None:
+        with open(brief_path) as f:
+            content = f.read()
+    
+    digest, block = render_learnings_block(learnings)
+    body, current_sha, position = _strip_block(content)
+    if current_sha == digest:
+        return None  # Already injected, unchanged
+    
+    # Same place as before, else before "## Requirements", else at end
+    if position < 0:
+        position = body.find("## Requirements")
+    if position >= 0:
+        head = body[:position].rstrip("\n")
+        tail = body[position:].lstrip("\n")
+        content = head + block + ("\n" + tail if tail else "")
     else:
-        content += learnings_section
-    
-    with open(brief_path, "w") as f:
-        f.write(content)
+        content = body.rstrip("\n") + block
     
+    if not write_text_atomic(brief_path, content):
+        return None
     return brief_path
 
 
-def inject_all_briefs(slug: str, tags: list = None):
-    """Inject relevant system learnings into all Drop briefs for a build"""
-    learnings = get_relevant_learnings(slug, tags)
+class LearningIndex:
+    """Learnings loaded once, with a word index for per-brief relevance."""
+    
+    def __init__(self, learnings: list):
+        self.learnings = learnings
+        self.by_word: dict[str, list[int]] = {}
+        self.tags = []
+        for i, learning in enumerate(learnings):
+            for word in _words(learning.get("text", "")):
+                self.by_word.setdefault(word, []).append(i)
+            self.tags.append({t.lower() for t in learning.get("tags", []) if isinstance(t, str)})
+    
+    def select(self, brief_text: str, limit: int = MAX_INJECTED) -> list:
+        """Most relevant learnings for a brief: tags it mentions, then shared words.
+        
+        Ties (and briefs matching nothing) keep higher confidence, then list order.
+        """
+        brief_words = _words(brief_text)
+        scores = [0.0] * len(self.learnings)
+        for word in brief_words:
+            for i in self.by_word.get(word, ()):
+                scores[i] += 1
+        brief_tokens = set(TAG_RE.findall(brief_text.lower()))
+        for i, tags in enumerate(self.tags):
+            scores[i] += TAG_WEIGHT * len(tags & brief_tokens)
+        ranked = heapq.nsmallest(
+            limit, range(len(self.learnings)),
+            key=lambda i: (-scores[i], -self.learnings[i].get("confidence", 0.7), i)
+        )
+        return [self.learnings[i] for i in ranked]
+
+
+def _inject_one(brief_path: Path, index: LearningIndex) -> Optional[Path]:
+    with open(brief_path) as f:
+        content = f.read()
+    # Relevance from the brief itself, not from learnings injected into it earlier
+    body, _, _ = _strip_block(content)
+    return inject_learnings_into_brief(brief_path, index.select(body), content=content)
+
+
+def inject_all_briefs(slug: str, tags: list = None) -> dict:
+    """Inject relevant system learnings into all Drop briefs for a build
+    
+    Learnings are loaded once; each brief gets its own top matches. Briefs
+    whose injected block would not change are left untouched.
+    """
+    learnings = [l for l in get_relevant_learnings(slug, tags) if l.get("status", "active") == "active"]
+    result = {"briefs": 0, "injected": 0}
     if not learnings:
         print("No relevant system learnings to inject.")
-        return
+        return result
     
     drops_dir = PATHS.BUILDS / slug / "drops"
     if not drops_dir.exists():
         print(f"No drops directory for {slug}")
-        return
+        return result
     
-    injected = 0
-    for brief_path in drops_dir.glob("*.md"):
-        result = inject_learnings_into_brief(brief_path, learnings)
-        if result:
-            injected += 1
-            print(f"Injected learnings into {brief_path.name}")
+    briefs = sorted(Path(e.path) for e in os.scandir(drops_dir) if e.name.endswith(".md") and e.is_file())
+    index = LearningIndex(learnings)
+    if len(briefs) >= INJECT_POOL_MIN_BRIEFS:
+        with ThreadPoolExecutor(max_workers=INJECT_WORKERS) as pool:
+            injected = list(pool.map(lambda p: _inject_one(p, index), briefs))
+    else:
+        injected = [_inject_one(p, index) for p in briefs]
+    
+    result["briefs"] = len(briefs)
+    for brief_path in filter(None, injected):
+        result["injected"] += 1
+        print(f"Injected learnings into {brief_path.name}")
     
-    print(f"Injected into {injected} briefs.")
+    print(f"Injected into {result['injected']} briefs ({len(briefs) - result['injected']} unchanged).")
+    return result
 
 
 def extract_learnings_from_deposit(slug: str, drop_id: str) -> list:
@@ -259,6 +339,11 @@ def extract_learnings_from_deposit(slug: str, drop_id: str) -> list:
         print(f"Warning: Could not parse {deposit_path.name} - {e}")
         return []
     
+    return learnings_from_deposit(deposit)
+
+
+def learnings_from_deposit(deposit: dict) -> list:
+    """Extract learning texts from an already loaded deposit"""
     # Look for learnings field
     learnings_data = deposit.get("learnings", [])
     if not learnings_data:
@@ -285,43 +370,45 @@ def extract_learnings_from_deposit(slug: str, drop_id: str) -> list:
     return result
 
 
-def harvest_build_learnings(slug: str, verbose: bool = False):
-    """Harvest all learnings from completed deposits"""
-    deposits_dir = PATHS.BUILDS / slug / "deposits"
-    if not deposits_dir.exists():
-        print(f"No deposits for {slug}")
-        return
+def harvest_build_learnings(slug: str, verbose: bool = False, deposits: Optional[dict] = None,
+                            deposit_errors: Optional[dict] = None) -> dict:
+    """Harvest all learnings from completed deposits
     
-    harvested = 0
-    processed_files = 0
-    skipped_files = 0
-    
-    for deposit_path in deposits_dir.glob("*.json"):
-        if "_filter" in deposit_path.name:
-            if verbose:
-                print(f"Skipping filter file: {deposit_path.name}")
-            continue  # Skip filter results
-        
-        processed_files += 1
-        drop_id = deposit_path.stem
-        learnings = extract_learnings_from_deposit(slug, drop_id)
+    Pass `deposits`/`deposit_errors` from load_deposits() to reuse an already
+    loaded set. Returns counts: processed, found, harvested (newly added).
+    """
+    result = {"processed": 0, "found": 0, "harvested": 0}
+    if deposits is None:
+        if not (PATHS.BUILDS / slug / "deposits").exists():
+            print(f"No deposits for {slug}")
+            return result
+        deposits, deposit_errors = load_deposits(slug)
+    
+    for drop_id, error in (deposit_errors or {}).items():
+        print(f"Warning: Could not parse {drop_id}.json - {error}")
+    
+    for drop_id, deposit in deposits.items():
+        result["processed"] += 1
+        learnings = learnings_from_deposit(deposit)
+        result["found"] += len(learnings)
         
         if verbose:
             if learnings:
-                print(f"Found {len(learnings)} learning(s) in {deposit_path.name}")
+                print(f"Found {len(learnings)} learning(s) in {drop_id}.json")
                 for learning in learnings:
                     print(f"  - {learning[:80]}...")
             else:
-                print(f"No learnings in {deposit_path.name}")
+                print(f"No learnings in {drop_id}.json")
         
         for learning_text in learnings:
-            add_learning(slug, learning_text, source=f"Drop:{drop_id}")
-            harvested += 1
+            if add_learning(slug, learning_text, source=f"Drop:{drop_id}"):
+                result["harvested"] += 1
     
     if verbose:
-        print(f"\nProcessed {processed_files} deposits, harvested {harvested} learnings from {slug}")
+        print(f"\nProcessed {result['processed']} deposits, harvested {result['harvested']} learnings from {slug}")
     else:
-        print(f"Harvested {harvested} learnings from {slug}")
+        print(f"Harvested {result['harvested']} learnings from {slug}")
+    return result
 
 
 # ===== V2 Functions: Confidence, Validation, Status Tracking =====
@@ -336,26 +423,24 @@ def validate_learning(index: int, boost: float = 0.05) -> bool:
     Returns:
         True if validated successfully, False otherwise
     """
-    data = load_system_learnings()
-    learnings = data.get("learnings", [])
-    
-    if index < 0 or index >= len(learnings):
-        print(f"Invalid index {index}. System has {len(learnings)} learnings.")
-        return False
-    
-    learning = learnings[index]
     now = datetime.now(timezone.utc).isoformat()
+    before = {}
+    
+    def apply(learning):
+        before["confidence"] = learning.get("confidence", 0.7)
+        learning["validated_count"] = learning.get("validated_count", 0) + 1
+        learning["last_validated"] = now
+        # Boost confidence, capped at 1.0
+        learning["confidence"] = min(1.0, before["confidence"] + boost)
+        # Ensure status is active
+        learning["status"] = "active"
     
-    # Update fields
-    learning["validated_count"] = learning.get("validated_count", 0) + 1
-    learning["last_validated"] = now
-    # Boost confidence, capped at 1.0
-    current_confidence = learning.get("confidence", 0.7)
-    learning["confidence"] = min(1.0, current_confidence + boost)
-    # Ensure status is active
-    learning["status"] = "active"
+    learning = store.update(index, apply)
+    if learning is None:
+        print(f"Invalid index {index}. System has {store.count()} learnings.")
+        return False
+    current_confidence = before["confidence"]
     
-    save_system_learnings(data)
     print(f"Validated learning #{index}: {learning['text'][:60]}...")
     print(f"  Confidence: {current_confidence:.2f} → {learning['confidence']:.2f} (validated {learning['validated_count']} times)")
     return True
@@ -372,21 +457,17 @@ def dispute_learning(index: int, reason: str, source: str = None) -> bool:
     Returns:
         True if disputed successfully, False otherwise
     """
-    data = load_system_learnings()
-    learnings = data.get("learnings", [])
-    
-    if index < 0 or index >= len(learnings):
-        print(f"Invalid index {index}. System has {len(learnings)} learnings.")
+    def apply(learning):
+        # Set dispute fields
+        learning["status"] = "disputed"
+        learning["disputed_by"] = source
+        learning["dispute_reason"] = reason
+    
+    learning = store.update(index, apply)
+    if learning is None:
+        print(f"Invalid index {index}. System has {store.count()} learnings.")
         return False
     
-    learning = learnings[index]
-    
-    # Set dispute fields
-    learning["status"] = "disputed"
-    learning["disputed_by"] = source
-    learning["dispute_reason"] = reason
-    
-    save_system_learnings(data)
     print(f"Disputed learning #{index}: {learning['text'][:60]}...")
     print(f"  Reason: {reason}")
     if source:
@@ -403,18 +484,15 @@ def invalidate_learning(index: int) -> bool:
     Returns:
         True if invalidated successfully, False otherwise
     """
-    data = load_system_learnings()
-    learnings = data.get("learnings", [])
+    def apply(learning):
+        learning["status"] = "invalidated"
+        learning["confidence"] = 0.0
     
-    if index < 0 or index >= len(learnings):
-        print(f"Invalid index {index}. System has {len(learnings)} learnings.")
+    learning = store.update(index, apply)
+    if learning is None:
+        print(f"Invalid index {index}. System has {store.count()} learnings.")
         return False
     
-    learning = learnings[index]
-    learning["status"] = "invalidated"
-    learning["confidence"] = 0.0
-    
-    save_system_learnings(data)
     print(f"Invalidated learning #{index}: {learning['text'][:60]}...")
     return True
 
@@ -424,78 +502,37 @@ def expire_stale_learnings(verbose: bool = False) -> int:
     
     A learning is stale if:
     1. It has expires_at set and now > expires_at, OR
-    2. It has no expires_at, has decay_days set, and:
+    2. It has decay_days set, and:
        - If never validated: now > added_at + decay_days
        - If validated: now > last_validated + decay_days
     
+    Each learning's next expiry is precomputed in the store, so this only
+    touches learnings that are actually due.
+    
     Args:
         verbose: If True, print details of each expired learning
     
     Returns:
         Number of learnings marked as expired
     """
-    data = load_system_learnings()
-    learnings = data.get("learnings", [])
-    now = datetime.now(timezone.utc)
-    expired_count = 0
-    
-    for i, learning in enumerate(learnings):
-        # Skip if already not active
-        if learning.get("status") in ("disputed", "invalidated", "expired"):
-            continue
-        
-        # Check explicit expiration
-        expires_at = learning.get("expires_at")
-        if expires_at:
-            try:
-                expires_dt = datetime.fromisoformat(expires_at)
-                if expires_dt.tzinfo is None:
-                    expires_dt = expires_dt.replace(tzinfo=timezone.utc)
-                if now > expires_dt:
-                    learning["status"] = "expired"
-                    expired_count += 1
-                    if verbose:
-                        print(f"Expired #{i} (expires_at): {learning['text'][:50]}...")
-                    continue
-            except (ValueError, TypeError):
-                pass  # Invalid date format, skip
-        
-        # Check decay
-        decay_days = learning.get("decay_days", 30)
-        last_validated = learning.get("last_validated")
-        added_at = learning.get("added_at")
-        
-        # Determine to reference date (last_validated or added_at)
-        ref_date = None
-        if last_validated:
-            try:
-                ref_date = datetime.fromisoformat(last_validated)
-            except (ValueError, TypeError):
-                pass
-        elif added_at:
-            try:
-                ref_date = datetime.fromisoformat(added_at)
-            except (ValueError, TypeError):
-                pass
-        
-        # Add timezone if missing
-        if ref_date and ref_date.tzinfo is None:
-            ref_date = ref_date.replace(tzinfo=timezone.utc)
-        
-        # Check if decay period has passed
-        if ref_date:
-            expiry_date = ref_date + timedelta(days=decay_days)
-            if now > expiry_date:
-                learning["status"] = "expired"
-                expired_count += 1
-                if verbose:
-                    print(f"Expired #{i} (decay {decay_days}d): {learning['text'][:50]}...")
+    # Range query over the indexed next_expiry; one transaction for all expirations
+    expired = store.expire_due()
+    expired_count = len(expired)
+    if verbose:
+        for i, learning, reason in expired:
+            if reason == "expires_at":
+                print(f"Expired #{i} (expires_at): {learning['text'][:50]}...")
+            else:
+                print(f"Expired #{i} (decay {learning.get('decay_days', 30)}d): {learning['text'][:50]}...")
     
     if expired_count > 0:
-        save_system_learnings(data)
+        store.export_json()
         print(f"Marked {expired_count} learnings as expired.")
     elif verbose:
         print("No learnings expired.")
+    if verbose:
+        upcoming = store.next_expiry()
+        print(f"Next expiry: {upcoming.isoformat() if upcoming else 'none scheduled'}")
     
     return expired_count
 
@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+"""
+Pulse Learnings Store: SQLite-backed system learnings (N5/data/pulse_learnings.db).
+
+Each learning is one row holding its full JSON record, plus indexed columns
+for the normalized text and status. Every mutation (add, validate, dispute,
+invalidate, expire, lesson) is one write transaction. SYSTEM_LEARNINGS.json
+is a human-readable export, rendered on demand rather than per write: by
+export_json() at the end of a batch (expire-stale, the `export`
+command) and at exit of any process that changed the store. It is written
+atomically and only when its content changes. As with pulse_state, a
+hand-edited export (hash no longer matches the last export) is re-imported
+on next use: the file wins.
+
+Connections are per thread (validators log lessons from worker threads).
+
+Validation-failure lessons (pulse_code_validator / pulse_llm_filter) used to
+be appended to SYSTEM_LEARNINGS.json as JSON lines, which broke the JSON
+document. They now live in their own table and are exported under "lessons".
+The importer recovers lessons from files that already carry appended lines.
+
+Near-duplicate detection keeps the old rule: same normalized text, or (both
+texts over 20 chars) word-set overlap |A & B| / max(|A|, |B|) > 0.9. It is
+answered from an inverted word index instead of comparing against every
+learning: a match must contain at least one of the ceil(0.1 * |A|) rarest
+words of the new text (prefix filtering), and its word count must lie in
+(0.9 |A|, |A| / 0.9). Only those candidates are compared exactly, so the
+result is the same as the full scan.
+
+Each row also carries its computed next_expiry (epoch seconds: the earlier
+of expires_at and last_validated-or-added_at + decay_days), kept current on
+every write. Expiry is a range query over the partial index on next_expiry,
+and tags live in their own indexed table for get_relevant_learnings.
+
+Usage:
+  pulse_learnings_store.py import [path]   # (Re)seed the store from a JSON export
+  pulse_learnings_store.py export          # Rewrite SYSTEM_LEARNINGS.json from the store
+  pulse_learnings_store.py stats
+"""
+
+import argparse
+import atexit
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from pulse_common import PATHS, write_text_atomic
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS learnings (
+    id INTEGER PRIMARY KEY,
+    norm_text TEXT NOT NULL,
+    n_words INTEGER NOT NULL,
+    status TEXT,
+    next_expiry REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_learnings_norm ON learnings(norm_text);
+CREATE TABLE IF NOT EXISTS learning_tags (
+    tag TEXT NOT NULL,
+    learning_id INTEGER NOT NULL,
+    PRIMARY KEY (tag, learning_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS learning_words (
+    word TEXT NOT NULL,
+    learning_id INTEGER NOT NULL,
+    PRIMARY KEY (word, learning_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS word_df (
+    word TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS lessons (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Created after migrating older databases (next_expiry was added later)
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_learnings_expiry ON learnings(next_expiry) WHERE next_expiry IS NOT NULL;
+"""
+
+INACTIVE_STATUSES = ("disputed", "invalidated", "expired")
+
+SIMILARITY_THRESHOLD = 0.9
+MIN_SIMILAR_CHARS = 20  # Both texts must be longer than this for the overlap rule
+
+DEFAULT_META = {"description": "System-wide learnings", "version": "2.0"}
+
+# Defaults for v2 fields missing from older records
+V2_DEFAULTS = {
+    "confidence": 0.7,
+    "validated_count": 0,
+    "last_validated": None,
+    "decay_days": 30,
+    "expires_at": None,
+    "status": "active",
+    "disputed_by": None,
+    "dispute_reason": None,
+}
+
+_local = threading.local()
+_sync_lock = threading.Lock()
+_export_lock = threading.Lock()
+_synced = False
+_export_pending = False
+_exit_hook_registered = False
+
+
+def db_path() -> Path:
+    return PATHS.LEARNINGS_DB
+
+
+def connect() -> sqlite3.Connection:
+    """This thread's store connection; the first use in a process imports
+    SYSTEM_LEARNINGS.json if it is new or was hand-edited."""
+    global _synced
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        db_path().parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(db_path(), timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        conn.executescript(INDEXES)
+        _local.conn = conn
+    if not _synced:
+        with _sync_lock:
+            if not _synced:
+                _synced = True
+                _sync_from_export(conn)
+    return conn
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def normalize(text: str) -> str:
+    return text.strip().lower()
+
+
+def similarity(a_words: set, b_words: set) -> float:
+    """Shared-word ratio used for near-duplicate detection."""
+    if not a_words or not b_words:
+        return 0.0
+    return len(a_words & b_words) / max(len(a_words), len(b_words))
+
+
+def with_defaults(learning: dict) -> dict:
+    for key, value in V2_DEFAULTS.items():
+        learning.setdefault(key, value)
+    return learning
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+    # Add timezone if missing
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def expiry_reason(learning: dict) -> tuple[Optional[float], Optional[str]]:
+    """(next expiry as epoch seconds, "expires_at" | "decay") for an active learning.
+    
+    A learning expires at the earlier of:
+    1. its expires_at, if set
+    2. decay_days after last_validated, or after added_at if never validated
+    Inactive learnings (disputed, invalidated, expired) never expire: (None, None).
+    """
+    if learning.get("status") in INACTIVE_STATUSES:
+        return None, None
+    candidates = []
+    expires_dt = _parse_time(learning.get("expires_at"))
+    if expires_dt:
+        candidates.append((expires_dt.timestamp(), "expires_at"))
+    decay_days = learning.get("decay_days", 30)
+    # Reference date: last_validated if set (even if unparseable), else added_at
+    ref_date = _parse_time(learning.get("last_validated") or learning.get("added_at"))
+    if ref_date and decay_days is not None:
+        candidates.append(((ref_date + timedelta(days=decay_days)).timestamp(), "decay"))
+    return min(candidates) if candidates else (None, None)
+
+
+def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute(
+        "INSERT INTO store_meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value)
+    )
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Add next_expiry to databases created before it existed, and backfill it and tags."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(learnings)")}
+    if "next_expiry" in columns:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("ALTER TABLE learnings ADD COLUMN next_expiry REAL")
+        for learning_id, data in conn.execute("SELECT id, data FROM learnings").fetchall():
+            _write_derived(conn, learning_id, json.loads(data))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+# ============================================================================
+# IMPORT / EXPORT
+# ============================================================================
+
+def parse_export(text: str) -> tuple[dict, list, list]:
+    """(meta, learnings, lessons) from a SYSTEM_LEARNINGS.json, tolerating appended JSON lines.
+
+    Older validators appended lesson records as JSONL after (or instead of)
+    the JSON document; those lines are returned as lessons.
+    """
+    decoder = json.JSONDecoder()
+    meta, learnings, lessons = dict(DEFAULT_META), [], []
+    rest = text.lstrip()
+    if rest.startswith("{"):
+        try:
+            doc, end = decoder.raw_decode(rest)
+        except json.JSONDecodeError:
+            doc, end = None, 0
+        if isinstance(doc, dict) and ("learnings" in doc or "meta" in doc):
+            meta = doc.get("meta", meta)
+            learnings = doc.get("learnings", [])
+            lessons = doc.get("lessons", [])
+            rest = rest[end:]
+    for line in rest.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            print(f"[LEARNINGS] Skipping unreadable line in export: {line[:60]}")
+            continue
+        if isinstance(record, dict):
+            lessons.append(record)
+    return meta, learnings, lessons
+
+
+def _tags(learning: dict) -> set:
+    tags = learning.get("tags") or []
+    return {t for t in tags if isinstance(t, str)} if isinstance(tags, list) else set()
+
+
+def _write_derived(conn: sqlite3.Connection, learning_id: int, learning: dict) -> None:
+    """Refresh a row's status, next_expiry, tags and stored record."""
+    conn.execute(
+        "UPDATE learnings SET status = ?, next_expiry = ?, data = ? WHERE id = ?",
+        (learning.get("status"), expiry_reason(learning)[0], json.dumps(learning), learning_id)
+    )
+    conn.execute("DELETE FROM learning_tags WHERE learning_id = ?", (learning_id,))
+    conn.executemany(
+        "INSERT INTO learning_tags (tag, learning_id) VALUES (?, ?)", [(t, learning_id) for t in _tags(learning)]
+    )
+
+
+def _insert_learning(conn: sqlite3.Connection, learning: dict) -> int:
+    norm = normalize(learning.get("text", ""))
+    words = set(norm.split())
+    cur = conn.execute(
+        "INSERT INTO learnings (norm_text, n_words, status, next_expiry, data) VALUES (?, ?, ?, ?, ?)",
+        (norm, len(words), learning.get("status"), expiry_reason(learning)[0], json.dumps(learning))
+    )
+    learning_id = cur.lastrowid
+    conn.executemany(
+        "INSERT INTO learning_tags (tag, learning_id) VALUES (?, ?)", [(t, learning_id) for t in _tags(learning)]
+    )
+    conn.executemany(
+        "INSERT INTO learning_words (word, learning_id) VALUES (?, ?)", [(w, learning_id) for w in words]
+    )
+    conn.executemany(
+        "INSERT INTO word_df (word, df) VALUES (?, 1) ON CONFLICT(word) DO UPDATE SET df = df + 1",
+        [(w,) for w in words]
+    )
+    return learning_id
+
+
+def _replace_all(conn: sqlite3.Connection, meta: dict, learnings: list, lessons: list) -> None:
+    for table in ("learnings", "learning_words", "word_df", "learning_tags", "lessons"):
+        conn.execute(f"DELETE FROM {table}")
+    for learning in learnings:
+        _insert_learning(conn, learning)
+    conn.executemany("INSERT INTO lessons (data) VALUES (?)", [(json.dumps(l),) for l in lessons])
+    _set_meta(conn, "meta", json.dumps(meta))
+
+
+def _sync_from_export(conn: sqlite3.Connection) -> None:
+    path = PATHS.SYSTEM_LEARNINGS
+    try:
+        text = path.read_text()
+    except FileNotFoundError:
+        return
+    if _hash(text) == _get_meta(conn, "export_hash"):
+        return
+    if _get_meta(conn, "export_hash") is not None:
+        print(f"[LEARNINGS] {path.name} changed outside Pulse, re-importing")
+    import_json(path, text=text)
+
+
+def _render(conn: sqlite3.Connection) -> str:
+    meta = json.loads(_get_meta(conn, "meta") or "null") or dict(DEFAULT_META)
+    data = {
+        "meta": meta,
+        "learnings": [json.loads(row[0]) for row in conn.execute("SELECT data FROM learnings ORDER BY id")],
+    }
+    lessons = [json.loads(row[0]) for row in conn.execute("SELECT data FROM lessons ORDER BY id")]
+    if lessons:
+        data["lessons"] = lessons
+    return json.dumps(data, indent=2)
+
+
+def _export(conn: sqlite3.Connection) -> bool:
+    """Rewrite the JSON export (call inside a transaction, so file and hash agree)."""
+    text = _render(conn)
+    _set_meta(conn, "export_hash", _hash(text))
+    return write_text_atomic(PATHS.SYSTEM_LEARNINGS, text)
+
+
+def _mark_export_pending() -> None:
+    global _export_pending, _exit_hook_registered
+    with _export_lock:
+        _export_pending = True
+        if not _exit_hook_registered:
+            _exit_hook_registered = True
+            atexit.register(_export_at_exit)
+
+
+def _export_at_exit() -> None:
+    if _export_pending:
+        try:
+            export_json()
+        except Exception as e:
+            print(f"[LEARNINGS] Export at exit failed: {e}")
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT; a committed change leaves the JSON export pending.
+    
+    Set `changed = False` inside the block when nothing was written.
+    """
+
+    def __init__(self, export: bool = False):
+        self.changed = True
+        self.export = export
+        self.exported = False
+
+    def __enter__(self) -> "_Transaction":
+        self.conn = connect()
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            try:
+                if self.export:
+                    self.exported = _export(self.conn)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            if self.changed and not self.export:
+                _mark_export_pending()
+            return False
+        self.conn.execute("ROLLBACK")
+        return False
+
+
+def import_json(path: Optional[Path] = None, text: Optional[str] = None) -> dict:
+    """Replace the store's contents with a JSON export; returns counts."""
+    path = Path(path or PATHS.SYSTEM_LEARNINGS)
+    text = path.read_text() if text is None else text
+    meta, learnings, lessons = parse_export(text)
+    # Re-exported right away so the hash matches and it is not re-imported again
+    with _Transaction(export=True) as tx:
+        _replace_all(tx.conn, meta, learnings, lessons)
+    return {"learnings": len(learnings), "lessons": len(lessons)}
+
+
+def export_json() -> bool:
+    """Rewrite SYSTEM_LEARNINGS.json from the store; returns True if it changed.
+
+    Call once after a batch of writes; processes that changed the store and
+    did not export also do so at exit.
+    """
+    global _export_pending
+    with _export_lock:
+        _export_pending = False
+    with _Transaction(export=True) as tx:
+        pass
+    return tx.exported
+
+
+def replace_all(data: dict) -> None:
+    """Store a whole {"meta", "learnings", "lessons"} document (save_system_learnings)."""
+    with _Transaction() as tx:
+        _replace_all(tx.conn, data.get("meta", dict(DEFAULT_META)), data.get("learnings", []), data.get("lessons", []))
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def load() -> dict:
+    """All learnings (v2 defaults applied) and lessons as one document."""
+    conn = connect()
+    return {
+        "meta": json.loads(_get_meta(conn, "meta") or "null") or dict(DEFAULT_META),
+        "learnings": [with_defaults(json.loads(row[0])) for row in conn.execute("SELECT data FROM learnings ORDER BY id")],
+        "lessons": [json.loads(row[0]) for row in conn.execute("SELECT data FROM lessons ORDER BY id")],
+    }
+
+
+def find_duplicate(text: str) -> Optional[tuple[dict, float]]:
+    """(existing learning, similarity) for an exact or near duplicate of text, else None."""
+    conn = connect()
+    norm = normalize(text)
+    row = conn.execute("SELECT data FROM learnings WHERE norm_text = ? ORDER BY id LIMIT 1", (norm,)).fetchone()
+    if row:
+        return json.loads(row[0]), 1.0
+    words = set(norm.split())
+    if len(norm) <= MIN_SIMILAR_CHARS or not words:
+        return None
+
+    # Any match shares one of the prefix_len rarest words (fewer than 10% of words may be missing)
+    prefix_len = max(1, math.ceil(len(words) * (1 - SIMILARITY_THRESHOLD)))
+    placeholders = ",".join("?" * len(words))
+    df = dict(conn.execute(f"SELECT word, df FROM word_df WHERE word IN ({placeholders})", list(words)))
+    prefix = sorted(words, key=lambda w: (df.get(w, 0), w))[:prefix_len]
+    prefix = [w for w in prefix if df.get(w)]
+    if not prefix:
+        return None
+
+    lo = SIMILARITY_THRESHOLD * len(words)
+    hi = len(words) / SIMILARITY_THRESHOLD
+    candidates = conn.execute(
+        f"""SELECT DISTINCT l.id, l.norm_text, l.data FROM learning_words w
+            JOIN learnings l ON l.id = w.learning_id
+            WHERE w.word IN ({",".join("?" * len(prefix))}) AND l.n_words > ? AND l.n_words < ?
+            ORDER BY l.id""",
+        (*prefix, lo, hi)
+    ).fetchall()
+    for _, cand_norm, data in candidates:
+        if len(cand_norm) <= MIN_SIMILAR_CHARS:
+            continue
+        overlap = similarity(words, set(cand_norm.split()))
+        if overlap > SIMILARITY_THRESHOLD:
+            return json.loads(data), overlap
+    return None
+
+
+def count() -> int:
+    return connect().execute("SELECT COUNT(*) FROM learnings").fetchone()[0]
+
+
+# ============================================================================
+# MUTATIONS
+# ============================================================================
+
+def add(learning: dict) -> int:
+    """Append a learning; returns its index in list order."""
+    with _Transaction() as tx:
+        _insert_learning(tx.conn, learning)
+        index = tx.conn.execute("SELECT COUNT(*) FROM learnings").fetchone()[0] - 1
+    return index
+
+
+def add_unique(learning: dict) -> Optional[tuple[dict, float]]:
+    """Append a learning unless a (near) duplicate exists, atomically; returns the duplicate if any."""
+    with _Transaction() as tx:
+        duplicate = find_duplicate(learning.get("text", ""))
+        if duplicate:
+            tx.changed = False
+        else:
+            _insert_learning(tx.conn, learning)
+    return duplicate
+
+
+def _id_at(conn: sqlite3.Connection, index: int) -> Optional[int]:
+    if index < 0:
+        return None
+    row = conn.execute("SELECT id FROM learnings ORDER BY id LIMIT 1 OFFSET ?", (index,)).fetchone()
+    return row[0] if row else None
+
+
+def update(index: int, changes) -> Optional[dict]:
+    """Apply `changes(learning) -> None` to the learning at index in one transaction.
+
+    Returns the updated learning (v2 defaults applied), or None if index is out of range.
+    """
+    with _Transaction() as tx:
+        conn = tx.conn
+        learning_id = _id_at(conn, index)
+        if learning_id is None:
+            tx.changed = False
+            return None
+        learning = with_defaults(json.loads(
+            conn.execute("SELECT data FROM learnings WHERE id = ?", (learning_id,)).fetchone()[0]
+        ))
+        changes(learning)
+        _write_derived(conn, learning_id, learning)
+    return learning
+
+
+def expire_due(now: Optional[datetime] = None) -> list[tuple[int, dict, str]]:
+    """Mark every learning whose next_expiry has passed as expired, in one transaction.
+
+    Returns (index, learning, reason) for each, reason being "expires_at" or "decay".
+    """
+    cutoff = (now or datetime.now(timezone.utc)).timestamp()
+    expired = []
+    with _Transaction() as tx:
+        conn = tx.conn
+        rows = conn.execute(
+            "SELECT id, data FROM learnings WHERE next_expiry <= ? ORDER BY id", (cutoff,)
+        ).fetchall()
+        for learning_id, data in rows:
+            learning = with_defaults(json.loads(data))
+            # Report an explicit expiry first, as the full scan used to
+            expires_dt = _parse_time(learning.get("expires_at"))
+            reason = "expires_at" if expires_dt and expires_dt.timestamp() <= cutoff else "decay"
+            learning["status"] = "expired"
+            _write_derived(conn, learning_id, learning)
+            index = conn.execute("SELECT COUNT(*) FROM learnings WHERE id < ?", (learning_id,)).fetchone()[0]
+            expired.append((index, learning, reason))
+        tx.changed = bool(expired)
+    return expired
+
+
+def next_expiry() -> Optional[datetime]:
+    """When the next active learning expires (None if none will)."""
+    row = connect().execute("SELECT MIN(next_expiry) FROM learnings WHERE next_expiry IS NOT NULL").fetchone()
+    return datetime.fromtimestamp(row[0], timezone.utc) if row[0] is not None else None
+
+
+def with_tags(tags: list) -> list[dict]:
+    """Learnings carrying any of the tags, in list order (v2 defaults applied)."""
+    tags = list(dict.fromkeys(tags))
+    rows = connect().execute(
+        f"""SELECT l.data FROM learnings l
+            WHERE l.id IN (SELECT learning_id FROM learning_tags WHERE tag IN ({",".join("?" * len(tags))}))
+            ORDER BY l.id""",
+        tags
+    )
+    return [with_defaults(json.loads(row[0])) for row in rows]
+
+
+def add_lesson(lesson: dict) -> None:
+    """Record a validation-failure lesson."""
+    with _Transaction() as tx:
+        tx.conn.execute("INSERT INTO lessons (data) VALUES (?)", (json.dumps(lesson),))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pulse learnings store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Replace the store with a JSON export")
+    import_parser.add_argument("path", nargs="?", help="JSON file (default: SYSTEM_LEARNINGS.json)")
+    subparsers.add_parser("export", help="Rewrite SYSTEM_LEARNINGS.json from the store")
+    subparsers.add_parser("stats", help="Show store counts")
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        counts = import_json(Path(args.path) if args.path else None)
+        print(f"Imported {counts['learnings']} learnings, {counts['lessons']} lessons -> {db_path()}")
+    elif args.command == "export":
+        export_json()
+        print(f"Exported to {PATHS.SYSTEM_LEARNINGS}")
+    elif args.command == "stats":
+        conn = connect()
+        statuses = dict(conn.execute("SELECT COALESCE(status, 'active'), COUNT(*) FROM learnings GROUP BY 1"))
+        lessons = conn.execute("SELECT COUNT(*) FROM lessons").fetchone()[0]
+        words = conn.execute("SELECT COUNT(*) FROM word_df").fetchone()[0]
+        print(f"{sum(statuses.values())} learnings ({', '.join(f'{k}: {v}' for k, v in sorted(statuses.items())) or 'none'})")
+        print(f"{lessons} lessons, {words} indexed words")
+
+
+if __name__ == "__main__":
+    main()
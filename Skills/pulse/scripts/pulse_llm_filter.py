@@ -8,26 +8,37 @@ This filter uses LLM to catch:
 - Mismatches between brief requirements and delivery
 - Subtle hallucinations (fake imports, nonexistent APIs)
 
+Batch mode validates Drops concurrently: mechanical checks run in worker
+threads (artifact scans use the validator's process pool and cache), LLM
+calls run under a semaphore with a per-call timeout. Each result is written
+atomically as soon as it completes, so an interrupted batch resumes with the
+Drops that have no result yet. Transient LLM errors (timeout, API error) are
+not written and are retried by the next batch.
+
 Usage:
   pulse_llm_filter.py validate <slug> <drop_id>
-  pulse_llm_filter.py batch <slug>  # Validate all pending deposits
+  pulse_llm_filter.py batch <slug> [--concurrency N] [--timeout S]  # Validate all pending deposits
 """
 
 import argparse
 import asyncio
-import aiohttp
+import contextlib
+import hashlib
 import json
 import os
+import stat
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 
-from pulse_common import PATHS, WORKSPACE
+import aiohttp
+
+import pulse_learnings_store
+from pulse_common import PATHS, WORKSPACE, load_config, write_text_atomic
+from pulse_api import RETRY_STATUSES, ApiError, ask, run_and_close
 
 BUILDS_DIR = PATHS.BUILDS
-ZO_API_URL = "https://api.zo.computer/zo/ask"
-LESSONS_FILE = PATHS.SYSTEM_LEARNINGS
 
 
 def load_drop_brief(slug: str, drop_id: str) -> Optional[str]:
@@ -47,31 +58,154 @@ def load_deposit(slug: str, drop_id: str) -> Optional[Dict]:
     return None
 
 
-def load_artifact_contents(artifacts: list, max_lines: int = 200) -> Dict[str, str]:
-    """Load artifact file contents for LLM review."""
+# ============================================================================
+# ARTIFACT PACKING
+# ============================================================================
+
+CHARS_PER_TOKEN = 4  # Rough estimate; no tokenizer dependency
+SNIFF_BYTES = 8192
+MIN_FILE_TOKENS = 200  # Smallest useful excerpt when the budget is shared
+
+CODE_SUFFIXES = {
+    '.py', '.ts', '.tsx', '.js', '.jsx', '.mjs', '.go', '.rs', '.java', '.rb',
+    '.sh', '.sql', '.c', '.h', '.cpp', '.swift', '.kt',
+}
+GENERATED_NAMES = {'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'poetry.lock', 'Cargo.lock', 'uv.lock'}
+GENERATED_SUFFIXES = ('.lock', '.min.js', '.min.css', '.map')
+
+
+def _artifact_rank(path: Path) -> int:
+    """Packing priority: source code, then docs/config, then generated files."""
+    name = path.name
+    if name in GENERATED_NAMES or name.endswith(GENERATED_SUFFIXES):
+        return 2
+    return 0 if path.suffix in CODE_SUFFIXES else 1
+
+
+def _is_binary(path: Path) -> bool:
+    with open(path, 'rb') as f:
+        head = f.read(SNIFF_BYTES)
+    if b'\0' in head:
+        return True
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the sniff boundary is still text
+        return e.start < len(head) - 3
+    return False
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_head(path: Path, max_lines: int, max_chars: int) -> Tuple[str, bool]:
+    """First max_lines lines, at most max_chars characters; returns (text, truncated).
+    
+    Reads line by line with a length cap, so a multi-MB single-line file
+    (minified JS, generated JSON) only costs max_chars.
+    """
+    parts, used = [], 0
+    with open(path, errors='replace') as f:
+        for _ in range(max_lines):
+            line = f.readline(max_chars - used)
+            if not line:
+                return ''.join(parts), False
+            parts.append(line)
+            used += len(line)
+            if used >= max_chars:
+                break
+        truncated = bool(f.read(1))
+    return ''.join(parts), truncated
+
+
+def load_artifact_contents(artifacts: list, max_lines: int = 200,
+                           token_budget: Optional[int] = None) -> Dict[str, str]:
+    """Load artifact file contents for LLM review, within a shared token budget.
+    
+    Binary files are skipped and identical files are included once. Files are
+    packed source-first and smallest-first; each gets an equal share of what
+    is left of the budget, so budget unused by small files flows to larger ones.
+    Keys (and prompt order) follow `artifacts`.
+    """
+    if token_budget is None:
+        token_budget = load_config()["validation"].get("llm_filter_token_budget", 24000)
+    
     contents = {}
+    candidates = []  # (rank, size, key, path)
+    seen_keys = set()
     for artifact in artifacts:
+        key = str(artifact)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
         path = Path(artifact)
         if not path.is_absolute():
             path = PATHS.WORKSPACE / artifact
-        
-        if path.exists() and path.is_file():
+        try:
+            st = path.stat()
+            if not stat.S_ISREG(st.st_mode):
+                contents[key] = "[FILE NOT FOUND]"
+            elif _is_binary(path):
+                contents[key] = f"[Binary file, {st.st_size} bytes - not shown]"
+            else:
+                candidates.append((_artifact_rank(path), st.st_size, key, path))
+        except FileNotFoundError:
+            contents[key] = "[FILE NOT FOUND]"
+        except Exception as e:
+            contents[key] = f"[Error reading: {e}]"
+    
+    # Dedupe: only files sharing a size can be identical, so only those are hashed
+    by_size: Dict[int, list] = {}
+    for candidate in candidates:
+        by_size.setdefault(candidate[1], []).append(candidate)
+    seen_hashes: Dict[str, str] = {}
+    unique = []
+    for candidate in sorted(candidates):
+        if len(by_size[candidate[1]]) > 1:
             try:
-                text = path.read_text()
-                lines = text.split('\n')
-                if len(lines) > max_lines:
-                    text = '\n'.join(lines[:max_lines]) + f"\n... ({len(lines) - max_lines} more lines)"
-                contents[str(artifact)] = text
+                digest = _file_hash(candidate[3])
             except Exception as e:
-                contents[str(artifact)] = f"[Error reading: {e}]"
-        else:
-            contents[str(artifact)] = "[FILE NOT FOUND]"
+                contents[candidate[2]] = f"[Error reading: {e}]"
+                continue
+            if digest in seen_hashes:
+                contents[candidate[2]] = f"[Identical to {seen_hashes[digest]}]"
+                continue
+            seen_hashes[digest] = candidate[2]
+        unique.append(candidate)
     
-    return contents
+    remaining = token_budget * CHARS_PER_TOKEN
+    for i, (_, size, key, path) in enumerate(unique):
+        share = max(remaining // (len(unique) - i), MIN_FILE_TOKENS * CHARS_PER_TOKEN)
+        if remaining <= 0:
+            contents[key] = f"[Omitted: prompt token budget exhausted ({size} bytes)]"
+            continue
+        try:
+            text, truncated = _read_head(path, max_lines, min(share, remaining))
+        except Exception as e:
+            contents[key] = f"[Error reading: {e}]"
+            continue
+        remaining -= len(text)
+        if truncated:
+            text = text.rstrip('\n') + f"\n... (truncated: showing {len(text)} chars of {size} bytes)"
+        contents[key] = text
+    
+    # Prompt order follows the deposit's artifact list
+    return {str(a): contents[str(a)] for a in artifacts if str(a) in contents}
 
 
-async def llm_validate(slug: str, drop_id: str) -> Tuple[bool, Dict]:
-    """Use LLM to validate a deposit against its brief."""
+async def llm_validate(slug: str, drop_id: str, timeout: Optional[float] = None) -> Tuple[bool, Dict]:
+    """Use LLM to validate a deposit against its brief.
+    
+    Only errors that may succeed on retry (timeouts, connection failures,
+    429/5xx) are marked 'transient'; anything else is a saved failure.
+    """
+    if timeout is None:
+        timeout = load_config()["validation"]["llm_filter_timeout_seconds"]
     
     brief = load_drop_brief(slug, drop_id)
     deposit = load_deposit(slug, drop_id)
@@ -137,61 +271,47 @@ Respond with ONLY valid JSON:
     if not token:
         return False, {'error': 'ZO_CLIENT_IDENTITY_TOKEN not set', 'pass': False}
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(
-                ZO_API_URL,
-                headers={
-                    "authorization": token,
-                    "content-type": "application/json"
-                },
-                json={
-                    "input": prompt
-                    # No output_format - let LLM return text, we'll parse JSON from it
-                },
-                timeout=aiohttp.ClientTimeout(total=120)
-            ) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    return False, {'error': f'API error: {resp.status} - {error_text}', 'pass': False}
-                
-                result = await resp.json()
-                output = result.get('output', '')
-                
-                # Parse JSON from output (may be wrapped in markdown code block)
-                import re
-                json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', output, re.DOTALL)
-                if json_match:
-                    validation = json.loads(json_match.group(1))
-                else:
-                    # Try parsing the whole output as JSON
-                    try:
-                        validation = json.loads(output)
-                    except json.JSONDecodeError:
-                        return False, {'error': 'Could not parse LLM response as JSON', 'raw': output[:500], 'pass': False}
-                
-                validation['drop_id'] = drop_id
-                validation['build_slug'] = slug
-                validation['validated_at'] = datetime.now(timezone.utc).isoformat()
-                
-                passed = validation.get('pass', False)
-                
-                # Log lesson if failed
-                if not passed:
-                    log_validation_failure(slug, drop_id, validation)
-                
-                return passed, validation
-                
-        except asyncio.TimeoutError:
-            return False, {'error': 'LLM validation timeout', 'pass': False}
-        except Exception as e:
-            return False, {'error': str(e), 'pass': False}
+    try:
+        result = await ask(prompt, token=token, timeout=timeout)
+    except ApiError as e:
+        return False, {'error': f'API error: {e.status} - {e.body}', 'pass': False,
+                       'transient': e.status in RETRY_STATUSES}
+    except asyncio.TimeoutError:
+        return False, {'error': 'LLM validation timeout', 'pass': False, 'transient': True}
+    except aiohttp.ClientConnectionError as e:
+        return False, {'error': f'Connection error: {e}', 'pass': False, 'transient': True}
+    except Exception as e:
+        return False, {'error': str(e), 'pass': False}
+    
+    output = result.get('output', '')
+    
+    # Parse JSON from output (may be wrapped in markdown code block)
+    import re
+    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', output, re.DOTALL)
+    try:
+        if json_match:
+            validation = json.loads(json_match.group(1))
+        else:
+            # Try parsing the whole output as JSON
+            validation = json.loads(output)
+    except json.JSONDecodeError:
+        return False, {'error': 'Could not parse LLM response as JSON', 'raw': output[:500], 'pass': False}
+    
+    validation['drop_id'] = drop_id
+    validation['build_slug'] = slug
+    validation['validated_at'] = datetime.now(timezone.utc).isoformat()
+    
+    passed = validation.get('pass', False)
+    
+    # Log lesson if failed
+    if not passed:
+        log_validation_failure(slug, drop_id, validation)
+    
+    return passed, validation
 
 
 def log_validation_failure(slug: str, drop_id: str, validation: Dict):
-    """Log validation failure as a lesson."""
-    LESSONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    
+    """Log validation failure as a lesson (learnings store; exported to SYSTEM_LEARNINGS.json)."""
     # Determine category from checklist
     checklist = validation.get('checklist', {})
     if checklist.get('functional_code', {}).get('pass') == False:
@@ -221,25 +341,42 @@ def log_validation_failure(slug: str, drop_id: str, validation: Dict):
         'resolution': 'pending'
     }
     
-    with open(LESSONS_FILE, 'a') as f:
-        f.write(json.dumps(lesson) + '\n')
+    pulse_learnings_store.add_lesson(lesson)
     
     print(f"[LESSON] Logged: {lesson['id']} - {category}")
 
 
+def filter_result_path(slug: str, drop_id: str) -> Path:
+    return BUILDS_DIR / slug / "deposits" / f"{drop_id}_llm_filter.json"
+
+
 def save_filter_result(slug: str, drop_id: str, result: Dict):
-    """Save filter result."""
-    filter_path = BUILDS_DIR / slug / "deposits" / f"{drop_id}_llm_filter.json"
-    filter_path.write_text(json.dumps(result, indent=2))
+    """Save filter result (atomically: a crash never leaves a partial file)."""
+    write_text_atomic(filter_result_path(slug, drop_id), json.dumps(result, indent=2))
+
+
+def load_filter_result(slug: str, drop_id: str) -> Optional[Dict]:
+    """Saved filter result, or None if absent or unreadable."""
+    try:
+        return json.loads(filter_result_path(slug, drop_id).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
 
 
-async def validate_drop(slug: str, drop_id: str) -> Tuple[bool, Dict]:
-    """Full validation: mechanical + LLM."""
+async def validate_drop(slug: str, drop_id: str, llm_sem: Optional[asyncio.Semaphore] = None,
+                        timeout: Optional[float] = None) -> Tuple[bool, Dict]:
+    """Full validation: mechanical + LLM.
+    
+    The mechanical check runs in a worker thread; the LLM call waits for
+    `llm_sem` when given. Results are saved unless the LLM error was transient.
+    """
+    if timeout is None:
+        timeout = load_config()["validation"]["llm_filter_timeout_seconds"]
     print(f"[FILTER] Validating {drop_id}...")
     
     # Step 1: Mechanical check
     from pulse_code_validator import check_drop_artifacts
-    mech_passed, mech_report = check_drop_artifacts(slug, drop_id)
+    mech_passed, mech_report = await asyncio.to_thread(check_drop_artifacts, slug, drop_id)
     
     if not mech_passed:
         print(f"[FILTER] {drop_id} FAILED mechanical check ({mech_report.get('critical_count', 0)} critical issues)")
@@ -253,7 +390,12 @@ async def validate_drop(slug: str, drop_id: str) -> Tuple[bool, Dict]:
         return False, result
     
     # Step 2: LLM validation
-    llm_passed, llm_result = await llm_validate(slug, drop_id)
+    async with llm_sem or contextlib.nullcontext():
+        try:
+            # Bounds the whole call, including API retries
+            llm_passed, llm_result = await asyncio.wait_for(llm_validate(slug, drop_id, timeout), timeout)
+        except asyncio.TimeoutError:
+            llm_passed, llm_result = False, {'error': 'LLM validation timeout', 'pass': False, 'transient': True}
     
     result = {
         'pass': llm_passed,
@@ -261,6 +403,9 @@ async def validate_drop(slug: str, drop_id: str) -> Tuple[bool, Dict]:
         'mechanical': mech_report,
         'llm': llm_result
     }
+    if llm_result.get('transient'):
+        print(f"[FILTER] {drop_id} not validated ({llm_result['error']}), will retry")
+        return False, result
     save_filter_result(slug, drop_id, result)
     
     if llm_passed:
@@ -271,11 +416,10 @@ async def validate_drop(slug: str, drop_id: str) -> Tuple[bool, Dict]:
     return llm_passed, result
 
 
-async def validate_batch(slug: str):
-    """Validate all pending deposits."""
+def pending_drops(slug: str) -> list:
+    """Deposited Drops without a saved filter result."""
     deposits_dir = BUILDS_DIR / slug / "deposits"
-    
-    results = {}
+    pending = []
     for deposit_file in sorted(deposits_dir.glob("D*.json")):
         # Skip filter results
         if '_filter' in deposit_file.name or '_llm_filter' in deposit_file.name or '_forensics' in deposit_file.name:
@@ -284,14 +428,43 @@ async def validate_batch(slug: str):
         drop_id = deposit_file.stem
         
         # Skip if already validated
-        llm_filter_path = deposits_dir / f"{drop_id}_llm_filter.json"
-        if llm_filter_path.exists():
+        if load_filter_result(slug, drop_id) is not None:
             print(f"[FILTER] {drop_id} already validated, skipping")
             continue
-        
-        passed, result = await validate_drop(slug, drop_id)
-        results[drop_id] = result
+        pending.append(drop_id)
+    return pending
+
+
+async def validate_batch(slug: str, concurrency: Optional[int] = None, timeout: Optional[float] = None):
+    """Validate all pending deposits concurrently."""
+    config = load_config()
+    if concurrency is None:
+        concurrency = config["orchestration"]["max_concurrent_calls"]
+    if timeout is None:
+        timeout = config["validation"]["llm_filter_timeout_seconds"]
+    
+    drop_ids = pending_drops(slug)
+    if not drop_ids:
+        return {}
+    
+    # Warm the validator cache in one pooled scan, so the per-Drop
+    # mechanical checks below are cache hits
+    from pulse_code_validator import warm_artifact_cache
+    await asyncio.to_thread(warm_artifact_cache, slug, drop_ids)
     
+    llm_sem = asyncio.Semaphore(max(1, concurrency))
+    outcomes = await asyncio.gather(
+        *(validate_drop(slug, d, llm_sem, timeout) for d in drop_ids),
+        return_exceptions=True
+    )
+    
+    results = {}
+    for drop_id, outcome in zip(drop_ids, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"[FILTER] {drop_id} validation error: {outcome!r}")
+            results[drop_id] = {'pass': False, 'error': str(outcome)}
+        else:
+            results[drop_id] = outcome[1]
     return results
 
 
@@ -307,16 +480,18 @@ def main():
     # batch
     batch_parser = subparsers.add_parser('batch', help='Validate all pending deposits')
     batch_parser.add_argument('slug', help='Build slug')
+    batch_parser.add_argument('--concurrency', type=int, help='LLM validations in flight (default: orchestration.max_concurrent_calls)')
+    batch_parser.add_argument('--timeout', type=float, help='Per-call LLM timeout in seconds (default: validation.llm_filter_timeout_seconds)')
     
     args = parser.parse_args()
     
     if args.command == 'validate':
-        passed, result = asyncio.run(validate_drop(args.slug, args.drop_id))
+        passed, result = asyncio.run(run_and_close(validate_drop(args.slug, args.drop_id)))
         print(json.dumps(result, indent=2))
         sys.exit(0 if passed else 1)
     
     elif args.command == 'batch':
-        results = asyncio.run(validate_batch(args.slug))
+        results = asyncio.run(run_and_close(validate_batch(args.slug, args.concurrency, args.timeout)))
         passed = all(r.get('pass', False) for r in results.values())
         print(json.dumps(results, indent=2))
         sys.exit(0 if passed else 1)
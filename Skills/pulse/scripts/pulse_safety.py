@@ -4,21 +4,26 @@ Pulse Safety Layer: Pre-build checks, artifact verification, git snapshots.
 
 Functions:
   pre_build_check(slug)     - Run before starting a build
-  verify_artifacts(slug)    - Verify all claimed artifacts exist
-  create_snapshot(slug)     - Git stash/branch before build
-  restore_snapshot(slug)    - Restore from snapshot if build fails
+  verify_artifacts(slug)    - Verify all claimed artifacts exist (optionally their hashes)
+  create_snapshot(slug)     - Git tree snapshot under refs/pulse/<slug> before build
+  restore_snapshot(slug)    - Restore the build's claimed paths from the snapshot
   run_integration_tests(slug) - Run build-specific integration tests
 """
 
+import hashlib
 import json
 import os
+import shutil
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from pulse_common import PATHS, WORKSPACE
+import pulse_test_runner
+from pulse_common import PATHS, WORKSPACE, list_builds, load_config, load_deposits, write_text_atomic
 BUILDS_DIR = WORKSPACE / "N5" / "builds"
 
 
@@ -53,7 +58,7 @@ def pre_build_check(slug: str) -> dict:
             "message": f"Uncommitted changes detected: {len(stdout.strip().splitlines())} files",
             "details": stdout.strip()[:500]
         }
-        # Not a hard fail - we'll stash
+        # Not a hard fail - the snapshot captures them
     else:
         results["checks"]["git_clean"] = {"passed": True, "message": "Working directory clean"}
     
@@ -74,15 +79,7 @@ def pre_build_check(slug: str) -> dict:
     results["checks"]["build_exists"] = {"passed": True, "message": "Build directory valid"}
     
     # Check 3: No conflicting active builds
-    active_builds = []
-    for d in BUILDS_DIR.iterdir():
-        if d.is_dir() and d.name != slug:
-            other_meta = d / "meta.json"
-            if other_meta.exists():
-                with open(other_meta) as f:
-                    other = json.load(f)
-                if other.get("status") in ["active", "in_progress"]:
-                    active_builds.append(d.name)
+    active_builds = [b for b in list_builds(("active", "in_progress")) if b != slug]
     
     if active_builds:
         results["checks"]["no_conflicts"] = {
@@ -117,10 +114,98 @@ def pre_build_check(slug: str) -> dict:
     return results
 
 
-def create_snapshot(slug: str) -> dict:
+# ============================================================================
+# GIT SNAPSHOTS
+# ============================================================================
+#
+# "tree" snapshots (default, config safety.snapshot_mode) never touch the
+# worktree, the index or the stash: the workspace state is written into a
+# temp index (a copy of the real one, so unchanged files are not rehashed),
+# turned into a commit with write-tree/commit-tree and kept alive under
+# refs/pulse/<slug>. Restore only rewrites the paths the build's deposits
+# claim. "legacy" keeps the old whole-workspace stash / reset --hard.
+
+SNAPSHOT_REF_PREFIX = "refs/pulse"
+# Snapshot commits are internal; a fixed identity keeps them working without git user config
+SNAPSHOT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Pulse", "GIT_AUTHOR_EMAIL": "pulse@localhost",
+    "GIT_COMMITTER_NAME": "Pulse", "GIT_COMMITTER_EMAIL": "pulse@localhost",
+}
+
+
+def _git(args: list[str], cwd=None, env: Optional[dict] = None, input: Optional[str] = None) -> tuple[int, str, str]:
+    """Run git without a shell; returns (returncode, stdout, stderr)."""
+    result = subprocess.run(
+        ["git", *args], cwd=cwd or str(PATHS.WORKSPACE), env=env, input=input,
+        capture_output=True, text=True
+    )
+    return result.returncode, result.stdout, result.stderr
+
+
+def _snapshot_ref(slug: str) -> str:
+    return f"{SNAPSHOT_REF_PREFIX}/{slug}"
+
+
+def create_snapshot(slug: str, mode: Optional[str] = None) -> dict:
     """Create a git snapshot before build starts"""
+    mode = mode or load_config().get("safety", {}).get("snapshot_mode", "tree")
+    if mode == "legacy":
+        return _create_stash_snapshot(slug)
+    
+    code, toplevel, stderr = _git(["rev-parse", "--show-toplevel"])
+    if code != 0:
+        return {"passed": False, "message": f"Workspace is not a git repository: {stderr.strip()}", "ref": None}
+    toplevel = toplevel.strip()
+    _, index_path, _ = _git(["rev-parse", "--git-path", "index"], cwd=toplevel)
+    index_path = Path(toplevel) / index_path.strip()
+    temp_index = index_path.with_name(f"index.pulse-{slug}")
+    
+    try:
+        if index_path.exists():
+            shutil.copyfile(index_path, temp_index)
+        env = dict(os.environ, GIT_INDEX_FILE=str(temp_index))
+        code, _, stderr = _git(["add", "-A", "--", "."], cwd=toplevel, env=env)
+        if code != 0:
+            return {"passed": False, "message": f"Failed to stage snapshot: {stderr.strip()}", "ref": None}
+        code, tree, stderr = _git(["write-tree"], cwd=toplevel, env=env)
+        if code != 0:
+            return {"passed": False, "message": f"Failed to write tree: {stderr.strip()}", "ref": None}
+    finally:
+        temp_index.unlink(missing_ok=True)
+    tree = tree.strip()
+    
+    code, head, _ = _git(["rev-parse", "--verify", "-q", "HEAD"], cwd=toplevel)
+    head = head.strip() if code == 0 else None
+    timestamp = datetime.now(timezone.utc).isoformat()
+    commit_args = ["commit-tree", tree, "-m", f"pulse pre-build snapshot {slug} {timestamp}"]
+    if head:
+        commit_args[2:2] = ["-p", head]
+    code, commit, stderr = _git(commit_args, cwd=toplevel, env=dict(os.environ, **SNAPSHOT_IDENTITY))
+    if code != 0:
+        return {"passed": False, "message": f"Failed to commit snapshot: {stderr.strip()}", "ref": None}
+    commit = commit.strip()
+    
+    ref = _snapshot_ref(slug)
+    code, _, stderr = _git(["update-ref", "-m", f"pulse snapshot {slug}", ref, commit], cwd=toplevel)
+    if code != 0:
+        return {"passed": False, "message": f"Failed to update {ref}: {stderr.strip()}", "ref": None}
+    
+    return {
+        "passed": True,
+        "message": f"Snapshot {commit[:8]} ({ref})" + ("" if head is None else f" on {head[:8]}"),
+        "ref": ref,
+        "type": "tree",
+        "commit": commit,
+        "tree": tree,
+        "base": head,
+        "repo": toplevel,
+        "created_at": timestamp
+    }
+
+
+def _create_stash_snapshot(slug: str) -> dict:
+    """Legacy snapshot: stash the whole workspace (or record HEAD if clean)."""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    branch_name = f"pre-build-{slug}-{timestamp}"
     
     # Check if we have uncommitted changes
     code, stdout, _ = run_cmd("git status --porcelain")
@@ -157,7 +242,99 @@ def create_snapshot(slug: str) -> dict:
         }
 
 
-def restore_snapshot(slug: str) -> dict:
+def claimed_paths(slug: str, repo: str) -> list[str]:
+    """Repo-relative files the build's deposits claim, outside the build's own directory.
+    
+    Each claim is resolved the way verify_artifacts does (first existing
+    candidate, see _artifact_candidates), and only that location is returned.
+    Claims that resolve to a directory or to the repo root are rejected, as
+    are missing artifacts (there is nothing of theirs to restore).
+    """
+    build_dir = (BUILDS_DIR / slug).resolve()
+    repo_path = Path(repo).resolve()
+    deposits, _ = load_deposits(slug)
+    candidate_lists = [
+        _artifact_candidates(BUILDS_DIR / slug, path)
+        for drop_id, deposit in deposits.items() if drop_id.startswith("D")
+        for path, _ in _artifact_claims(deposit)
+    ]
+    with ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as pool:
+        found, _ = ArtifactResolver(pool).resolve(candidate_lists)
+    
+    paths = set()
+    for candidate in found:
+        if candidate is None or candidate.is_dir():
+            continue
+        candidate = Path(os.path.normpath(candidate.absolute()))
+        if candidate.is_relative_to(build_dir) or not candidate.is_relative_to(repo_path):
+            continue
+        rel = candidate.relative_to(repo_path).as_posix()
+        if rel != ".":
+            paths.add(rel)
+    return sorted(paths)
+
+
+def _restore_tree_snapshot(slug: str, snapshot: dict, paths: Optional[list[str]] = None,
+                           dry_run: bool = False) -> dict:
+    """Put claimed paths back to their snapshot content; delete claimed files the snapshot lacks."""
+    repo = snapshot.get("repo")
+    if not repo:
+        code, repo, _ = _git(["rev-parse", "--show-toplevel"])
+        repo = repo.strip()
+    commit = snapshot.get("commit")
+    code, _, _ = _git(["cat-file", "-e", f"{commit}^{{commit}}"], cwd=repo)
+    if not commit or code != 0:
+        return {"success": False, "message": f"Snapshot commit {commit} not found"}
+    
+    if paths is None:
+        paths = claimed_paths(slug, repo)
+    # Never act on the whole repo or outside it, whatever the caller passed
+    paths = sorted({
+        p for p in (os.path.normpath(p) for p in paths)
+        if p != "." and not os.path.isabs(p) and p != ".." and not p.startswith("../")
+    })
+    if not paths:
+        return {"success": True, "message": "No claimed paths to restore", "restored": [], "removed": []}
+    
+    # Which claimed paths (files, or directories as prefixes) exist in the snapshot
+    code, stdout, stderr = _git(["ls-tree", "-r", "--name-only", "-z", commit, "--", *paths], cwd=repo)
+    if code != 0:
+        return {"success": False, "message": f"Failed to read snapshot: {stderr.strip()}"}
+    in_snapshot = set(filter(None, stdout.split("\0")))
+    restore = [p for p in paths if p in in_snapshot or any(f.startswith(p + "/") for f in in_snapshot)]
+    
+    # Created by the build: remove, unless git ignores them (ignored files were never snapshotted)
+    created = [p for p in paths if p not in restore and (Path(repo) / p).is_file()]
+    ignored = set()
+    if created:
+        _, stdout, _ = _git(["check-ignore", "--stdin", "-z"], cwd=repo, input="\0".join(created) + "\0")
+        ignored = set(filter(None, stdout.split("\0")))
+    remove = [p for p in created if p not in ignored]
+    
+    result = {
+        "success": True,
+        "commit": commit,
+        "restored": restore,
+        "removed": remove,
+        "skipped_ignored": sorted(ignored),
+        "dry_run": dry_run
+    }
+    if dry_run:
+        result["message"] = f"Would restore {len(restore)} and remove {len(remove)} paths from {commit[:8]}"
+        return result
+    
+    if restore:
+        code, _, stderr = _git(["restore", f"--source={commit}", "--worktree", "--", *restore], cwd=repo)
+        if code != 0:
+            return {"success": False, "message": f"Failed to restore paths: {stderr.strip()}", "restored": []}
+    for p in remove:
+        (Path(repo) / p).unlink(missing_ok=True)
+    
+    result["message"] = f"Restored {len(restore)} and removed {len(remove)} paths from snapshot {commit[:8]}"
+    return result
+
+
+def restore_snapshot(slug: str, paths: Optional[list[str]] = None, dry_run: bool = False) -> dict:
     """Restore from pre-build snapshot if build fails"""
     build_dir = BUILDS_DIR / slug
     check_path = build_dir / "pre_build_check.json"
@@ -175,6 +352,12 @@ def restore_snapshot(slug: str) -> dict:
     if not ref:
         return {"success": False, "message": "No snapshot reference found"}
     
+    if snapshot_type == "tree":
+        return _restore_tree_snapshot(slug, snapshot, paths=paths, dry_run=dry_run)
+    
+    if dry_run:
+        return {"success": True, "message": f"Would restore {snapshot_type} snapshot {ref} (whole workspace)"}
+    
     if snapshot_type == "stash":
         # Pop the stash
         code, stdout, stderr = run_cmd(f"git stash pop {ref}")
@@ -192,10 +375,171 @@ def restore_snapshot(slug: str) -> dict:
     return {"success": False, "message": f"Unknown snapshot type: {snapshot_type}"}
 
 
-def verify_artifacts(slug: str) -> dict:
+# ============================================================================
+# ARTIFACT VERIFICATION
+# ============================================================================
+
+ARTIFACT_CACHE_VERSION = 1
+VERIFY_WORKERS = 8  # Threads for directory listings, stats and hashing
+SCANDIR_MIN_LOOKUPS = 4  # Fewer lookups in a directory: stat them instead of listing it
+RACY_SECONDS = 2  # Directories modified this recently are not trusted for caching
+
+
+def _artifact_claims(deposit: dict) -> list[tuple[str, Optional[str]]]:
+    """(path, claimed hash) for each artifact in a deposit."""
+    artifacts = deposit.get("artifacts", [])
+    if isinstance(artifacts, dict):
+        artifacts = list(artifacts.values())
+    
+    claims = []
+    for artifact in artifacts:
+        # Normalize path
+        if isinstance(artifact, str):
+            path, digest = artifact, None
+        elif isinstance(artifact, dict):
+            path = artifact.get("path") or artifact.get("file")
+            digest = artifact.get("sha256") or artifact.get("hash")
+        else:
+            continue
+        if path:
+            claims.append((path, digest))
+    return claims
+
+
+def _artifact_candidates(build_dir: Path, path: str) -> list[Path]:
+    """Where a claimed artifact may live, in lookup order."""
+    if path.startswith("/"):
+        return [Path(path)]
+    # Build artifacts dir, then workspace, then as-is from build dir
+    return [build_dir / "artifacts" / path, WORKSPACE / path, build_dir / path]
+
+
+def _dir_mtime(directory: str) -> Optional[int]:
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _list_dir(directory: str) -> tuple[Optional[int], Optional[set]]:
+    """(mtime_ns, names that exist) for a directory; (None, None) if it is missing."""
+    mtime = _dir_mtime(directory)
+    if mtime is None:
+        return None, None
+    names = set()
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_symlink() and not os.path.exists(entry.path):
+                    continue  # Broken link: exists() would be False
+                names.add(entry.name)
+    except OSError:
+        return mtime, set()
+    return mtime, names
+
+
+class ArtifactResolver:
+    """Finds claimed artifacts with as few filesystem calls as possible.
+    
+    Candidates are probed one lookup position at a time for all artifacts at
+    once, grouped by parent directory. Directories with several lookups are
+    listed once with scandir; the rest are stat'ed per file. Every directory
+    consulted is recorded with its mtime, which is what the verify cache keys on.
+    """
+    
+    def __init__(self, pool: ThreadPoolExecutor):
+        self.pool = pool
+        self.dirs: dict[str, Optional[int]] = {}
+        self._listings: dict[str, Optional[set]] = {}
+    
+    def resolve(self, candidate_lists: list[list[Path]]) -> tuple[list[Optional[Path]], list[set]]:
+        """First existing candidate per artifact, and the directories each consulted."""
+        found: list[Optional[Path]] = [None] * len(candidate_lists)
+        consulted: list[set] = [set() for _ in candidate_lists]
+        pending = list(range(len(candidate_lists)))
+        depth = 0
+        while pending:
+            groups: dict[str, list[int]] = {}
+            for i in pending:
+                if depth < len(candidate_lists[i]):
+                    groups.setdefault(str(candidate_lists[i][depth].parent), []).append(i)
+            if not groups:
+                break
+            
+            to_list = [d for d, idx in groups.items() if len(idx) >= SCANDIR_MIN_LOOKUPS and d not in self._listings]
+            for directory, (mtime, names) in zip(to_list, self.pool.map(_list_dir, to_list)):
+                self.dirs[directory] = mtime
+                self._listings[directory] = names
+            to_stat = [d for d in groups if d not in self.dirs]
+            for directory, mtime in zip(to_stat, self.pool.map(_dir_mtime, to_stat)):
+                self.dirs[directory] = mtime
+            
+            probes = [
+                i for d, idx in groups.items() if d not in self._listings and self.dirs[d] is not None
+                for i in idx
+            ]
+            exists = dict(zip(probes, self.pool.map(
+                lambda i: candidate_lists[i][depth].exists(), probes
+            )))
+            
+            next_pending = []
+            for directory, idx in groups.items():
+                listing = self._listings.get(directory)
+                for i in idx:
+                    consulted[i].add(directory)
+                    candidate = candidate_lists[i][depth]
+                    if directory in self._listings:
+                        hit = listing is not None and candidate.name in listing
+                    else:
+                        hit = exists.get(i, False)
+                    if hit:
+                        found[i] = candidate
+                    else:
+                        next_pending.append(i)
+            pending = next_pending
+            depth += 1
+        return found, consulted
+
+
+def _hash_matches(path: Path, claimed: str) -> bool:
+    """Compare a file against a claimed "<hex>" (sha256) or "<algo>:<hex>" digest."""
+    algo, _, expected = claimed.rpartition(":")
+    digest = hashlib.new(algo or "sha256")
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest() == expected.lower()
+
+
+def _file_stat(path: str) -> Optional[list]:
+    try:
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+    except OSError:
+        return None
+
+
+def _load_verify_cache(build_dir: Path) -> dict:
+    try:
+        cache = json.loads((build_dir / "artifact_verification_cache.json").read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return cache.get("drops", {}) if cache.get("version") == ARTIFACT_CACHE_VERSION else {}
+
+
+def verify_artifacts(slug: str, deposits: Optional[dict] = None, deposit_errors: Optional[dict] = None,
+                     check_hashes: bool = False, use_cache: bool = True) -> dict:
     """
     Verify all artifacts claimed in deposits actually exist.
     Returns detailed report of what's present vs missing.
+    
+    Pass `deposits`/`deposit_errors` from load_deposits() to reuse an already loaded set.
+    With check_hashes, artifacts that claim a digest ("sha256" or "hash" in the
+    artifact entry) are hashed in a thread pool and compared.
+    
+    Per-Drop results are cached in artifact_verification_cache.json. An entry is
+    reused while the deposit file, every directory consulted, and every hashed
+    file are unchanged (one stat each).
     """
     build_dir = BUILDS_DIR / slug
     deposits_dir = build_dir / "deposits"
@@ -212,164 +556,143 @@ def verify_artifacts(slug: str) -> dict:
         },
         "passed": True
     }
+    if check_hashes:
+        results["summary"]["hash_mismatch"] = 0
     
     if not deposits_dir.exists():
         results["passed"] = False
         results["error"] = "Deposits directory not found"
         return results
     
-    # Check each deposit
-    for deposit_file in deposits_dir.glob("D*.json"):
-        if "_filter" in deposit_file.name or "_forensics" in deposit_file.name:
-            continue
-        
-        drop_id = deposit_file.stem
-        
-        try:
-            with open(deposit_file) as f:
-                deposit = json.load(f)
-        except Exception as e:
-            results["drops"][drop_id] = {"error": str(e)}
+    if deposits is None:
+        deposits, deposit_errors = load_deposits(slug)
+    
+    for drop_id, error in (deposit_errors or {}).items():
+        if drop_id.startswith("D"):
+            results["drops"][drop_id] = {"error": error}
             results["summary"]["errors"] += 1
-            continue
+    
+    drop_ids = sorted(d for d in deposits if d.startswith("D"))
+    cache = _load_verify_cache(build_dir) if use_cache else {}
+    new_cache = {}
+    
+    with ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as pool:
+        # Reuse cached Drops whose deposit, directories and hashed files are unchanged
+        deposit_mtimes = dict(zip(drop_ids, pool.map(
+            lambda d: _dir_mtime(str(deposits_dir / f"{d}.json")), drop_ids
+        )))
+        candidates = {
+            d: cache[d] for d in drop_ids
+            if d in cache and cache[d].get("deposit_mtime_ns") == deposit_mtimes[d]
+            and cache[d].get("check_hashes") == check_hashes
+        }
+        dirs = sorted({directory for entry in candidates.values() for directory in entry["dirs"]})
+        files = sorted({path for entry in candidates.values() for path in entry["files"]})
+        dir_now = dict(zip(dirs, pool.map(_dir_mtime, dirs)))
+        file_now = dict(zip(files, pool.map(_file_stat, files)))
+        for drop_id, entry in candidates.items():
+            if all(dir_now[d] == m for d, m in entry["dirs"].items()) and \
+                    all(file_now[f] == st for f, st in entry["files"].items()):
+                results["drops"][drop_id] = entry["result"]
+                new_cache[drop_id] = entry
         
-        # Extract artifacts from deposit
-        artifacts = deposit.get("artifacts", [])
-        if isinstance(artifacts, dict):
-            artifacts = list(artifacts.values())
+        # Resolve every remaining Drop's artifacts in one batch
+        stale = [d for d in drop_ids if d not in results["drops"]]
+        claims = [(d, path, digest) for d in stale for path, digest in _artifact_claims(deposits[d])]
+        resolver = ArtifactResolver(pool)
+        found, consulted = resolver.resolve([_artifact_candidates(build_dir, path) for _, path, _ in claims])
         
+        to_hash = [
+            i for i, (_, _, digest) in enumerate(claims)
+            if check_hashes and digest and found[i] is not None and found[i].is_file()
+        ]
+        
+        def check(i):
+            try:
+                return _hash_matches(found[i], claims[i][2])
+            except (OSError, ValueError):
+                return False
+        hash_ok = dict(zip(to_hash, pool.map(check, to_hash)))
+        hashed_stats = dict(zip(to_hash, pool.map(lambda i: _file_stat(str(found[i])), to_hash)))
+    
+    by_drop: dict[str, list[int]] = {d: [] for d in stale}
+    for i, (drop_id, _, _) in enumerate(claims):
+        by_drop[drop_id].append(i)
+    
+    racy_after = time.time_ns() - RACY_SECONDS * 1_000_000_000
+    for drop_id in stale:
         drop_result = {
             "claimed": [],
             "verified": [],
             "missing": []
         }
-        
-        for artifact in artifacts:
-            # Normalize path
-            if isinstance(artifact, str):
-                path = artifact
-            elif isinstance(artifact, dict):
-                path = artifact.get("path") or artifact.get("file")
-            else:
-                continue
-            
-            if not path:
-                continue
-            
-            # Make path absolute if relative
-            if not path.startswith("/"):
-                # Try relative to build artifacts dir
-                full_path = build_dir / "artifacts" / path
-                if not full_path.exists():
-                    # Try relative to workspace
-                    full_path = WORKSPACE / path
-                if not full_path.exists():
-                    # Try as-is from build dir
-                    full_path = build_dir / path
-            else:
-                full_path = Path(path)
-            
-            drop_result["claimed"].append(str(path))
-            results["summary"]["total_artifacts"] += 1
-            
-            if full_path.exists():
-                drop_result["verified"].append(str(path))
-                results["summary"]["verified"] += 1
+        if check_hashes:
+            drop_result["hash_mismatch"] = []
+        drop_dirs, drop_files = {}, {}
+        for i in by_drop[drop_id]:
+            path = str(claims[i][1])
+            drop_result["claimed"].append(path)
+            if found[i] is None:
+                drop_result["missing"].append(path)
+            elif hash_ok.get(i, True):
+                drop_result["verified"].append(path)
             else:
-                drop_result["missing"].append(str(path))
-                results["summary"]["missing"] += 1
-                results["passed"] = False
-        
+                drop_result["hash_mismatch"].append(path)
+            for directory in consulted[i]:
+                drop_dirs[directory] = resolver.dirs[directory]
+            if i in hashed_stats:
+                drop_files[str(found[i])] = hashed_stats[i]
         results["drops"][drop_id] = drop_result
+        
+        # Skip caching when a directory changed too recently to trust its mtime
+        if not any(m is not None and m > racy_after for m in drop_dirs.values()):
+            new_cache[drop_id] = {
+                "deposit_mtime_ns": deposit_mtimes[drop_id],
+                "check_hashes": check_hashes,
+                "dirs": drop_dirs,
+                "files": drop_files,
+                "result": drop_result,
+            }
+    
+    results["drops"] = dict(sorted(results["drops"].items()))
+    for drop_result in results["drops"].values():
+        if "error" in drop_result:
+            continue
+        results["summary"]["total_artifacts"] += len(drop_result["claimed"])
+        results["summary"]["verified"] += len(drop_result["verified"])
+        results["summary"]["missing"] += len(drop_result["missing"])
+        if check_hashes:
+            results["summary"]["hash_mismatch"] += len(drop_result.get("hash_mismatch", []))
+    if results["summary"]["missing"] or results["summary"].get("hash_mismatch"):
+        results["passed"] = False
+    
+    if use_cache:
+        write_text_atomic(
+            build_dir / "artifact_verification_cache.json",
+            json.dumps({"version": ARTIFACT_CACHE_VERSION, "drops": new_cache}, indent=2)
+        )
     
     # Save verification report
-    report_path = build_dir / "artifact_verification.json"
-    with open(report_path, "w") as f:
-        json.dump(results, f, indent=2)
+    write_text_atomic(build_dir / "artifact_verification.json", json.dumps(results, indent=2))
     
     return results
 
 
-def run_integration_tests(slug: str) -> dict:
+def run_integration_tests(slug: str, meta: Optional[dict] = None, workers: Optional[int] = None,
+                          timeout: Optional[float] = None) -> dict:
     """
     Run integration tests for the build.
     Looks for:
-    1. N5/builds/<slug>/tests/ directory with test scripts
-    2. package.json with test script
-    3. pytest files
-    """
-    build_dir = BUILDS_DIR / slug
-    results = {
-        "slug": slug,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "tests_found": [],
-        "tests_run": [],
-        "passed": True,
-        "details": {}
-    }
+    1. N5/builds/<slug>/tests/ directory with test scripts (*.py, *.sh)
+    2. meta.json "integration_tests" commands
     
-    # Check for test directory in build
-    test_dir = build_dir / "tests"
-    if test_dir.exists():
-        for test_file in test_dir.glob("*.py"):
-            results["tests_found"].append(str(test_file))
-            code, stdout, stderr = run_cmd(f"python3 {test_file}")
-            test_result = {
-                "file": str(test_file),
-                "passed": code == 0,
-                "stdout": stdout[:1000],
-                "stderr": stderr[:1000]
-            }
-            results["tests_run"].append(test_result)
-            results["details"][test_file.name] = test_result
-            if code != 0:
-                results["passed"] = False
-        
-        for test_file in test_dir.glob("*.sh"):
-            results["tests_found"].append(str(test_file))
-            code, stdout, stderr = run_cmd(f"bash {test_file}")
-            test_result = {
-                "file": str(test_file),
-                "passed": code == 0,
-                "stdout": stdout[:1000],
-                "stderr": stderr[:1000]
-            }
-            results["tests_run"].append(test_result)
-            results["details"][test_file.name] = test_result
-            if code != 0:
-                results["passed"] = False
-    
-    # Check for integration test config in meta
-    meta_path = build_dir / "meta.json"
-    if meta_path.exists():
-        with open(meta_path) as f:
-            meta = json.load(f)
-        
-        test_config = meta.get("integration_tests", {})
-        for test_name, test_cmd in test_config.items():
-            results["tests_found"].append(test_name)
-            code, stdout, stderr = run_cmd(test_cmd)
-            test_result = {
-                "name": test_name,
-                "command": test_cmd,
-                "passed": code == 0,
-                "stdout": stdout[:1000],
-                "stderr": stderr[:1000]
-            }
-            results["tests_run"].append(test_result)
-            results["details"][test_name] = test_result
-            if code != 0:
-                results["passed"] = False
+    Tests run through pulse_test_runner: per-test timeouts with process-group
+    kill, a worker pool for tests marked parallel, JSON + JUnit XML results
+    and slowest/flaky tracking across runs.
     
-    if not results["tests_found"]:
-        results["message"] = "No integration tests defined"
-    
-    # Save test results
-    report_path = build_dir / "integration_test_results.json"
-    with open(report_path, "w") as f:
-        json.dump(results, f, indent=2)
-    
-    return results
+    Pass `meta` to reuse an already loaded meta.json.
+    """
+    return pulse_test_runner.run_integration_tests(slug, meta, workers=workers, timeout=timeout)
 
 
 def main():
@@ -378,19 +701,25 @@ def main():
     parser.add_argument("command", choices=["pre-check", "verify", "snapshot", "restore", "test"])
     parser.add_argument("slug", help="Build slug")
     parser.add_argument("--json", action="store_true", help="Output JSON")
+    parser.add_argument("--hashes", action="store_true", help="verify: also check claimed artifact hashes")
+    parser.add_argument("--no-cache", action="store_true", help="verify: ignore cached results")
+    parser.add_argument("--path", action="append", dest="paths", help="restore: only these repo-relative paths")
+    parser.add_argument("--dry-run", action="store_true", help="restore: report what would change")
+    parser.add_argument("--workers", type=int, help="test: parallel tests (default: config testing.workers)")
+    parser.add_argument("--timeout", type=float, help="test: per-test timeout in seconds")
     
     args = parser.parse_args()
     
     if args.command == "pre-check":
         result = pre_build_check(args.slug)
     elif args.command == "verify":
-        result = verify_artifacts(args.slug)
+        result = verify_artifacts(args.slug, check_hashes=args.hashes, use_cache=not args.no_cache)
     elif args.command == "snapshot":
         result = create_snapshot(args.slug)
     elif args.command == "restore":
-        result = restore_snapshot(args.slug)
+        result = restore_snapshot(args.slug, paths=args.paths, dry_run=args.dry_run)
     elif args.command == "test":
-        result = run_integration_tests(args.slug)
+        result = run_integration_tests(args.slug, workers=args.workers, timeout=args.timeout)
     
     if args.json:
         print(json.dumps(result, indent=2))
@@ -405,7 +734,12 @@ def main():
         # Print details for verify
         if args.command == "verify":
             s = result["summary"]
-            print(f"   Artifacts: {s['verified']}/{s['total_artifacts']} verified, {s['missing']} missing")
+            print(f"   Artifacts: {s['verified']}/{s['total_artifacts']} verified, {s['missing']} missing"
+                  + (f", {s['hash_mismatch']} hash mismatches" if "hash_mismatch" in s else ""))
+        elif args.command in ("snapshot", "restore") and result.get("passed", result.get("success")):
+            print(f"   {result['message']}")
+        elif args.command == "test" and "summary" in result:
+            print("   " + pulse_test_runner.format_report(result).replace("\n", "\n   "))
 
 
 if __name__ == "__main__":
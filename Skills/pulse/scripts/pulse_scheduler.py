@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Pulse Scheduler: Global spawn queue for `pulse.py supervise`.
+
+When several builds run at once, ticks no longer spawn ready Drops directly.
+They enqueue them here, and the supervisor grants spawns across all builds:
+- Global cap on running Drops (orchestration.max_running_drops)
+- Per-build cap (orchestration.max_running_drops_per_build, or the build's
+  meta "max_running_drops")
+- Fair share: the next slot goes to the build with the lowest
+  running / priority ratio (meta "priority", default 1), oldest wait first
+  on ties; within a build, Drops keep meta order
+
+Queue depth and wait times are written to N5/data/pulse_supervisor.json
+after every allocation.
+
+Usage:
+  pulse_scheduler.py status        # Print the supervisor's latest queue report
+"""
+
+import argparse
+import heapq
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+from pulse_common import PATHS, write_text_atomic
+
+REPORT_FILE = PATHS.DATA / "pulse_supervisor.json"
+
+
+class BuildQueue:
+    """One build's queued Drops and scheduling inputs."""
+
+    def __init__(self):
+        self.queued: dict[str, float] = {}  # drop_id -> enqueued_at (insertion = meta order)
+        self.running = 0
+        self.cap = 0
+        self.priority = 1.0
+
+
+class SpawnScheduler:
+    """Fair-share allocation of Drop spawns under global and per-build caps."""
+
+    def __init__(self, max_running: int, max_running_per_build: int):
+        self.max_running = max_running
+        self.max_running_per_build = max_running_per_build
+        self.builds: dict[str, BuildQueue] = {}
+        self.granted_total = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def update(self, slug: str, candidates: list[str], meta: dict) -> None:
+        """Replace a build's queue with its current spawn candidates.
+
+        Drops already queued keep their original enqueue time.
+        """
+        bq = self.builds.setdefault(slug, BuildQueue())
+        now = time.time()
+        bq.queued = {d: bq.queued.get(d, now) for d in candidates}
+        bq.running = sum(1 for info in meta.get("drops", {}).values() if info.get("status") == "running")
+        bq.cap = meta.get("max_running_drops", self.max_running_per_build)
+        bq.priority = max(float(meta.get("priority", 1)), 0.1)
+
+    def requeue(self, slug: str, drop_ids: list[str]) -> None:
+        """Return granted Drops that were never spawned to the front of their queue."""
+        bq = self.builds.get(slug)
+        if bq is None:
+            return
+        now = time.time()
+        bq.queued = {**{d: now for d in drop_ids}, **bq.queued}
+        bq.running = max(0, bq.running - len(drop_ids))
+
+    def remove(self, slug: str) -> None:
+        self.builds.pop(slug, None)
+
+    @property
+    def running(self) -> int:
+        return sum(bq.running for bq in self.builds.values())
+
+    @property
+    def depth(self) -> int:
+        return sum(len(bq.queued) for bq in self.builds.values())
+
+    def allocate(self, skip: frozenset = frozenset()) -> dict[str, list[str]]:
+        """Grant as many queued spawns as the caps allow; returns {slug: [drop_id, ...]}.
+
+        Builds in `skip` keep their queue but are not granted anything.
+        """
+        free = self.max_running - self.running
+        heap = []
+        for slug, bq in self.builds.items():
+            if slug not in skip and bq.queued and bq.running < bq.cap:
+                heap.append((bq.running / bq.priority, next(iter(bq.queued.values())), slug))
+        heapq.heapify(heap)
+
+        now = time.time()
+        grants: dict[str, list[str]] = {}
+        while free > 0 and heap:
+            _, _, slug = heapq.heappop(heap)
+            bq = self.builds[slug]
+            drop_id, enqueued_at = next(iter(bq.queued.items()))
+            del bq.queued[drop_id]
+            bq.running += 1
+            free -= 1
+            grants.setdefault(slug, []).append(drop_id)
+
+            wait = now - enqueued_at
+            self.granted_total += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+            if bq.queued and bq.running < bq.cap:
+                heapq.heappush(heap, (bq.running / bq.priority, next(iter(bq.queued.values())), slug))
+        return grants
+
+    def report(self) -> dict:
+        now = time.time()
+        return {
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "queue_depth": self.depth,
+            "running": self.running,
+            "max_running": self.max_running,
+            "granted_total": self.granted_total,
+            "wait_avg_seconds": round(self.wait_total / self.granted_total, 1) if self.granted_total else 0.0,
+            "wait_max_seconds": round(self.wait_max, 1),
+            "builds": {
+                slug: {
+                    "queued": len(bq.queued),
+                    "running": bq.running,
+                    "cap": bq.cap,
+                    "priority": bq.priority,
+                    "oldest_wait_seconds": round(now - min(bq.queued.values()), 1) if bq.queued else 0.0,
+                }
+                for slug, bq in sorted(self.builds.items())
+            },
+        }
+
+    def write_report(self) -> dict:
+        report = self.report()
+        write_text_atomic(REPORT_FILE, json.dumps(report, indent=2))
+        return report
+
+
+def format_report(report: dict) -> str:
+    per_build = ", ".join(
+        f"{slug}:{b['running']}/{b['cap']}+{b['queued']}q" for slug, b in report["builds"].items()
+    ) or "no builds"
+    return (
+        f"[SUPERVISOR] running {report['running']}/{report['max_running']}, "
+        f"queued {report['queue_depth']} ({per_build}), "
+        f"wait avg {report['wait_avg_seconds']}s max {report['wait_max_seconds']}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pulse spawn scheduler")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    status_parser = subparsers.add_parser("status", help="Show the latest supervisor queue report")
+    status_parser.add_argument("--json", action="store_true", help="Print raw JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "status":
+        if not REPORT_FILE.exists():
+            print("No supervisor report yet (is `pulse.py supervise` running?)", file=sys.stderr)
+            sys.exit(1)
+        report = json.loads(REPORT_FILE.read_text())
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"As of {report['updated_at']}")
+            print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
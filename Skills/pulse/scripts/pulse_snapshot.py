@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Pulse Snapshot: One listing of a build's drops/ and deposits/ per tick.
+
+BuildSnapshot scans both directories once with os.scandir and maps
+drop_id -> brief path / deposit path. File contents are parsed lazily and
+memoized per build keyed by (path, mtime_ns), so a daemon re-reading an
+unchanged deposit or brief on the next tick costs nothing. Each build's cache
+is an LRU of CACHE_MAX_ENTRIES files, dropped by forget_build() once the
+daemon stops watching the build; callers get their own copy of parsed JSON.
+
+Brief resolution matches the historical load_drop_brief order:
+1. `<drop_id>-*.md`
+2. `C*.md` whose name starts with the drop_id (checkpoint briefs)
+3. any `.md` whose name before the first "-" equals the drop_id
+"""
+
+import copy
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from pulse_common import PATHS
+
+CACHE_MAX_ENTRIES = 512  # parsed files kept per build
+
+# slug -> LRU of path -> (mtime_ns, parsed value); shared across snapshots and ticks
+_build_caches: dict[str, OrderedDict] = {}
+
+
+def _scan(directory: Path, suffix: str) -> dict[str, tuple[str, int]]:
+    """{file name: (path, mtime_ns)} for files with the suffix, in name order."""
+    files = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(suffix) and entry.is_file():
+                    files[entry.name] = (entry.path, entry.stat().st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return dict(sorted(files.items()))
+
+
+def _cached(slug: str, path: str, mtime_ns: int, parse) -> Any:
+    cache = _build_caches.setdefault(slug, OrderedDict())
+    hit = cache.get(path)
+    if hit is not None and hit[0] == mtime_ns:
+        cache.move_to_end(path)
+        value = hit[1]
+    else:
+        with open(path) as f:
+            value = parse(f)
+        cache[path] = (mtime_ns, value)
+        cache.move_to_end(path)
+        if len(cache) > CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+    # Callers mutate deposits/filter results; never hand out the cached object
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+def forget_build(slug: str) -> None:
+    """Drop a build's parsed-file cache (e.g. when the daemon unwatches it)."""
+    _build_caches.pop(slug, None)
+
+
+class BuildSnapshot:
+    """Directory listing of a build taken once; contents read on demand."""
+
+    def __init__(self, slug: str):
+        self.slug = slug
+        self.briefs = _scan(PATHS.build_drops(slug), ".md")
+        self.deposit_files = _scan(PATHS.build_deposits(slug), ".json")
+        self._brief_index: dict[str, Optional[tuple[str, int]]] = {}
+
+    def brief_path(self, drop_id: str) -> Optional[str]:
+        entry = self._resolve_brief(drop_id)
+        return entry[0] if entry else None
+
+    def _resolve_brief(self, drop_id: str) -> Optional[tuple[str, int]]:
+        if drop_id in self._brief_index:
+            return self._brief_index[drop_id]
+        found = None
+        for name, entry in self.briefs.items():
+            if name.startswith(f"{drop_id}-"):
+                found = entry
+                break
+        if found is None:
+            for name, entry in self.briefs.items():
+                if name.startswith("C") and name.startswith(drop_id):
+                    found = entry
+                    break
+        if found is None:
+            for name, entry in self.briefs.items():
+                if name[:-len(".md")].split("-")[0] == drop_id:
+                    found = entry
+                    break
+        self._brief_index[drop_id] = found
+        return found
+
+    def brief(self, drop_id: str) -> Optional[str]:
+        entry = self._resolve_brief(drop_id)
+        if entry is None:
+            return None
+        return _cached(self.slug, entry[0], entry[1], lambda f: f.read())
+
+    def has_deposit(self, drop_id: str) -> bool:
+        return f"{drop_id}.json" in self.deposit_files
+
+    def deposit_mtime(self, drop_id: str) -> Optional[float]:
+        """When the deposit file was last written (epoch seconds)."""
+        entry = self.deposit_files.get(f"{drop_id}.json")
+        return entry[1] / 1e9 if entry else None
+
+    def deposit(self, drop_id: str) -> Optional[dict]:
+        return self._json(f"{drop_id}.json")
+
+    def filter_result(self, drop_id: str) -> Optional[dict]:
+        return self._json(f"{drop_id}_filter.json")
+
+    def _json(self, name: str) -> Optional[dict]:
+        entry = self.deposit_files.get(name)
+        if entry is None:
+            return None
+        return _cached(self.slug, entry[0], entry[1], json.load)
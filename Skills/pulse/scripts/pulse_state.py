@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Pulse State: SQLite-backed build state (enabled with "state.backend": "sqlite").
+
+Build-level fields and each Drop live in their own rows, so saving a tick's
+changes is a field-level merge inside one write transaction rather than a
+whole-file rewrite. Two writers that touch different Drops (or different
+fields of the same Drop) no longer lose each other's updates.
+
+meta.json and STATUS.md stay as derived exports, written atomically
+(temp file + rename) and only when their content changes. The export happens
+while the write lock is held, so the file always matches the committed state.
+
+If meta.json is edited outside Pulse (its hash no longer matches the last
+export), it is re-imported on the next load: the file wins.
+
+Usage:
+  pulse_state.py import <slug>     # (Re)seed the store from meta.json
+  pulse_state.py export <slug>     # Rewrite meta.json from the store
+  pulse_state.py show <slug>       # Print the stored state as JSON
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from pulse_common import PATHS, load_config, write_text_atomic
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    slug TEXT PRIMARY KEY,
+    fields TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    export_hash TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS drops (
+    slug TEXT NOT NULL,
+    drop_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    status TEXT,
+    info TEXT NOT NULL,
+    updated_at TEXT,
+    PRIMARY KEY (slug, drop_id)
+);
+CREATE INDEX IF NOT EXISTS idx_drops_status ON drops(slug, status);
+"""
+
+# Snapshot of what this process last loaded/saved per build; saves diff against it
+_loaded: dict[str, dict] = {}
+_connections: dict[Path, sqlite3.Connection] = {}
+
+
+def enabled() -> bool:
+    return load_config().get("state", {}).get("backend") == "sqlite"
+
+
+def db_path(slug: str) -> Path:
+    if load_config().get("state", {}).get("db") == "per_build":
+        return PATHS.build_state_db(slug)
+    return PATHS.STATE_DB
+
+
+def connect(slug: str) -> sqlite3.Connection:
+    path = db_path(slug)
+    conn = _connections.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.executescript(SCHEMA)
+        _connections[path] = conn
+    return conn
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _render(meta: dict) -> str:
+    return json.dumps(meta, indent=2)
+
+
+# ============================================================================
+# ROW <-> META
+# ============================================================================
+
+def _read(conn: sqlite3.Connection, slug: str) -> Optional[dict]:
+    row = conn.execute("SELECT fields FROM builds WHERE slug = ?", (slug,)).fetchone()
+    if row is None:
+        return None
+    meta = json.loads(row[0])
+    drops = conn.execute(
+        "SELECT drop_id, info FROM drops WHERE slug = ? ORDER BY position", (slug,)
+    ).fetchall()
+    meta["drops"] = {drop_id: json.loads(info) for drop_id, info in drops}
+    order = meta.pop("__key_order__", None)
+    if order:
+        meta = {k: meta[k] for k in order if k in meta} | meta
+    return meta
+
+
+def _write_build(conn: sqlite3.Connection, slug: str, meta: dict, export_hash: Optional[str]) -> None:
+    fields = {k: v for k, v in meta.items() if k != "drops"}
+    fields["__key_order__"] = list(meta.keys())
+    conn.execute(
+        """INSERT INTO builds (slug, fields, version, export_hash, updated_at)
+           VALUES (?, ?, 1, ?, ?)
+           ON CONFLICT(slug) DO UPDATE SET
+             fields = excluded.fields, version = builds.version + 1,
+             export_hash = COALESCE(excluded.export_hash, builds.export_hash),
+             updated_at = excluded.updated_at""",
+        (slug, json.dumps(fields), export_hash, _now())
+    )
+
+
+def _write_drop(conn: sqlite3.Connection, slug: str, drop_id: str, info: dict, position: int) -> None:
+    conn.execute(
+        """INSERT INTO drops (slug, drop_id, position, status, info, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?)
+           ON CONFLICT(slug, drop_id) DO UPDATE SET
+             status = excluded.status, info = excluded.info, updated_at = excluded.updated_at""",
+        (slug, drop_id, position, info.get("status"), json.dumps(info), _now())
+    )
+
+
+def _import(conn: sqlite3.Connection, slug: str, meta: dict, export_hash: str) -> None:
+    conn.execute("DELETE FROM drops WHERE slug = ?", (slug,))
+    _write_build(conn, slug, meta, export_hash)
+    for position, (drop_id, info) in enumerate(meta.get("drops", {}).items()):
+        _write_drop(conn, slug, drop_id, info, position)
+
+
+_MISSING = object()
+
+
+def _merge_fields(current: dict, base: dict, new: dict) -> dict:
+    """Apply the keys that changed between base and new onto current."""
+    merged = dict(current)
+    for key in set(base) | set(new):
+        if key not in new:
+            if key in base:
+                merged.pop(key, None)
+        elif base.get(key, _MISSING) != new[key]:
+            merged[key] = new[key]
+    return merged
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def import_meta(slug: str) -> dict:
+    """Seed (or reseed) the store from the build's meta.json."""
+    text = PATHS.build_meta(slug).read_text()
+    meta = json.loads(text)
+    conn = connect(slug)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        _import(conn, slug, meta, _hash(text))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    _loaded[slug] = copy.deepcopy(meta)
+    return meta
+
+
+def load_state(slug: str) -> dict:
+    """Load a build's state, importing meta.json if it is new or was edited externally."""
+    meta_path = PATHS.build_meta(slug)
+    if not meta_path.exists():
+        raise FileNotFoundError(f"Build not found: {slug}")
+
+    conn = connect(slug)
+    row = conn.execute("SELECT export_hash FROM builds WHERE slug = ?", (slug,)).fetchone()
+    if row is None or row[0] != _hash(meta_path.read_text()):
+        if row is not None:
+            print(f"[STATE] {slug}: meta.json changed outside Pulse, re-importing")
+        return copy.deepcopy(import_meta(slug))
+
+    meta = _read(conn, slug)
+    _loaded[slug] = copy.deepcopy(meta)
+    return meta
+
+
+def save_state(slug: str, meta: dict) -> dict:
+    """Merge this process's changes (vs. its last load) into the store.
+
+    Only build fields and Drop fields that this process changed are written,
+    onto whatever is currently committed. meta.json is re-exported (if changed)
+    inside the same transaction. Returns the merged state.
+    """
+    base = _loaded.get(slug, {})
+    conn = connect(slug)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = _read(conn, slug) or {}
+
+        merged = _merge_fields(
+            {k: v for k, v in current.items() if k != "drops"},
+            {k: v for k, v in base.items() if k != "drops"},
+            {k: v for k, v in meta.items() if k != "drops"},
+        )
+        cur_drops = current.get("drops", {})
+        base_drops = base.get("drops", {})
+        new_drops = meta.get("drops", {})
+
+        drops = dict(cur_drops)
+        next_position = conn.execute(
+            "SELECT COALESCE(MAX(position), -1) + 1 FROM drops WHERE slug = ?", (slug,)
+        ).fetchone()[0]
+        for drop_id in list(base_drops) + [d for d in new_drops if d not in base_drops]:
+            if drop_id not in new_drops:
+                drops.pop(drop_id, None)
+                conn.execute("DELETE FROM drops WHERE slug = ? AND drop_id = ?", (slug, drop_id))
+                continue
+            if base_drops.get(drop_id) == new_drops[drop_id]:
+                continue
+            info = _merge_fields(cur_drops.get(drop_id, {}), base_drops.get(drop_id, {}), new_drops[drop_id])
+            if drop_id not in cur_drops:
+                position, next_position = next_position, next_position + 1
+            else:
+                position = list(cur_drops).index(drop_id)
+            _write_drop(conn, slug, drop_id, info, position)
+            drops[drop_id] = info
+        merged["drops"] = drops
+
+        # Preserve the caller's key order for a stable meta.json
+        merged = {k: merged[k] for k in meta if k in merged} | merged
+        text = _render(merged)
+        _write_build(conn, slug, merged, _hash(text))
+        write_text_atomic(PATHS.build_meta(slug), text)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    _loaded[slug] = copy.deepcopy(merged)
+    return merged
+
+
+def export_meta(slug: str) -> bool:
+    """Rewrite meta.json from the store; returns True if the file changed."""
+    conn = connect(slug)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        meta = _read(conn, slug)
+        if meta is None:
+            raise KeyError(f"Build not in state store: {slug}")
+        text = _render(meta)
+        conn.execute("UPDATE builds SET export_hash = ? WHERE slug = ?", (_hash(text), slug))
+        changed = write_text_atomic(PATHS.build_meta(slug), text)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pulse build state store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in [
+        ("import", "Seed the store from meta.json"),
+        ("export", "Rewrite meta.json from the store"),
+        ("show", "Print stored state"),
+    ]:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("slug", help="Build slug")
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        meta = import_meta(args.slug)
+        print(f"Imported {args.slug}: {len(meta.get('drops', {}))} drops -> {db_path(args.slug)}")
+    elif args.command == "export":
+        changed = export_meta(args.slug)
+        print(f"meta.json {'updated' if changed else 'unchanged'}")
+    elif args.command == "show":
+        meta = _read(connect(args.slug), args.slug)
+        if meta is None:
+            print(f"Build not in state store: {args.slug}", file=sys.stderr)
+            sys.exit(1)
+        print(_render(meta))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Pulse Test Runner: Parallel integration tests for a build.
+
+Runs what pulse_safety.run_integration_tests discovers:
+- N5/builds/<slug>/tests/*.py and tests/*.sh
+- meta.json "integration_tests": {name: command} or
+  {name: {"command": ..., "timeout": 60, "parallel": true}}
+
+Each test runs in its own process group with a timeout; on expiry the whole
+group gets SIGTERM, then SIGKILL after a grace period, so a hung test (or
+anything it forked) can no longer block finalization.
+
+Tests run sequentially in the workspace by default, as before. Tests marked
+safe to parallelize run alongside them in the worker pool, each in a fresh
+temp working directory (also its TMPDIR), longest-first by past duration.
+Mark a test file with a header comment in its first lines:
+
+    # pulse: parallel
+    # pulse: timeout=60
+
+Every run writes:
+- integration_test_results.json  (per-test status, duration, output)
+- integration_test_results.xml   (JUnit XML for CI tooling)
+- integration_test_history.json  (last N runs, for slowest/flaky reporting)
+
+A test is flaky when its outcome flipped pass <-> fail at least twice
+within the recorded history.
+
+Usage:
+  pulse_test_runner.py run <slug> [--workers N] [--timeout S] [--json]
+  pulse_test_runner.py report <slug> [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import shlex
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from pulse_common import PATHS, WORKSPACE, load_config, write_text_atomic
+
+OUTPUT_LIMIT = 1000  # Chars of stdout/stderr kept per test
+MARKER_LINES = 20  # Header lines searched for "# pulse:" markers
+MARKER_RE = re.compile(r"^\s*(?:#|//)\s*pulse:\s*(.+?)\s*$")
+SLOWEST_COUNT = 5
+
+
+class TestCase:
+    """One integration test: a shell command plus how to run it."""
+
+    def __init__(self, name: str, command: str, file: Optional[str] = None,
+                 timeout: Optional[float] = None, parallel: bool = False):
+        self.name = name
+        self.command = command
+        self.file = file
+        self.timeout = timeout
+        self.parallel = parallel
+
+
+def _read_markers(path: Path) -> dict:
+    """Options from `# pulse: parallel` / `# pulse: timeout=60` header comments."""
+    markers = {}
+    try:
+        with open(path, errors="replace") as f:
+            for _, line in zip(range(MARKER_LINES), f):
+                match = MARKER_RE.match(line)
+                if not match:
+                    continue
+                for option in match.group(1).replace(",", " ").split():
+                    key, _, value = option.partition("=")
+                    markers[key.strip().lower()] = value.strip() or True
+    except OSError:
+        pass
+    return markers
+
+
+def _timeout_value(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, True) else None
+    except (TypeError, ValueError):
+        return None
+
+
+def discover_tests(slug: str, meta: Optional[dict] = None) -> list[TestCase]:
+    """Test files under the build's tests/ directory, then meta.json integration_tests."""
+    build_dir = PATHS.BUILDS / slug
+    cases = []
+
+    test_dir = build_dir / "tests"
+    if test_dir.exists():
+        for pattern, interpreter in (("*.py", "python3"), ("*.sh", "bash")):
+            for test_file in sorted(test_dir.glob(pattern)):
+                markers = _read_markers(test_file)
+                cases.append(TestCase(
+                    name=test_file.name,
+                    command=f"{interpreter} {shlex.quote(str(test_file))}",
+                    file=str(test_file),
+                    timeout=_timeout_value(markers.get("timeout")),
+                    parallel=markers.get("parallel") is True,
+                ))
+
+    meta_path = build_dir / "meta.json"
+    if meta is None and meta_path.exists():
+        with open(meta_path) as f:
+            meta = json.load(f)
+    if meta is not None:
+        for test_name, spec in meta.get("integration_tests", {}).items():
+            if isinstance(spec, dict):
+                if not spec.get("command"):
+                    continue
+                cases.append(TestCase(
+                    name=test_name,
+                    command=spec["command"],
+                    timeout=_timeout_value(spec.get("timeout")),
+                    parallel=bool(spec.get("parallel", False)),
+                ))
+            else:
+                cases.append(TestCase(name=test_name, command=str(spec)))
+    return cases
+
+
+# ============================================================================
+# EXECUTION
+# ============================================================================
+
+def _kill_group(proc: subprocess.Popen, grace: float) -> None:
+    """SIGTERM the test's process group, SIGKILL whatever is left after `grace`."""
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+    try:
+        proc.wait(timeout=grace)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def run_test(case: TestCase, slug: str, timeout: float, grace: float) -> dict:
+    """Run one test in its own session; returns its result record."""
+    workdir = tempfile.mkdtemp(prefix=f"pulse-test-{slug}-") if case.parallel else str(WORKSPACE)
+    env = dict(os.environ, PULSE_BUILD_SLUG=slug, PULSE_BUILD_DIR=str(PATHS.BUILDS / slug),
+               PULSE_WORKSPACE=str(WORKSPACE))
+    if case.parallel:
+        env["TMPDIR"] = workdir
+
+    result = {"name": case.name}
+    if case.file:
+        result["file"] = case.file
+    else:
+        result["command"] = case.command
+    result["parallel"] = case.parallel
+
+    limit = case.timeout or timeout
+    start = time.monotonic()
+    # Output goes to files, not pipes: a background child still holding a pipe
+    # would otherwise keep the test "running" until the timeout
+    with tempfile.TemporaryFile("w+", errors="replace") as out, \
+            tempfile.TemporaryFile("w+", errors="replace") as err:
+        try:
+            proc = subprocess.Popen(
+                case.command, shell=True, cwd=workdir, env=env, stdin=subprocess.DEVNULL,
+                stdout=out, stderr=err, start_new_session=True,
+            )
+        except OSError as e:
+            if case.parallel:
+                shutil.rmtree(workdir, ignore_errors=True)
+            result.update(passed=False, status="error", returncode=None, duration=0.0, stdout="", stderr=str(e))
+            return result
+
+        try:
+            proc.wait(timeout=limit)
+            status = "passed" if proc.returncode == 0 else "failed"
+        except subprocess.TimeoutExpired:
+            _kill_group(proc, grace)
+            proc.wait()
+            status = "timeout"
+        finally:
+            # Reap anything the test left running in the background
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+            if case.parallel:
+                shutil.rmtree(workdir, ignore_errors=True)
+        duration = time.monotonic() - start
+
+        out.seek(0)
+        err.seek(0)
+        stdout = out.read(OUTPUT_LIMIT)
+        stderr = err.read(OUTPUT_LIMIT)
+    if status == "timeout":
+        stderr = f"{stderr}\n[pulse] Timed out after {limit:g}s; process group killed".lstrip()
+
+    result.update(
+        passed=status == "passed",
+        status=status,
+        returncode=proc.returncode,
+        duration=round(duration, 3),
+        stdout=stdout,
+        stderr=stderr,
+    )
+    return result
+
+
+def _worker_count(workers: Optional[int]) -> int:
+    if workers is None:
+        workers = load_config().get("testing", {}).get("workers", 0)
+    return max(1, workers or os.cpu_count() or 1)
+
+
+def run_tests(slug: str, cases: list[TestCase], workers: Optional[int] = None,
+              timeout: Optional[float] = None) -> list[dict]:
+    """Run cases and return results in discovery order.
+
+    Tests not marked parallel run one after another on a single lane (they may
+    share workspace state); parallel tests fill the remaining workers.
+    """
+    config = load_config().get("testing", {})
+    timeout = timeout or config.get("timeout_seconds", 300)
+    grace = config.get("kill_grace_seconds", 5)
+    workers = _worker_count(workers)
+
+    serial = [c for c in cases if not c.parallel]
+    # Longest tests first, so a slow one does not start last and stretch the run
+    past = median_durations(load_history(slug))
+    parallel = sorted((c for c in cases if c.parallel), key=lambda c: -past.get(c.name, 0.0))
+
+    def serial_lane():
+        return [run_test(c, slug, timeout, grace) for c in serial]
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        lane = pool.submit(serial_lane) if serial else None
+        futures = [(c, pool.submit(run_test, c, slug, timeout, grace)) for c in parallel]
+        for case, future in futures:
+            results[id(case)] = future.result()
+        if lane is not None:
+            for case, result in zip(serial, lane.result()):
+                results[id(case)] = result
+    return [results[id(c)] for c in cases]
+
+
+# ============================================================================
+# REPORTS & HISTORY
+# ============================================================================
+
+def write_junit(slug: str, results: list[dict], wall_seconds: float, path: Path) -> None:
+    """JUnit XML: timeouts and launch errors are <error>, non-zero exits are <failure>."""
+    suite = ET.Element("testsuite", {
+        "name": slug,
+        "tests": str(len(results)),
+        "failures": str(sum(1 for r in results if r["status"] == "failed")),
+        "errors": str(sum(1 for r in results if r["status"] in ("timeout", "error"))),
+        "time": f"{wall_seconds:.3f}",
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    })
+    for r in results:
+        case = ET.SubElement(suite, "testcase", {
+            "classname": slug, "name": r["name"], "time": f"{r['duration']:.3f}",
+        })
+        if r["status"] == "failed":
+            ET.SubElement(case, "failure", {"message": f"exit code {r['returncode']}"}).text = r["stderr"]
+        elif r["status"] in ("timeout", "error"):
+            ET.SubElement(case, "error", {"type": r["status"]}).text = r["stderr"]
+        ET.SubElement(case, "system-out").text = r["stdout"]
+        ET.SubElement(case, "system-err").text = r["stderr"]
+    ET.indent(suite)
+    write_text_atomic(path, ET.tostring(suite, encoding="unicode", xml_declaration=True) + "\n")
+
+
+def _history_path(slug: str) -> Path:
+    return PATHS.BUILDS / slug / "integration_test_history.json"
+
+
+def load_history(slug: str) -> list[dict]:
+    """Recorded runs, oldest first: [{"at", "tests": {name: [status, duration]}}]."""
+    try:
+        return json.loads(_history_path(slug).read_text()).get("runs", [])
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def record_run(slug: str, results: list[dict]) -> list[dict]:
+    keep = load_config().get("testing", {}).get("history_runs", 20)
+    runs = load_history(slug)
+    runs.append({
+        "at": datetime.now(timezone.utc).isoformat(),
+        "tests": {r["name"]: [r["status"], r["duration"]] for r in results},
+    })
+    runs = runs[-keep:]
+    write_text_atomic(_history_path(slug), json.dumps({"runs": runs}, indent=2))
+    return runs
+
+
+def median_durations(runs: list[dict]) -> dict[str, float]:
+    durations: dict[str, list[float]] = {}
+    for run in runs:
+        for name, (_, duration) in run["tests"].items():
+            durations.setdefault(name, []).append(duration)
+    return {name: statistics.median(values) for name, values in durations.items()}
+
+
+def slowest_tests(results: list[dict], runs: list[dict], count: int = SLOWEST_COUNT) -> list[dict]:
+    medians = median_durations(runs)
+    ranked = sorted(results, key=lambda r: -r["duration"])[:count]
+    return [
+        {"name": r["name"], "duration": r["duration"], "median": round(medians.get(r["name"], r["duration"]), 3)}
+        for r in ranked
+    ]
+
+
+def flaky_tests(runs: list[dict]) -> list[dict]:
+    """Tests whose pass/fail outcome flipped at least twice across recorded runs."""
+    outcomes: dict[str, list[bool]] = {}
+    for run in runs:
+        for name, (status, _) in run["tests"].items():
+            outcomes.setdefault(name, []).append(status == "passed")
+    flaky = []
+    for name, passes in outcomes.items():
+        flips = sum(1 for a, b in zip(passes, passes[1:]) if a != b)
+        if flips >= 2:
+            flaky.append({
+                "name": name,
+                "flips": flips,
+                "runs": len(passes),
+                "pass_rate": round(sum(passes) / len(passes), 2),
+            })
+    return sorted(flaky, key=lambda f: (-f["flips"], f["name"]))
+
+
+def format_report(report: dict) -> str:
+    lines = []
+    s = report.get("summary")
+    if s:
+        lines.append(
+            f"Tests: {s['passed']}/{s['total']} passed, {s['failed']} failed, "
+            f"{s['timeout']} timed out, {s['error']} errors "
+            f"in {s['wall_seconds']}s (sum of tests {s['test_seconds']}s, {s['workers']} workers)"
+        )
+    if report.get("slowest"):
+        lines.append("Slowest:")
+        for t in report["slowest"]:
+            lines.append(f"  {t['duration']:8.2f}s  (median {t['median']:.2f}s)  {t['name']}")
+    if report.get("flaky"):
+        lines.append("Flaky:")
+        for t in report["flaky"]:
+            lines.append(f"  {t['name']}: {t['flips']} flips in {t['runs']} runs, pass rate {t['pass_rate']:.0%}")
+    return "\n".join(lines) or "No test runs recorded"
+
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+def run_integration_tests(slug: str, meta: Optional[dict] = None, workers: Optional[int] = None,
+                          timeout: Optional[float] = None) -> dict:
+    """Discover, run and report a build's integration tests (see module docstring)."""
+    build_dir = PATHS.BUILDS / slug
+    cases = discover_tests(slug, meta)
+    results = {
+        "slug": slug,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "tests_found": [c.file or c.name for c in cases],
+        "tests_run": [],
+        "passed": True,
+        "details": {}
+    }
+
+    if not cases:
+        results["message"] = "No integration tests defined"
+        write_text_atomic(build_dir / "integration_test_results.json", json.dumps(results, indent=2))
+        return results
+
+    workers = _worker_count(workers)
+    start = time.monotonic()
+    run = run_tests(slug, cases, workers=workers, timeout=timeout)
+    wall = round(time.monotonic() - start, 3)
+
+    results["tests_run"] = run
+    results["details"] = {r["name"]: r for r in run}
+    results["passed"] = all(r["passed"] for r in run)
+    results["summary"] = {
+        "total": len(run),
+        "passed": sum(1 for r in run if r["status"] == "passed"),
+        "failed": sum(1 for r in run if r["status"] == "failed"),
+        "timeout": sum(1 for r in run if r["status"] == "timeout"),
+        "error": sum(1 for r in run if r["status"] == "error"),
+        "wall_seconds": wall,
+        "test_seconds": round(sum(r["duration"] for r in run), 3),
+        "workers": workers,
+    }
+
+    history = record_run(slug, run)
+    results["slowest"] = slowest_tests(run, history)
+    results["flaky"] = flaky_tests(history)
+
+    write_text_atomic(build_dir / "integration_test_results.json", json.dumps(results, indent=2))
+    write_junit(slug, run, wall, build_dir / "integration_test_results.xml")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pulse integration test runner")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run a build's integration tests")
+    run_parser.add_argument("slug", help="Build slug")
+    run_parser.add_argument("--workers", type=int, help="Parallel tests (default: config testing.workers)")
+    run_parser.add_argument("--timeout", type=float, help="Per-test timeout in seconds")
+    run_parser.add_argument("--json", action="store_true", help="Output JSON")
+
+    report_parser = subparsers.add_parser("report", help="Slowest and flaky tests from recorded runs")
+    report_parser.add_argument("slug", help="Build slug")
+    report_parser.add_argument("--json", action="store_true", help="Output JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        result = run_integration_tests(args.slug, workers=args.workers, timeout=args.timeout)
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            print(result.get("message") or format_report(result))
+            for r in result["tests_run"]:
+                if not r["passed"]:
+                    print(f"❌ {r['name']} ({r['status']}, {r['duration']}s)")
+        sys.exit(0 if result["passed"] else 1)
+
+    elif args.command == "report":
+        runs = load_history(args.slug)
+        last = {name: {"name": name, "duration": duration} for name, (_, duration) in runs[-1]["tests"].items()} \
+            if runs else {}
+        report = {"runs": len(runs), "slowest": slowest_tests(list(last.values()), runs), "flaky": flaky_tests(runs)}
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"{report['runs']} recorded runs")
+            print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Pulse Trace: Per-tick spans and Drop lifecycle events for a build.
+
+Every tick appends to N5/builds/<slug>/trace.jsonl:
+- one `tick` record with its wall time and spans
+  (load, filter, dead_check, advance, spawn, save)
+- one `drop` record per lifecycle event: ready, spawned, spawn_failed,
+  deposited, complete, failed, dead, plus filter_call / spawn_call
+  timings for each LLM/API call
+
+Supervisor spawns (`pulse.py supervise`) append a `spawn` record the same way.
+Records are written with a single O_APPEND write per tick, so concurrent
+writers never interleave partial lines.
+
+`stats` turns the trace (falling back to meta.json timestamps for Drops
+that predate tracing) into a wall-time breakdown:
+- per Drop: dependency wait (build start -> ready), queue wait
+  (ready -> spawned), run (spawned -> deposit), review (deposit -> verdict)
+- critical path: the chain of last-finishing predecessors ending at the
+  last Drop to finish, and what its time was spent on
+- tick spans, Filter/spawn call latency, time lost to dead Drops
+
+Usage:
+  pulse_trace.py stats <slug> [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+from pulse_common import PATHS
+from pulse_graph import BuildGraph, GraphError
+
+# Drop event -> meta.json timestamp field it corresponds to
+EVENT_FIELDS = {
+    "ready": "ready_at",
+    "spawned": "started_at",
+    "deposited": "deposited_at",
+    "complete": "completed_at",
+    "failed": "failed_at",
+    "spawn_failed": "failed_at",
+    "dead": "died_at",
+}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _ts(value) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class TickTrace:
+    """Spans and Drop events collected during one tick, written on finish()."""
+
+    def __init__(self, slug: str, kind: str = "tick"):
+        self.slug = slug
+        self.kind = kind
+        self.at = _now()
+        self._start = time.monotonic()
+        self.spans: list[dict] = []
+        self.events: list[dict] = []
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time a stage; the yielded dict can take extra attributes."""
+        start = time.monotonic()
+        record = {"name": name, "start": round(start - self._start, 4), **attrs}
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.monotonic() - start, 4)
+            self.spans.append(record)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def drop(self, drop_id: str, event: str, at: Optional[str] = None, **attrs) -> str:
+        """Record a Drop event; returns its timestamp for use in meta."""
+        at = at or _now()
+        self.events.append({"type": "drop", "at": at, "drop": drop_id, "event": event, **attrs})
+        return at
+
+    def finish(self, **attrs) -> dict:
+        record = {
+            "type": self.kind,
+            "at": self.at,
+            "wall_seconds": round(self.elapsed, 4),
+            "spans": self.spans,
+            **attrs,
+        }
+        append_records(self.slug, self.events + [record])
+        return record
+
+
+def append_records(slug: str, records: list[dict]) -> None:
+    if not records:
+        return
+    data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode()
+    path = PATHS.build_trace(slug)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def load_trace(slug: str) -> list[dict]:
+    """All trace records for a build; unreadable lines are skipped."""
+    path = PATHS.build_trace(slug)
+    records = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+# ============================================================================
+# STATS
+# ============================================================================
+
+def drop_timelines(meta: dict, records: list[dict]) -> dict[str, dict]:
+    """drop_id -> {field: epoch seconds}, latest event wins, meta fills gaps."""
+    timelines = {}
+    for drop_id, info in meta.get("drops", {}).items():
+        timelines[drop_id] = {
+            field: ts for field in EVENT_FIELDS.values() if (ts := _ts(info.get(field))) is not None
+        }
+    for record in records:
+        if record.get("type") != "drop":
+            continue
+        field = EVENT_FIELDS.get(record.get("event"))
+        ts = _ts(record.get("at"))
+        if field and ts is not None and record.get("drop") in timelines:
+            timelines[record["drop"]][field] = ts
+    return timelines
+
+
+def _finished(t: dict) -> Optional[float]:
+    return t.get("completed_at") or t.get("failed_at") or t.get("died_at")
+
+
+def drop_phases(t: dict, build_start: Optional[float]) -> dict:
+    """Seconds spent in each phase; None when a boundary is unknown."""
+    def gap(a, b):
+        return max(b - a, 0.0) if a is not None and b is not None else None
+
+    started = t.get("started_at")
+    ready = t.get("ready_at", started)
+    deposited = t.get("deposited_at")
+    verdict = t.get("completed_at") or t.get("failed_at")
+    return {
+        "dependency_wait": gap(build_start, ready),
+        "queue_wait": gap(ready, started),
+        # Without a deposit time (pre-trace Drops), run covers review too
+        "run": gap(started, deposited or t.get("died_at") or verdict),
+        "review": gap(deposited, verdict),
+    }
+
+
+def critical_path(timelines: dict, preds: dict[str, set]) -> list[str]:
+    """Walk back from the last Drop to finish through its last-finishing predecessor."""
+    finished = {d: f for d, t in timelines.items() if (f := _finished(t)) is not None}
+    if not finished:
+        return []
+    node = max(finished, key=finished.get)
+    path = [node]
+    while True:
+        done = [p for p in preds.get(node, ()) if p in finished]
+        if not done:
+            break
+        node = max(done, key=finished.get)
+        path.append(node)
+    path.reverse()
+    return path
+
+
+def _summary(values: list[float]) -> dict:
+    values = sorted(values)
+    if not values:
+        return {"count": 0, "total": 0.0, "avg": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "total": round(sum(values), 3),
+        "avg": round(sum(values) / len(values), 3),
+        "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def build_stats(slug: str, meta: dict, records: Optional[list[dict]] = None) -> dict:
+    if records is None:
+        records = load_trace(slug)
+    timelines = drop_timelines(meta, records)
+    try:
+        preds = BuildGraph(meta).preds
+    except GraphError:
+        preds = {}
+
+    ticks = [r for r in records if r.get("type") in ("tick", "spawn")]
+    first_seen = [ts for r in records if (ts := _ts(r.get("at"))) is not None]
+    build_start = _ts(meta.get("started_at")) or (min(first_seen) if first_seen else None)
+    finished = [f for t in timelines.values() if (f := _finished(t)) is not None]
+    build_end = _ts(meta.get("completed_at")) or (max(finished) if finished else None)
+    if meta.get("status") == "active" or build_end is None:
+        build_end = time.time()
+
+    drops = {d: drop_phases(t, build_start) for d, t in timelines.items()}
+    phase_totals = {
+        phase: round(sum(p[phase] for p in drops.values() if p[phase] is not None), 1)
+        for phase in ("dependency_wait", "queue_wait", "run", "review")
+    }
+    dead_lost = [
+        t["died_at"] - t["started_at"]
+        for t in timelines.values() if t.get("died_at") and t.get("started_at")
+    ]
+
+    # Critical path: split each hop into latency before ready, queue, run, review
+    path = critical_path(timelines, preds)
+    segments = {"ready_latency": 0.0, "queue_wait": 0.0, "run": 0.0, "review": 0.0}
+    prev_end = build_start
+    for drop_id in path:
+        t = timelines[drop_id]
+        started = t.get("started_at")
+        ready = t.get("ready_at", started)
+        if prev_end is not None and ready is not None:
+            segments["ready_latency"] += max(ready - prev_end, 0.0)
+        phases = drops[drop_id]
+        for key in ("queue_wait", "run", "review"):
+            segments[key] += phases[key] or 0.0
+        prev_end = _finished(t)
+    path_seconds = (prev_end - build_start) if path and prev_end and build_start else 0.0
+
+    spans: dict[str, list[float]] = {}
+    for tick in ticks:
+        for span in tick.get("spans", []):
+            spans.setdefault(span.get("name", "?"), []).append(span.get("seconds", 0.0))
+    calls: dict[str, list[float]] = {}
+    for record in records:
+        if record.get("type") == "drop" and record.get("event") in ("filter_call", "spawn_call"):
+            calls.setdefault(record["event"], []).append(record.get("seconds", 0.0))
+
+    return {
+        "slug": slug,
+        "status": meta.get("status"),
+        "wall_seconds": round(build_end - build_start, 1) if build_start else None,
+        "critical_path": {
+            "drops": path,
+            "seconds": round(path_seconds, 1),
+            "run_seconds": round(sum(drops[d]["run"] or 0.0 for d in path), 1),
+            "breakdown": {k: round(v, 1) for k, v in segments.items()},
+        },
+        "drop_phase_totals": phase_totals,
+        "dead": {"count": len(dead_lost), "seconds_lost": round(sum(dead_lost), 1)},
+        "ticks": {
+            "count": len(ticks),
+            "wall": _summary([t.get("wall_seconds", 0.0) for t in ticks]),
+            "spans": {name: _summary(values) for name, values in sorted(spans.items())},
+        },
+        "calls": {name: _summary(values) for name, values in sorted(calls.items())},
+        "drops": {
+            d: {k: (round(v, 1) if v is not None else None) for k, v in p.items()}
+            for d, p in drops.items()
+        },
+    }
+
+
+def _fmt(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "?"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(seconds), 60)
+    if minutes < 60:
+        return f"{minutes}m{secs:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m"
+
+
+def _pct(part: float, whole: float) -> str:
+    return f"{100 * part / whole:.0f}%" if whole else "-"
+
+
+def format_stats(stats: dict) -> str:
+    cp = stats["critical_path"]
+    lines = [
+        f"Build: {stats['slug']} ({stats['status']})",
+        f"Wall time: {_fmt(stats['wall_seconds'])}",
+        "",
+        f"Critical path: {_fmt(cp['seconds'])} across {len(cp['drops'])} Drop(s)",
+        f"  {' -> '.join(cp['drops']) or '(no finished Drops yet)'}",
+    ]
+    for key, label in [("run", "Drop run"), ("review", "Deposit -> verdict"),
+                       ("queue_wait", "Queue wait"), ("ready_latency", "Waiting to become ready")]:
+        seconds = cp["breakdown"][key]
+        lines.append(f"  {label:<26} {_fmt(seconds):>8}  {_pct(seconds, cp['seconds']):>4}")
+
+    totals = stats["drop_phase_totals"]
+    lines += ["", "Drop time (summed over all Drops):"]
+    for key, label in [("dependency_wait", "Dependency wait"), ("queue_wait", "Queue wait"),
+                       ("run", "Run"), ("review", "Review (detect + Filter)")]:
+        lines.append(f"  {label:<26} {_fmt(totals[key]):>8}")
+    if stats["dead"]["count"]:
+        lines.append(f"  {'Lost to dead Drops':<26} {_fmt(stats['dead']['seconds_lost']):>8}"
+                     f"  ({stats['dead']['count']} Drop(s))")
+
+    ticks = stats["ticks"]
+    lines += ["", f"Ticks: {ticks['count']}, {_fmt(ticks['wall']['total'])} total, "
+                  f"avg {ticks['wall']['avg']:.2f}s, max {ticks['wall']['max']:.2f}s"]
+    for name, s in sorted(ticks["spans"].items(), key=lambda kv: -kv[1]["total"]):
+        lines.append(f"  {name:<12} {s['total']:>8.2f}s  {_pct(s['total'], ticks['wall']['total']):>4}"
+                     f"  avg {s['avg']:.3f}s  max {s['max']:.3f}s")
+    for name, s in stats["calls"].items():
+        lines.append(f"{name}: {s['count']} calls, avg {s['avg']:.2f}s, p95 {s['p95']:.2f}s, max {s['max']:.2f}s")
+
+    slowest = sorted(
+        ((d, p["run"]) for d, p in stats["drops"].items() if p["run"] is not None),
+        key=lambda kv: -kv[1]
+    )[:5]
+    if slowest:
+        lines += ["", "Slowest Drops (run): " + ", ".join(f"{d} {_fmt(s)}" for d, s in slowest)]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pulse build trace")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats_parser = subparsers.add_parser("stats", help="Critical path and wall-time breakdown")
+    stats_parser.add_argument("slug", help="Build slug")
+    stats_parser.add_argument("--json", action="store_true", help="Print raw JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        meta_path = PATHS.build_meta(args.slug)
+        if not meta_path.exists():
+            print(f"Build not found: {args.slug}", file=sys.stderr)
+            sys.exit(1)
+        stats = build_stats(args.slug, json.loads(meta_path.read_text()))
+        print(json.dumps(stats, indent=2) if args.json else format_stats(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Pulse Watch: Deposit watching and dead-Drop timers for `pulse.py daemon`.
+
+- DepositWatcher: reports which builds received a new/rewritten deposit.
+  Uses inotify (via the optional `inotify_simple` package) where available,
+  otherwise polls deposit mtimes with os.scandir.
+- DeadlineHeap: min-heap of (due_at, slug, drop_id) so the daemon sleeps
+  exactly until the next Drop could be declared dead.
+
+Only Drop deposits (`<drop_id>.json`) count as events; Filter/forensics
+outputs (`<drop_id>_filter.json` etc.) written by the tick itself are ignored.
+"""
+
+import asyncio
+import heapq
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+
+def is_deposit_name(name: str) -> bool:
+    """True for `<drop_id>.json` deposits, False for derived `_filter`/`_forensics` files."""
+    return name.endswith(".json") and "_" not in name
+
+
+# ============================================================================
+# DEPOSIT WATCHER
+# ============================================================================
+
+class DepositWatcher:
+    """Watch several builds' deposits/ directories for new deposits."""
+
+    def __init__(self, poll_interval: float = 2.0, use_inotify: bool = True):
+        self.poll_interval = poll_interval
+        self._dirs: dict[str, Path] = {}
+        self._seen: dict[str, dict[str, tuple[int, int]]] = {}
+        self._inotify = INotify() if (use_inotify and INotify is not None) else None
+        self._wd_to_slug: dict[int, str] = {}
+        self._slug_to_wd: dict[str, int] = {}
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "poll"
+
+    @property
+    def slugs(self) -> set[str]:
+        return set(self._dirs)
+
+    def watch(self, slug: str, deposits_dir: Path) -> None:
+        if slug in self._dirs:
+            return
+        deposits_dir.mkdir(parents=True, exist_ok=True)
+        self._dirs[slug] = deposits_dir
+        self._seen[slug] = self._scan(deposits_dir)
+        if self._inotify is not None:
+            wd = self._inotify.add_watch(
+                str(deposits_dir), inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO
+            )
+            self._wd_to_slug[wd] = slug
+            self._slug_to_wd[slug] = wd
+
+    def unwatch(self, slug: str) -> None:
+        self._dirs.pop(slug, None)
+        self._seen.pop(slug, None)
+        wd = self._slug_to_wd.pop(slug, None)
+        if wd is not None:
+            self._wd_to_slug.pop(wd, None)
+            try:
+                self._inotify.rm_watch(wd)
+            except OSError:
+                pass  # Directory already gone
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+
+    @staticmethod
+    def _scan(deposits_dir: Path) -> dict[str, tuple[int, int]]:
+        seen = {}
+        try:
+            with os.scandir(deposits_dir) as it:
+                for entry in it:
+                    if is_deposit_name(entry.name):
+                        st = entry.stat()
+                        seen[entry.name] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+        return seen
+
+    def _poll_changes(self) -> set[str]:
+        changed = set()
+        for slug, deposits_dir in self._dirs.items():
+            current = self._scan(deposits_dir)
+            if current != self._seen[slug]:
+                # Removals alone are not events; only new or rewritten deposits
+                if any(self._seen[slug].get(name) != sig for name, sig in current.items()):
+                    changed.add(slug)
+                self._seen[slug] = current
+        return changed
+
+    def _read_inotify(self, timeout: float) -> set[str]:
+        changed = set()
+        for event in self._inotify.read(timeout=int(timeout * 1000), read_delay=50):
+            slug = self._wd_to_slug.get(event.wd)
+            if slug and is_deposit_name(event.name):
+                changed.add(slug)
+        return changed
+
+    async def wait(self, timeout: float) -> set[str]:
+        """Block up to `timeout` seconds; return slugs with deposit changes."""
+        timeout = max(0.0, timeout)
+        if self._inotify is not None:
+            return await asyncio.to_thread(self._read_inotify, timeout)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = self._poll_changes()
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            await asyncio.sleep(min(self.poll_interval, remaining))
+
+
+# ============================================================================
+# DEAD-DROP TIMERS
+# ============================================================================
+
+class DeadlineHeap:
+    """Min-heap of Drop deadlines (epoch seconds); stale entries are harmless."""
+
+    def __init__(self):
+        self._heap: list[tuple[float, str, str]] = []
+        self._scheduled: set[tuple[float, str, str]] = set()
+
+    def schedule(self, due_at: float, slug: str, drop_id: str) -> None:
+        entry = (due_at, slug, drop_id)
+        if entry not in self._scheduled:
+            self._scheduled.add(entry)
+            heapq.heappush(self._heap, entry)
+
+    def next_due(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> set[str]:
+        """Pop every deadline at or before `now`; return the affected slugs."""
+        slugs = set()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            self._scheduled.discard(entry)
+            slugs.add(entry[1])
+        return slugs
+
+    def discard_build(self, slug: str) -> None:
+        self._heap = [e for e in self._heap if e[1] != slug]
+        heapq.heapify(self._heap)
+        self._scheduled = set(self._heap)